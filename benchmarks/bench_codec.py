@@ -0,0 +1,55 @@
+"""
+Compare JSON codecs on request body encoding and response decoding.
+
+Request bodies wrap base64 images of several sizes; responses are recognition
+payloads with a growing number of vehicles.
+
+Run from the repo root with `python -m benchmarks.bench_codec`.
+"""
+
+import base64
+import os
+import timeit
+
+from simplehound.codec import get_codec
+from tests.test_simplehound import RECOGNITIONS_ALL
+
+IMAGE_SIZES_KB = [100, 1024, 5120]
+RESPONSE_OBJECTS = [1, 10, 100]
+
+
+def available_codecs():
+    codecs = []
+    for name in ["json", "orjson", "ujson"]:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            print(f"{name} not installed, skipping")
+    return codecs
+
+
+def best_ms(func) -> float:
+    return min(timeit.repeat(func, number=1, repeat=7)) * 1000
+
+
+def main():
+    codecs = available_codecs()
+    header = "".join(f"{codec.name + ' ms':>12}" for codec in codecs)
+
+    print(f"{'encode body':>16}{header}")
+    for size_kb in IMAGE_SIZES_KB:
+        request = {"image": base64.b64encode(os.urandom(size_kb * 1024)).decode()}
+        timings = [best_ms(lambda: codec.dumps(request)) for codec in codecs]
+        print(f"{size_kb:>13} KB" + "".join(f"{t:>12.3f}" for t in timings))
+
+    print(f"{'decode response':>16}{header}")
+    for num_objects in RESPONSE_OBJECTS:
+        response = dict(RECOGNITIONS_ALL)
+        response["objects"] = RECOGNITIONS_ALL["objects"] * num_objects
+        content = get_codec("json").dumps(response)
+        timings = [best_ms(lambda: codec.loads(content)) for codec in codecs]
+        print(f"{num_objects:>8} objects" + "".join(f"{t:>12.3f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare `ObjectFilter` against filtering the `get_vehicles` dicts in Python.
+
+The filter keeps vehicles with a confidence of at least 0.7 and a box of at
+least 0.5% of the frame, whose center is outside a street zone.
+
+Run from the repo root with `python -m benchmarks.bench_filters`.
+"""
+
+import timeit
+from typing import Dict, List
+
+import simplehound.core as hound
+from benchmarks.payloads import HEIGHT, WIDTH, make_recognitions
+from simplehound.filters import ObjectFilter, Zone
+
+BATCH_SIZES = [(1, 50), (100, 50), (1000, 50)]
+MIN_CONFIDENCE = 0.7
+MIN_AREA = 0.005
+STREET = [(0, 700), (WIDTH, 600), (WIDTH, HEIGHT), (0, HEIGHT)]
+
+
+def point_in_polygon(x: float, y: float, polygon) -> bool:
+    inside = False
+    for (x1, y1), (x2, y2) in zip(polygon, polygon[1:] + polygon[:1]):
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+    return inside
+
+
+def python_filter(payloads: List[Dict]) -> List[List[Dict]]:
+    results = []
+    for payload in payloads:
+        frame_area = payload["image"]["width"] * payload["image"]["height"]
+        kept = []
+        for vehicle in hound.get_vehicles(payload):
+            if vehicle["recognitionConfidence"] < MIN_CONFIDENCE:
+                continue
+            vertices = vehicle["boundingBox"]["vertices"]
+            xs = [vertex["x"] for vertex in vertices]
+            ys = [vertex["y"] for vertex in vertices]
+            if (max(xs) - min(xs)) * (max(ys) - min(ys)) < MIN_AREA * frame_area:
+                continue
+            center = ((min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2)
+            if point_in_polygon(*center, STREET):
+                continue
+            kept.append(vehicle)
+        results.append(kept)
+    return results
+
+
+OBJECT_FILTER = ObjectFilter(
+    object_types=["vehicle"],
+    min_confidence=MIN_CONFIDENCE,
+    min_area=MIN_AREA,
+    exclude_zones=[Zone(STREET)],
+)
+
+
+def vectorized_filter(payloads: List[Dict]) -> List[List[Dict]]:
+    return [hound.get_vehicles(p) for p in OBJECT_FILTER.apply(payloads)]
+
+
+def main():
+    print(
+        f"{'payloads':>8} {'objects':>8} {'python ms':>10} {'filter ms':>10}"
+        f" {'kept':>6} {'speedup':>8}"
+    )
+    for num_payloads, num_objects in BATCH_SIZES:
+        payloads = [
+            make_recognitions(num_objects, seed) for seed in range(num_payloads)
+        ]
+        expected = python_filter(payloads)
+        assert vectorized_filter(payloads) == expected
+        timings = []
+        for func in (python_filter, vectorized_filter):
+            number = max(1, 200 // num_payloads)
+            seconds = min(
+                timeit.repeat(lambda: func(payloads), number=number, repeat=5)
+            )
+            timings.append(seconds / number * 1000)
+        kept = sum(map(len, expected))
+        print(
+            f"{num_payloads:>8} {num_objects:>8} {timings[0]:>10.3f} {timings[1]:>10.3f}"
+            f" {kept:>6} {timings[0] / timings[1]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure the cold import time of the Simplehound modules.
+
+Each module is imported in a fresh interpreter with `-X importtime` (best of
+several runs) and the modules it pulled in are checked: neither the parser nor
+`simplehound.core` may load the HTTP stack, asyncio or an optional dependency
+at import time. Exits non-zero if an unexpected module is loaded, or if an
+import is slower than `--max-ms` (when given).
+
+Run from the repo root with `python -m benchmarks.bench_import`.
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import List
+
+REPEAT = 5
+HEAVY_MODULES = ["requests", "urllib3", "aiohttp", "asyncio", "numpy", "PIL"]
+# Heavy modules each import may load, everything else in HEAVY_MODULES must not be.
+ALLOWED = {
+    "simplehound.parse": [],
+    "simplehound.core": [],
+    "simplehound.aio": ["aiohttp", "asyncio"],
+}
+
+
+def import_time(module: str) -> float:
+    """Cumulative import time of `module` in seconds, from `-X importtime`."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    for line in output.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1e6
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+
+def loaded_modules(module: str) -> List[str]:
+    """Which of HEAVY_MODULES are loaded after importing `module`."""
+    code = (
+        f"import sys, {module}; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return output.split()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'module':<20} {'import ms':>10}  heavy modules loaded")
+    for module, allowed in ALLOWED.items():
+        try:
+            seconds = min(import_time(module) for _ in range(REPEAT))
+        except subprocess.CalledProcessError:
+            print(f"{module:<20} {'skipped, not importable':>10}")
+            continue
+        loaded = loaded_modules(module)
+        print(f"{module:<20} {seconds * 1000:>10.1f}  {' '.join(loaded) or '-'}")
+        unexpected = [name for name in loaded if name not in allowed]
+        if unexpected:
+            failures.append(f"{module} imports {', '.join(unexpected)}")
+        if args.max_ms is not None and seconds * 1000 > args.max_ms:
+            failures.append(f"{module} took {seconds * 1000:.1f} ms")
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Compare memory retained by the `get_*` dicts against `as_objects=True` models.
+
+The payloads are built inside the measurement and discarded after parsing, so
+the result is what a caller keeps alive by holding on to the parsed output,
+including any parts of the payload it still references.
+
+Run from the repo root with `python -m benchmarks.bench_models`.
+"""
+
+import copy
+import gc
+import tracemalloc
+
+import simplehound.core as hound
+from tests.test_simplehound import DETECTIONS, RECOGNITIONS_ALL
+
+NUM_PAYLOADS = 10000
+
+
+def retained(func, source) -> int:
+    gc.collect()
+    tracemalloc.start()
+    payloads = [copy.deepcopy(source) for _ in range(NUM_PAYLOADS)]
+    results = [func(payload) for payload in payloads]
+    del payloads
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return current
+
+
+def main():
+    cases = [
+        ("get_faces", hound.get_faces, DETECTIONS),
+        ("get_people", hound.get_people, DETECTIONS),
+        ("get_metadata", hound.get_metadata, DETECTIONS),
+        ("get_vehicles", hound.get_vehicles, RECOGNITIONS_ALL),
+    ]
+    print(f"{'helper':>14} {'dicts KB':>10} {'models KB':>10} {'saving':>7}")
+    for name, func, source in cases:
+        dicts = retained(func, source)
+        models = retained(lambda payload: func(payload, as_objects=True), source)
+        print(
+            f"{name:>14} {dicts / 1024:>10.0f} {models / 1024:>10.0f}"
+            f" {1 - models / dicts:>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare peak memory and time of building the request body for large images.
+
+The legacy path is `encode_image` -> `json.dumps` -> bytes as sent by requests,
+the new path is `build_request_body`, and the streaming path reads a
+`StreamingBody` in the block size urllib3 sends with (as `detect_file` does).
+
+Run from the repo root with `python -m benchmarks.bench_request_body`.
+"""
+
+import json
+import os
+import timeit
+import tracemalloc
+
+import simplehound.core as hound
+
+SIZES_MB = [0.1, 1, 5, 10]
+STREAM_BLOCK_SIZE = 16 * 1024
+
+
+def legacy_body(image: bytes) -> bytes:
+    return json.dumps({"image": hound.encode_image(image)}).encode("utf-8")
+
+
+def stream_body(image: bytes):
+    body = hound.StreamingBody(image)
+    while body.read(STREAM_BLOCK_SIZE):
+        pass
+
+
+def peak_allocated(func, image) -> int:
+    tracemalloc.start()
+    func(image)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    print(
+        f"{'size':>8} {'legacy peak':>12} {'body peak':>12} {'stream peak':>12}"
+        f" {'legacy ms':>10} {'body ms':>8} {'stream ms':>10}"
+    )
+    for size_mb in SIZES_MB:
+        image = os.urandom(int(size_mb * 1024 * 1024))
+        legacy_peak = peak_allocated(legacy_body, image)
+        body_peak = peak_allocated(hound.build_request_body, image)
+        stream_peak = peak_allocated(stream_body, image)
+        legacy_ms = min(timeit.repeat(lambda: legacy_body(image), number=1, repeat=5))
+        body_ms = min(
+            timeit.repeat(lambda: hound.build_request_body(image), number=1, repeat=5)
+        )
+        stream_ms = min(timeit.repeat(lambda: stream_body(image), number=1, repeat=5))
+        print(
+            f"{size_mb:>6} MB {legacy_peak / 2**20:>9.1f} MB {body_peak / 2**20:>9.1f} MB"
+            f" {stream_peak / 2**20:>9.2f} MB {legacy_ms * 1000:>10.2f}"
+            f" {body_ms * 1000:>8.2f} {stream_ms * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark bulk ingest and query latency of `simplehound.store.ResultStore`.
+
+Ingests synthetic recognition payloads (two vehicles with plates and two
+standalone plates each, plates drawn from a fixed pool so they recur) until the
+store holds `--rows` sightings, then times exact and fuzzy plate lookups and
+attribute queries.
+
+Run from the repo root with `python -m benchmarks.bench_store`
+(`--rows 100000` for a quick run, `--path` to benchmark an on-disk database).
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from simplehound.store import ResultStore
+
+PLATE_CHARS = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+MAKES = {
+    "Toyota": ["Corolla", "Yaris", "RAV4"],
+    "Ford": ["Focus", "Fiesta", "Ranger"],
+    "Volkswagen": ["Golf", "Polo"],
+    "BMW": ["3 Series", "X5"],
+}
+COLORS = ["red", "blue", "black", "white", "silver", "grey"]
+OBJECTS_PER_PAYLOAD = 4
+DAY = 24 * 3600
+QUERY_REPEAT = 200
+
+
+def _vertices(x: int, y: int, width: int, height: int) -> Dict:
+    return {
+        "vertices": [
+            {"x": x, "y": y},
+            {"x": x + width, "y": y},
+            {"x": x + width, "y": y + height},
+            {"x": x, "y": y + height},
+        ]
+    }
+
+
+def _plate(plate: str, rng: random.Random) -> Dict:
+    return {
+        "bounding": _vertices(rng.randrange(1800), rng.randrange(1000), 80, 20),
+        "attributes": {
+            "system": {
+                "string": {"name": plate, "confidence": rng.random()},
+                "region": {"name": "UK", "confidence": rng.random()},
+            }
+        },
+    }
+
+
+def make_payloads(
+    count: int, plates: List[str], start: float, seed: int = 0
+) -> Iterator[Tuple[Dict, float, str]]:
+    """`count` (payload, timestamp, source) items spread over 30 days from `start`."""
+    rng = random.Random(seed)
+    for i in range(count):
+        objects = []
+        for _ in range(OBJECTS_PER_PAYLOAD // 2):
+            make = rng.choice(list(MAKES))
+            objects.append(
+                {
+                    "objectType": "vehicle",
+                    "vehicleAnnotation": {
+                        "bounding": _vertices(rng.randrange(1500), 100, 400, 300),
+                        "recognitionConfidence": rng.random(),
+                        "licenseplate": _plate(rng.choice(plates), rng),
+                        "attributes": {
+                            "system": {
+                                "make": {"name": make},
+                                "model": {"name": rng.choice(MAKES[make])},
+                                "color": {"name": rng.choice(COLORS)},
+                                "vehicleType": "car",
+                            }
+                        },
+                    },
+                }
+            )
+            objects.append(
+                {
+                    "objectType": "licenseplate",
+                    "licenseplateAnnotation": _plate(rng.choice(plates), rng),
+                }
+            )
+        payload = {
+            "image": {"width": 1920, "height": 1080, "orientation": 1},
+            "objects": objects,
+            "requestId": f"{i:032x}",
+        }
+        yield payload, start + 30 * DAY * i / count, f"cam{i % 8}"
+
+
+def latency(func: Callable, args: List) -> Tuple[float, float]:
+    """Median and p95 latency of `func(*arg)` over `args`, in milliseconds."""
+    times = []
+    for arg in args:
+        start = time.perf_counter()
+        func(*arg)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(0.95 * (len(times) - 1))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--plates", type=int, default=200_000)
+    parser.add_argument("--path", default=None, help="default: a temporary file")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(1)
+    plates = [
+        "".join(rng.choice(PLATE_CHARS) for _ in range(7)) for _ in range(args.plates)
+    ]
+    start = time.time() - 30 * DAY
+    count = args.rows // OBJECTS_PER_PAYLOAD
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path or os.path.join(tmp, "store.db")
+        with ResultStore(path) as store:
+            began = time.perf_counter()
+            store.add_many(make_payloads(count, plates, start))
+            seconds = time.perf_counter() - began
+            rows = len(store)
+            print(
+                f"ingest: {rows} rows from {count} payloads in {seconds:.1f} s"
+                f" = {rows / seconds:,.0f} rows/s, {os.path.getsize(path) / 2**20:.0f} MB"
+            )
+
+            lookups = [(plate,) for plate in rng.sample(plates, QUERY_REPEAT)]
+            # An OCR-style misread: one character replaced by a wrong one.
+            misreads = [
+                (plate[:3] + ("X" if plate[3] != "X" else "Y") + plate[4:], 1)
+                for (plate,) in lookups
+            ]
+            yesterday = (time.time() - 2 * DAY, time.time() - DAY)
+            vehicles = [
+                (make, model, color, *yesterday)
+                for make, model, color in (
+                    (rng.choice(list(MAKES)), None, rng.choice(COLORS))
+                    for _ in range(QUERY_REPEAT // 10)
+                )
+            ]
+            queries = [
+                ("last_seen(plate)", store.last_seen, lookups),
+                ("find_plate(plate)", store.find_plate, lookups),
+                ("find_plate(misread, 1)", store.find_plate, misreads),
+                (
+                    "find_vehicles(make, color, day)",
+                    lambda make, model, color, since, until: store.find_vehicles(
+                        make=make, color=color, since=since, until=until
+                    ),
+                    vehicles,
+                ),
+            ]
+            print(f"{'query':<32} {'p50 ms':>8} {'p95 ms':>8} {'results':>8}")
+            for name, func, query_args in queries:
+                p50, p95 = latency(func, query_args)
+                results = func(*query_args[0])
+                results = 1 if isinstance(results, dict) else len(results or [])
+                print(f"{name:<32} {p50:>8.2f} {p95:>8.2f} {results:>8}")
+
+
+if __name__ == "__main__":
+    main()
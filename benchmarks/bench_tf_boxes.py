@@ -0,0 +1,74 @@
+"""
+Compare `tf_boxes` against looping over `bbox_to_tf_style` / `bboxvert_to_tf_style`.
+
+Run from the repo root with `python -m benchmarks.bench_tf_boxes`.
+"""
+
+import random
+import timeit
+
+import simplehound.core as hound
+from simplehound.vectorized import tf_boxes
+
+WIDTH, HEIGHT = 1920, 1080
+BATCH_SIZES = [(1, 10), (10, 100), (100, 100), (1000, 50)]
+
+
+def make_payload(num_objects: int) -> dict:
+    objects = []
+    for i in range(num_objects):
+        x, y = random.randrange(WIDTH - 100), random.randrange(HEIGHT - 100)
+        w, h = random.randrange(1, 100), random.randrange(1, 100)
+        if i % 2:
+            objects.append(
+                {
+                    "type": "person",
+                    "boundingBox": {"x": x, "y": y, "width": w, "height": h},
+                }
+            )
+        else:
+            vertices = [
+                {"x": x, "y": y},
+                {"x": x + w, "y": y},
+                {"x": x + w, "y": y + h},
+                {"x": x, "y": y + h},
+            ]
+            objects.append(
+                {
+                    "objectType": "vehicle",
+                    "vehicleAnnotation": {"bounding": {"vertices": vertices}},
+                }
+            )
+    return {"image": {"width": WIDTH, "height": HEIGHT}, "objects": objects}
+
+
+def scalar_loop(payloads):
+    boxes = []
+    for payload in payloads:
+        width, height = payload["image"]["width"], payload["image"]["height"]
+        for obj in payload["objects"]:
+            if "boundingBox" in obj:
+                boxes.append(hound.bbox_to_tf_style(obj["boundingBox"], width, height))
+            else:
+                bbox = obj["vehicleAnnotation"]["bounding"]
+                boxes.append(hound.bboxvert_to_tf_style(bbox, width, height))
+    return boxes
+
+
+def main():
+    random.seed(0)
+    print(
+        f"{'payloads':>8} {'objects':>8} {'loop ms':>9} {'tf_boxes ms':>12} {'speedup':>8}"
+    )
+    for num_payloads, num_objects in BATCH_SIZES:
+        payloads = [make_payload(num_objects) for _ in range(num_payloads)]
+        loop = min(timeit.repeat(lambda: scalar_loop(payloads), number=1, repeat=5))
+        vectorized = min(timeit.repeat(lambda: tf_boxes(payloads), number=1, repeat=5))
+        print(
+            f"{num_payloads:>8} {num_payloads * num_objects:>8} {loop * 1000:>9.2f}"
+            f" {vectorized * 1000:>12.2f} {loop / vectorized:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Compare `Tracker.update` against a pure Python tracker matching boxes pairwise.
+
+Each scene has a fixed number of people drifting a few pixels per frame, with
+a few leaving and being replaced every frame. Reports milliseconds per frame.
+
+Run from the repo root with `python -m benchmarks.bench_tracking`.
+"""
+
+import random
+import timeit
+from typing import Dict, List
+
+import simplehound.core as hound
+from simplehound.tracking import Tracker
+
+WIDTH, HEIGHT = 1920, 1080
+OBJECT_COUNTS = [10, 100, 300, 1000]
+FRAMES = 20
+IOU_THRESHOLD = 0.3
+
+
+def make_frames(num_objects: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+
+    def spawn():
+        return [rng.randrange(WIDTH - 60), rng.randrange(HEIGHT - 120), 30, 60]
+
+    boxes = [spawn() for _ in range(num_objects)]
+    frames = []
+    for _ in range(FRAMES):
+        for box in boxes:
+            box[0] = min(WIDTH - 30, max(0, box[0] + rng.randint(-3, 3)))
+            box[1] = min(HEIGHT - 60, max(0, box[1] + rng.randint(-3, 3)))
+        for i in rng.sample(range(num_objects), max(1, num_objects // 50)):
+            boxes[i] = spawn()
+        objects = [
+            {
+                "type": "person",
+                "boundingBox": dict(zip(("x", "y", "width", "height"), box)),
+            }
+            for box in boxes
+        ]
+        frames.append({"image": {"width": WIDTH, "height": HEIGHT}, "objects": objects})
+    return frames
+
+
+def iou(a, b) -> float:
+    height = min(a[2], b[2]) - max(a[0], b[0])
+    width = min(a[3], b[3]) - max(a[1], b[1])
+    if height <= 0 or width <= 0:
+        return 0.0
+    intersection = height * width
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1])
+    return intersection / (union - intersection)
+
+
+def python_tracker(frames: List[Dict]) -> int:
+    """Greedy IoU matching with an O(tracks x boxes) Python loop, as a baseline."""
+    tracks = {}
+    next_id = 0
+    events = 0
+    for payload in frames:
+        width, height = payload["image"]["width"], payload["image"]["height"]
+        boxes = [
+            hound.bbox_to_tf_style(obj["boundingBox"], width, height)
+            for obj in payload["objects"]
+        ]
+        pairs = sorted(
+            (
+                (overlap, track_id, i)
+                for track_id, track_box in tracks.items()
+                for i, box in enumerate(boxes)
+                for overlap in [iou(track_box, box)]
+                if overlap >= IOU_THRESHOLD
+            ),
+            reverse=True,
+        )
+        matched_tracks, matched_boxes = set(), set()
+        for _, track_id, i in pairs:
+            if track_id in matched_tracks or i in matched_boxes:
+                continue
+            matched_tracks.add(track_id)
+            matched_boxes.add(i)
+            tracks[track_id] = boxes[i]
+        for track_id in set(tracks) - matched_tracks:
+            del tracks[track_id]
+            events += 1
+        for i in set(range(len(boxes))) - matched_boxes:
+            tracks[next_id] = boxes[i]
+            next_id += 1
+            events += 1
+    return events
+
+
+def numpy_tracker(frames: List[Dict]) -> int:
+    tracker = Tracker(iou_threshold=IOU_THRESHOLD, max_misses=0)
+    return sum(len(tracker.update(payload)) for payload in frames)
+
+
+def main():
+    print(
+        f"{'objects':>8} {'python ms/frame':>16} {'numpy ms/frame':>15} {'speedup':>8}"
+    )
+    for num_objects in OBJECT_COUNTS:
+        frames = make_frames(num_objects)
+        assert python_tracker(frames) == numpy_tracker(frames)
+        timings = []
+        for func in (python_tracker, numpy_tracker):
+            number = max(1, 2000 // num_objects)
+            seconds = min(timeit.repeat(lambda: func(frames), number=number, repeat=3))
+            timings.append(seconds / number / FRAMES * 1000)
+        print(
+            f"{num_objects:>8} {timings[0]:>16.3f} {timings[1]:>15.3f}"
+            f" {timings[0] / timings[1]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Synthetic Sighthound payloads and images for benchmarks.
+
+Payloads follow the structure of the fixtures in `tests/test_simplehound.py`.
+"""
+
+import os
+import random
+from typing import Dict
+
+WIDTH, HEIGHT = 1920, 1080
+
+
+def _box(rng: random.Random) -> Dict:
+    x, y = rng.randrange(WIDTH - 200), rng.randrange(HEIGHT - 200)
+    return {
+        "x": x,
+        "y": y,
+        "width": rng.randrange(10, 200),
+        "height": rng.randrange(10, 200),
+    }
+
+
+def _vertices(rng: random.Random) -> Dict:
+    box = _box(rng)
+    x_max, y_max = box["x"] + box["width"], box["y"] + box["height"]
+    return {
+        "vertices": [
+            {"x": box["x"], "y": box["y"]},
+            {"x": x_max, "y": box["y"]},
+            {"x": x_max, "y": y_max},
+            {"x": box["x"], "y": y_max},
+        ]
+    }
+
+
+def _plate_attributes(rng: random.Random) -> Dict:
+    string = "".join(rng.choice("ABCDEFGHJKLMNPRSTUVWXYZ0123456789") for _ in range(7))
+    return {
+        "system": {
+            "string": {"name": string, "confidence": rng.random()},
+            "characters": [
+                {
+                    "bounding": _vertices(rng),
+                    "index": i,
+                    "confidence": rng.random(),
+                    "character": char,
+                }
+                for i, char in enumerate(string)
+            ],
+            "region": {"name": "UK", "confidence": rng.random()},
+        }
+    }
+
+
+def make_detections(num_objects: int, seed: int = 0) -> Dict:
+    """Detections payload with `num_objects` faces and people, half of each."""
+    rng = random.Random(seed)
+    objects = []
+    for i in range(num_objects):
+        if i % 2:
+            objects.append({"type": "person", "boundingBox": _box(rng)})
+        else:
+            objects.append(
+                {
+                    "type": "face",
+                    "boundingBox": _box(rng),
+                    "attributes": {
+                        "gender": rng.choice(["male", "female"]),
+                        "genderConfidence": rng.random(),
+                        "age": rng.randrange(10, 80),
+                        "ageConfidence": rng.random(),
+                        "frontal": rng.random() > 0.5,
+                    },
+                }
+            )
+    return {
+        "image": {"width": WIDTH, "height": HEIGHT, "orientation": 1},
+        "objects": objects,
+        "requestId": f"{seed:032x}",
+    }
+
+
+def make_recognitions(num_objects: int, seed: int = 0) -> Dict:
+    """
+    Recognitions payload with `num_objects` vehicles (with plates) and
+    standalone license plates, half of each.
+    """
+    rng = random.Random(seed)
+    objects = []
+    for i in range(num_objects):
+        if i % 2:
+            objects.append(
+                {
+                    "objectType": "licenseplate",
+                    "licenseplateAnnotation": {
+                        "bounding": _vertices(rng),
+                        "attributes": _plate_attributes(rng),
+                    },
+                }
+            )
+        else:
+            objects.append(
+                {
+                    "objectId": f"_vehicle_{i}",
+                    "objectType": "vehicle",
+                    "vehicleAnnotation": {
+                        "bounding": _vertices(rng),
+                        "recognitionConfidence": rng.random(),
+                        "licenseplate": {
+                            "bounding": _vertices(rng),
+                            "attributes": _plate_attributes(rng),
+                        },
+                        "attributes": {
+                            "system": {
+                                "make": {"name": "Ford", "confidence": rng.random()},
+                                "model": {"name": "Ranger", "confidence": rng.random()},
+                                "color": {"name": "black", "confidence": rng.random()},
+                                "vehicleType": "car",
+                            }
+                        },
+                    },
+                }
+            )
+    return {
+        "image": {"width": WIDTH, "height": HEIGHT, "orientation": 1},
+        "objects": objects,
+        "requestId": f"{seed:032x}",
+    }
+
+
+def make_image(size: int) -> bytes:
+    """Incompressible bytes standing in for a JPEG of `size` bytes."""
+    return os.urandom(size)
@@ -0,0 +1,289 @@
+"""
+Microbenchmark suite for the encoding, parsing and bbox conversion hot paths.
+
+Each case is timed (best of several repeats) and its allocations traced (peak
+bytes and memory blocks retained by its output). Allocations are traced on a
+first call made before timing, after a full garbage collection has emptied the
+interpreter's free lists, which would otherwise hide allocations. The run fails
+if any case allocates or retains more than `--alloc-tolerance` beyond its
+baseline, or is slower than its baseline by more than `--time-tolerance`.
+
+Allocation figures are stable across machines for one Python version, so they
+are committed in `benchmarks/baseline.json`. Timings are machine specific, so
+they are kept in the untracked `benchmarks/timings.local.json`, recorded by the
+first run on a machine. Missing baseline files are created rather than
+compared against.
+
+Run from the repo root:
+
+    python -m benchmarks.suite                  # compare against the baselines
+    python -m benchmarks.suite --save-baseline  # record new baselines
+    python -m benchmarks.suite --quick          # smaller scales, no 10 MB image
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import simplehound.core as hound
+from benchmarks.payloads import make_detections, make_image, make_recognitions
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+TIMINGS_PATH = os.path.join(os.path.dirname(__file__), "timings.local.json")
+ALLOCATION_FIELDS = ["peak_bytes", "retained_blocks"]
+TIMING_FIELDS = ["seconds", "throughput", "unit"]
+OBJECT_COUNTS = [1, 10, 100, 1000]
+IMAGE_SIZES = [100 * 1024, 1024 * 1024, 10 * 1024 * 1024]
+QUICK_OBJECT_COUNTS = [1, 100]
+QUICK_IMAGE_SIZES = [100 * 1024, 1024 * 1024]
+# Allowed on top of the relative tolerance, so tiny cases do not flap.
+PEAK_BYTES_SLACK = 1024
+RETAINED_BLOCKS_SLACK = 16
+
+
+class Case(NamedTuple):
+    name: str
+    func: Callable[[], object]
+    items: int  # objects or bytes processed per call, for throughput
+    unit: str
+
+
+class Result(NamedTuple):
+    seconds: float
+    throughput: float
+    unit: str
+    peak_bytes: int
+    retained_blocks: int
+
+
+def bbox_loop(payload: Dict) -> List:
+    width, height = payload["image"]["width"], payload["image"]["height"]
+    return [
+        hound.bbox_to_tf_style(obj["boundingBox"], width, height)
+        for obj in payload["objects"]
+    ]
+
+
+def bboxvert_loop(payload: Dict) -> List:
+    width, height = payload["image"]["width"], payload["image"]["height"]
+    boxes = []
+    for obj in payload["objects"]:
+        annotation = obj.get("vehicleAnnotation") or obj["licenseplateAnnotation"]
+        boxes.append(hound.bboxvert_to_tf_style(annotation["bounding"], width, height))
+    return boxes
+
+
+def build_cases(object_counts: List[int], image_sizes: List[int]) -> List[Case]:
+    cases = []
+    for size in image_sizes:
+        image = make_image(size)
+        label = f"{size // 1024}KB"
+        cases.append(
+            Case(
+                f"encode_image[{label}]",
+                lambda image=image: hound.encode_image(image),
+                size,
+                "B",
+            )
+        )
+        cases.append(
+            Case(
+                f"build_request_body[{label}]",
+                lambda image=image: hound.build_request_body(image),
+                size,
+                "B",
+            )
+        )
+    for count in object_counts:
+        detections = make_detections(count)
+        recognitions = make_recognitions(count)
+        # Decoded on every call, so blocks of the payload kept alive by the
+        # models count as retained.
+        detections_json = json.dumps(detections)
+        recognitions_json = json.dumps(recognitions)
+        cases += [
+            Case(
+                f"get_faces_as_objects[{count}]",
+                lambda d=detections_json: hound.get_faces(json.loads(d), True),
+                count,
+                "obj",
+            ),
+            Case(
+                f"get_vehicles_as_objects[{count}]",
+                lambda r=recognitions_json: hound.get_vehicles(json.loads(r), True),
+                count,
+                "obj",
+            ),
+            Case(
+                f"get_vehicles[{count}]",
+                lambda r=recognitions: hound.get_vehicles(r),
+                count,
+                "obj",
+            ),
+            Case(
+                f"get_license_plates[{count}]",
+                lambda r=recognitions: hound.get_license_plates(r),
+                count,
+                "obj",
+            ),
+            Case(
+                f"get_faces[{count}]",
+                lambda d=detections: hound.get_faces(d),
+                count,
+                "obj",
+            ),
+            Case(
+                f"bbox_to_tf_style[{count}]",
+                lambda d=detections: bbox_loop(d),
+                count,
+                "obj",
+            ),
+            Case(
+                f"bboxvert_to_tf_style[{count}]",
+                lambda r=recognitions: bboxvert_loop(r),
+                count,
+                "obj",
+            ),
+        ]
+    return cases
+
+
+def trace_allocations(func: Callable[[], object]) -> Tuple[int, int]:
+    """The peak bytes and retained blocks of one call of `func`."""
+    # A full collection also clears the free lists of dicts, lists, tuples and
+    # floats, so the objects the call creates are allocated, and traced, anew.
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    output = func()  # kept alive so its blocks count as retained
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del output
+    retained_blocks = sum(
+        stat.count_diff
+        for stat in after.compare_to(before, "filename")
+        if stat.count_diff > 0
+    )
+    return peak, retained_blocks
+
+
+def measure(case: Case, min_time: float = 0.2, repeat: int = 5) -> Result:
+    # Trace first, as the timing loop leaves freed objects behind for reuse.
+    peak, retained_blocks = trace_allocations(case.func)
+    timer = timeit.Timer(case.func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+    return Result(seconds, case.items / seconds, case.unit, peak, retained_blocks)
+
+
+def compare(
+    name: str,
+    result: Result,
+    baseline: Dict,
+    timings: Dict,
+    time_tolerance: float,
+    alloc_tolerance: float,
+) -> List[str]:
+    failures = []
+    if timings and result.seconds > timings["seconds"] * (1 + time_tolerance):
+        failures.append(
+            f"{name}: {result.seconds * 1e6:.1f} us/call vs baseline "
+            f"{timings['seconds'] * 1e6:.1f} us/call"
+        )
+    if not baseline:
+        return failures
+    if result.peak_bytes > (
+        baseline["peak_bytes"] * (1 + alloc_tolerance) + PEAK_BYTES_SLACK
+    ):
+        failures.append(
+            f"{name}: peak {result.peak_bytes} B vs baseline {baseline['peak_bytes']} B"
+        )
+    if result.retained_blocks > (
+        baseline["retained_blocks"] * (1 + alloc_tolerance) + RETAINED_BLOCKS_SLACK
+    ):
+        failures.append(
+            f"{name}: {result.retained_blocks} blocks retained vs baseline "
+            f"{baseline['retained_blocks']}"
+        )
+    return failures
+
+
+def load(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(path: str, stored: Dict, results: Dict, fields: List[str]):
+    """Update the cases of `results` in the baseline at `path`, keeping the others."""
+    stored = dict(stored)
+    for name, result in results.items():
+        stored[name] = {field: result[field] for field in fields}
+    with open(path, "w") as f:
+        json.dump(stored, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Baseline saved to {path}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="allocations")
+    parser.add_argument("--timings", default=TIMINGS_PATH, help="timings")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--filter", default="", help="only run cases containing this")
+    parser.add_argument("--time-tolerance", type=float, default=0.5)
+    parser.add_argument("--alloc-tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        cases = build_cases(QUICK_OBJECT_COUNTS, QUICK_IMAGE_SIZES)
+    else:
+        cases = build_cases(OBJECT_COUNTS, IMAGE_SIZES)
+    cases = [case for case in cases if args.filter in case.name]
+
+    baseline = load(args.baseline)
+    timings = load(args.timings)
+
+    results = {}
+    failures = []
+    print(
+        f"{'case':<32} {'us/call':>10} {'throughput':>16} {'peak KB':>9} {'blocks':>7}"
+    )
+    for case in cases:
+        result = measure(case)
+        results[case.name] = result._asdict()
+        print(
+            f"{case.name:<32} {result.seconds * 1e6:>10.1f}"
+            f" {result.throughput:>12.3g} {result.unit}/s"
+            f" {result.peak_bytes / 1024:>9.1f} {result.retained_blocks:>7}"
+        )
+        if not args.save_baseline:
+            failures += compare(
+                case.name,
+                result,
+                baseline.get(case.name),
+                timings.get(case.name),
+                args.time_tolerance,
+                args.alloc_tolerance,
+            )
+
+    if args.save_baseline or not baseline:
+        save(args.baseline, baseline, results, ALLOCATION_FIELDS)
+    if args.save_baseline or not timings:
+        save(args.timings, timings, results, TIMING_FIELDS)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,13 @@ VERSION = "0.6"
 
 REQUIRES = ["requests"]
 
+EXTRAS_REQUIRE = {
+    "async": ["aiohttp"],
+    "fastjson": ["orjson"],
+    "numpy": ["numpy"],
+    "preprocess": ["Pillow"],
+}
+
 setup(
     name="simplehound",
     version=VERSION,
@@ -12,6 +19,8 @@ setup(
     author_email="robmarkcole@gmail.com",
     description="Unofficial python API for Sighthound",
     install_requires=REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
+    entry_points={"console_scripts": ["simplehound=simplehound.cli:main"]},
     packages=find_packages(exclude=["tests", "tests.*"]),
     license="Apache License, Version 2.0",
     python_requires=">=3.6",
@@ -0,0 +1,157 @@
+"""
+Simplehound asyncio client.
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict
+
+import aiohttp
+
+from simplehound.cache import cache_key
+from simplehound.coalesce import AsyncSingleFlight
+from simplehound.codec import DEFAULT_CODEC, JsonCodec
+from simplehound.core import (
+    ALLOWED_MODES,
+    ALLOWED_RECOGNITION_OPTIONS,
+    BAD_API_KEY,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+    DETECTIONS_PARAMS,
+    HTTP_OK,
+    SimplehoundException,
+    encode_image,
+    endpoint_urls,
+)
+from simplehound.metrics import RequestMetrics
+
+
+def _client_timeout(timeout) -> aiohttp.ClientTimeout:
+    """
+    Map a `cloud` style timeout to aiohttp: a `(connect, read)` tuple, or one
+    number used for both like `requests` does, or None for no timeout.
+    """
+    if isinstance(timeout, aiohttp.ClientTimeout):
+        return timeout
+    if timeout is None:
+        return aiohttp.ClientTimeout(total=None)
+    if isinstance(timeout, tuple):
+        connect_timeout, read_timeout = timeout
+    else:
+        connect_timeout = read_timeout = timeout
+    return aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+
+
+class AsyncCloud:
+    """
+    Work with Sighthound cloud from asyncio.
+
+    All requests share one aiohttp connection pool, and at most `max_concurrency`
+    requests are in flight at any time. Call `await close()` when done, or use
+    the instance as an async context manager. Set `base_url` to talk to another
+    server than Sighthound cloud.
+
+    Set `coalesce` to share one request between concurrent calls for the same
+    image, endpoint and object type; every caller gets the result or exception.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        mode: str = "dev",
+        max_concurrency: int = DEFAULT_POOL_SIZE,
+        timeout=DEFAULT_TIMEOUT,
+        json_codec: JsonCodec = DEFAULT_CODEC,
+        base_url: str = None,
+        coalesce: bool = False,
+    ):
+        if not mode in ALLOWED_MODES:
+            raise SimplehoundException(
+                f"Mode {mode} is not allowed, must be dev or prod"
+            )
+        self._api_key = api_key
+        self._url_detections, self._url_recognitions = endpoint_urls(mode, base_url)
+        self._max_concurrency = max_concurrency
+        self._codec = json_codec
+        self._flights = AsyncSingleFlight() if coalesce else None
+        self._hooks = []
+        self._timeout = _client_timeout(timeout)
+        # Created on first use so they bind to the running event loop.
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the session and release pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def add_hook(self, hook: Callable[[RequestMetrics], None]):
+        """Call `hook` with the `RequestMetrics` of every request made."""
+        self._hooks.append(hook)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self._timeout
+            )
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+
+    async def _sighthound_call(
+        self, image_encoded: str, url: str, params=(), object_type: str = ""
+    ) -> Dict:
+        session = self._get_session()
+        headers = {"Content-type": "application/json", "X-Access-Token": self._api_key}
+        body = self._codec.dumps({"image": image_encoded})
+        metrics = None
+        if self._hooks:
+            endpoint = "detections" if url == self._url_detections else "recognition"
+            metrics = RequestMetrics(endpoint, object_type)
+            metrics.attempts = 1
+            metrics.bytes_sent = len(body)
+        async with self._semaphore:
+            start = time.perf_counter()
+            async with session.post(
+                url, headers=headers, params=params, data=body
+            ) as response:
+                content = await response.read()
+                if metrics is not None:
+                    metrics.round_trip_time = time.perf_counter() - start
+                    metrics.status_code = response.status
+                    metrics.response_bytes = len(content)
+                    for hook in self._hooks:
+                        hook(metrics)
+                if response.status == HTTP_OK:
+                    return self._codec.loads(content)
+                elif response.status == BAD_API_KEY:
+                    raise SimplehoundException(
+                        f"Bad API key for Sighthound", status_code=BAD_API_KEY
+                    )
+
+    async def _call(self, image: bytes, url: str, object_type: str = "", params=()):
+        def call():
+            return self._sighthound_call(
+                encode_image(image), url + object_type, params, object_type
+            )
+
+        if self._flights is None:
+            return await call()
+        return await self._flights.do(cache_key(image, url, object_type), call)
+
+    async def detect(self, image: bytes) -> Dict:
+        """Run detection on an image (bytes)."""
+        return await self._call(image, self._url_detections, "", DETECTIONS_PARAMS)
+
+    async def recognize(self, image: bytes, object_type: str) -> Dict:
+        """Run recognition on an image (bytes)."""
+        if not object_type in ALLOWED_RECOGNITION_OPTIONS:
+            raise SimplehoundException(f"object_type {object_type} is not valid")
+        return await self._call(image, self._url_recognitions, object_type)
@@ -0,0 +1,168 @@
+"""
+Simplehound result cache.
+
+Results are keyed on a hash of the image bytes plus the endpoint url (which
+encodes the mode) and recognition object type, so byte-identical frames are
+only sent to Sighthound once.
+"""
+
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+def cache_key(image: bytes, url: str, object_type: str = "") -> str:
+    """
+    Build the cache key for an image posted to `url` with `object_type`.
+    """
+    digest = hashlib.blake2b(image, digest_size=20).hexdigest()
+    return f"{url}|{object_type}|{digest}"
+
+
+class CacheStats:
+    """Hit, miss and eviction counters of a cache."""
+
+    __slots__ = ("hits", "misses", "evictions", "expirations")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SQLiteCache:
+    """
+    Persistent cache tier backed by a SQLite database at `path`.
+
+    Entries older than `ttl` seconds are treated as expired and deleted on read.
+    """
+
+    def __init__(self, path: str, ttl: float = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[Tuple[Dict, float]]:
+        """Return `(result, created)` for `key`, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self._ttl is not None and time.time() - created > self._ttl:
+                with self._conn:
+                    self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+        return json.loads(value), created
+
+    def set(self, key: str, value: Dict):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time()),
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResultCache:
+    """
+    In-memory LRU cache of Sighthound results with optional TTL.
+
+    At most `max_size` results are held in memory, least recently used first out.
+    Results older than `ttl` seconds are expired. If a `persistent` tier such as
+    `SQLiteCache` is given, it is written through and consulted on memory misses.
+    Returned results are copies, so callers may mutate them freely.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        ttl: float = None,
+        persistent: SQLiteCache = None,
+    ):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._persistent = persistent
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached result for `key`, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, value = entry
+                if self._ttl is not None and time.time() - created > self._ttl:
+                    del self._entries[key]
+                    self.stats.expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return copy.deepcopy(value)
+        if self._persistent is not None:
+            entry = self._persistent.get(key)
+            if entry is not None:
+                value, created = entry
+                with self._lock:
+                    if self._ttl is not None and time.time() - created > self._ttl:
+                        self.stats.expirations += 1
+                        self.stats.misses += 1
+                        return None
+                    self.stats.hits += 1
+                    # Keep the original age, so promotion does not extend its life.
+                    self._store(key, value, created)
+                return copy.deepcopy(value)
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value: Dict):
+        """Cache `value` under `key`."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._store(key, value)
+        if self._persistent is not None:
+            self._persistent.set(key, value)
+
+    def _store(self, key: str, value: Dict, created: float = None):
+        self._entries[key] = (time.time() if created is None else created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self):
+        """Drop all cached results, including the persistent tier."""
+        with self._lock:
+            self._entries.clear()
+        if self._persistent is not None:
+            self._persistent.clear()
@@ -0,0 +1,196 @@
+"""
+Command line bulk processing of stored images.
+
+Walks directories and/or glob patterns, runs detection or recognition on every
+image with `cloud.detect_file` / `cloud.recognize_file` on a pool of threads
+(streaming each file from an mmap), and writes one JSONL record per image:
+
+    {"path": "frames/0001.jpg", "result": {...}}
+    {"path": "frames/0002.jpg", "error": "...", "status_code": 429}
+
+A response without a result (e.g. a 400, or a 5xx once retries are used up) is
+recorded as an error. Each successfully processed path is appended to a
+checkpoint file once its record is written, so re-running the same command after
+an interruption skips completed images and only submits the rest (failed images
+are retried).
+
+    simplehound frames/ "archive/**/*.jpg" -o results.jsonl --workers 8 --rate-limit 5
+"""
+
+import argparse
+import glob
+import os
+import sys
+import threading
+from typing import Iterable, List, Set
+
+from simplehound.codec import get_codec
+from simplehound.core import (
+    ALLOWED_MODES,
+    ALLOWED_RECOGNITION_OPTIONS,
+    DEFAULT_POOL_SIZE,
+    SimplehoundException,
+    cloud,
+    parse_detections,
+    parse_recognitions,
+    run_batch,
+)
+from simplehound.ratelimit import RetryPolicy
+
+API_KEY_ENV = "SIGHTHOUND_API_KEY"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp")
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+
+def find_images(patterns: Iterable[str]) -> List[str]:
+    """
+    Expand directories (recursively) and glob patterns into a sorted list of
+    image paths. Explicitly named files are kept whatever their extension.
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                paths.update(
+                    os.path.join(root, name)
+                    for name in files
+                    if name.lower().endswith(IMAGE_EXTENSIONS)
+                )
+        elif os.path.isfile(pattern):
+            paths.add(pattern)
+        else:
+            paths.update(
+                path
+                for path in glob.glob(pattern, recursive=True)
+                if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS)
+            )
+    return sorted(paths)
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    """Paths already completed by a previous run."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as checkpoint:
+        return {line.rstrip("\n") for line in checkpoint if line.strip()}
+
+
+def _record(path: str, result, error: Exception, parse) -> dict:
+    if error is None:
+        return {"path": path, "result": parse(result) if parse else result}
+    status_code = getattr(error, "status_code", None)
+    return {
+        "path": path,
+        "error": str(error) or type(error).__name__,
+        "status_code": status_code,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="simplehound",
+        description="Run Sighthound detection or recognition over stored images.",
+    )
+    parser.add_argument("inputs", nargs="+", help="image files, directories or globs")
+    parser.add_argument(
+        "-o", "--output", default="-", help="JSONL output file, default: stdout"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help=f"completed paths, default: OUTPUT{CHECKPOINT_SUFFIX}",
+    )
+    parser.add_argument(
+        "--api-key",
+        default=os.environ.get(API_KEY_ENV),
+        help=f"default: ${API_KEY_ENV}",
+    )
+    parser.add_argument("--mode", choices=ALLOWED_MODES, default="dev")
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument(
+        "--recognize",
+        choices=ALLOWED_RECOGNITION_OPTIONS,
+        default=None,
+        help="run recognition of this type instead of detection",
+    )
+    parser.add_argument(
+        "--parsed",
+        action="store_true",
+        help="write parse_detections/parse_recognitions output instead of raw JSON",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_POOL_SIZE)
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests/s")
+    parser.add_argument("--burst", type=int, default=None)
+    parser.add_argument("--retries", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error(f"an API key is required, pass --api-key or set ${API_KEY_ENV}")
+    checkpoint_path = args.checkpoint
+    if checkpoint_path is None:
+        if args.output == "-":
+            parser.error("--checkpoint is required when writing to stdout")
+        checkpoint_path = args.output + CHECKPOINT_SUFFIX
+
+    done = load_checkpoint(checkpoint_path)
+    found = find_images(args.inputs)
+    paths = [path for path in found if path not in done]
+
+    if args.recognize:
+        parse = parse_recognitions if args.parsed else None
+    else:
+        parse = parse_detections if args.parsed else None
+    dumps = get_codec().dumps
+    api = cloud(
+        args.api_key,
+        args.mode,
+        pool_size=args.workers,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        retry=RetryPolicy(max_retries=args.retries) if args.retries else None,
+        base_url=args.base_url,
+    )
+
+    # cloud returns None for unexpected statuses, the hook records which one.
+    local = threading.local()
+    api.add_hook(lambda metrics: setattr(local, "status_code", metrics.status_code))
+
+    def call(path: str):
+        local.status_code = None
+        if args.recognize:
+            result = api.recognize_file(path, args.recognize)
+        else:
+            result = api.detect_file(path)
+        if result is None:
+            raise SimplehoundException(
+                f"No result, HTTP status {local.status_code}", local.status_code
+            )
+        return result
+
+    output = sys.stdout.buffer if args.output == "-" else open(args.output, "ab")
+    failures = 0
+    try:
+        with api, open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+            for item in run_batch(call, paths, args.workers, ordered=False):
+                path = paths[item.index]
+                output.write(dumps(_record(path, item.result, item.error, parse)))
+                output.write(b"\n")
+                output.flush()
+                if item.error is None:
+                    checkpoint.write(path + "\n")
+                    checkpoint.flush()
+                else:
+                    failures += 1
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+    print(
+        f"{len(paths) - failures} processed, {failures} failed, "
+        f"{len(found) - len(paths)} skipped from checkpoint",
+        file=sys.stderr,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Simplehound request coalescing.
+
+When several callers ask for the same result at the same moment, only the
+first (the leader) makes the call; the others wait for it and receive a copy
+of its result, or its exception. Keys are built with `cache_key`, so calls are
+coalesced on image hash, endpoint and object type.
+"""
+
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key across threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def do(self, key: str, call: Callable[[], Dict]) -> Dict:
+        """Return `call()`, sharing one call between concurrent callers of `key`."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return copy.deepcopy(future.result())
+        try:
+            future.set_result(call())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+
+class AsyncSingleFlight:
+    """
+    Coalesce concurrent calls with the same key within an event loop.
+
+    The shared call runs as its own task, so cancelling one waiting caller
+    does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Dict]]) -> Dict:
+        """Await `call()`, sharing one call between concurrent callers of `key`."""
+        # Imported here so the thread-based client does not pay for asyncio.
+        import asyncio
+
+        task = self._tasks.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return copy.deepcopy(await asyncio.shield(task))
+        task = self._tasks[key] = asyncio.ensure_future(call())
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
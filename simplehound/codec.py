@@ -0,0 +1,61 @@
+"""
+Simplehound JSON codecs.
+
+A codec encodes request bodies straight to bytes and decodes response bodies
+straight from bytes. `get_codec()` picks the fastest installed library:
+orjson, then ujson, then the stdlib `json`.
+"""
+
+import json
+from typing import Any, Callable, NamedTuple
+
+CODEC_PREFERENCE = ["orjson", "ujson", "json"]
+
+
+class JsonCodec(NamedTuple):
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec("json", lambda obj: json.dumps(obj).encode("utf-8"), json.loads)
+
+
+def _orjson_codec() -> JsonCodec:
+    import orjson
+
+    return JsonCodec("orjson", orjson.dumps, orjson.loads)
+
+
+def _ujson_codec() -> JsonCodec:
+    import ujson
+
+    return JsonCodec("ujson", lambda obj: ujson.dumps(obj).encode("utf-8"), ujson.loads)
+
+
+_CODEC_FACTORIES = {
+    "json": _stdlib_codec,
+    "orjson": _orjson_codec,
+    "ujson": _ujson_codec,
+}
+
+
+def get_codec(name: str = None) -> JsonCodec:
+    """
+    Get the JSON codec called `name`, or the fastest installed one if None.
+
+    Raises ImportError if the named codec's library is not installed.
+    """
+    if name is not None:
+        if name not in _CODEC_FACTORIES:
+            raise ValueError(f"Unknown JSON codec {name}")
+        return _CODEC_FACTORIES[name]()
+    for candidate in CODEC_PREFERENCE:
+        try:
+            return _CODEC_FACTORIES[candidate]()
+        except ImportError:
+            continue
+
+
+DEFAULT_CODEC = get_codec()
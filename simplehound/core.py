@@ -1,218 +1,813 @@
 """
 Simplehound core.
 """
+
 import base64
-import json
-from typing import Dict, List, Tuple
+import binascii
+import contextlib
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from simplehound.cache import ResultCache, cache_key
+from simplehound.coalesce import SingleFlight
+from simplehound.codec import DEFAULT_CODEC, JsonCodec
+from simplehound.metrics import RequestMetrics
+from simplehound.parse import (
+    bbox_to_tf_style,
+    bboxvert_to_tf_style,
+    get_faces,
+    get_license_plates,
+    get_metadata,
+    get_people,
+    get_vehicles,
+    parse_detections,
+    parse_recognitions,
+    partition_objects,
+    transform_coordinates,
+)
+from simplehound.ratelimit import RetryPolicy, TokenBucket
 
-import requests
+if TYPE_CHECKING:
+    import requests
 
 ## Const
 HTTP_OK = 200
 BAD_API_KEY = 401
 
+## HTTP
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+
 ## API urls
-URL_DETECTIONS_BASE = "https://{}.sighthoundapi.com/v1/detections"
-URL_RECOGNITIONS_BASE = "https://{}.sighthoundapi.com/v1/recognition?objectType="
+URL_API_BASE = "https://{}.sighthoundapi.com"
+DETECTIONS_PATH = "/v1/detections"
+RECOGNITIONS_PATH = "/v1/recognition?objectType="
+URL_DETECTIONS_BASE = URL_API_BASE + DETECTIONS_PATH
+URL_RECOGNITIONS_BASE = URL_API_BASE + RECOGNITIONS_PATH
 ALLOWED_MODES = ["dev", "prod"]
 
 ALLOWED_RECOGNITION_OPTIONS = ["licenseplate", "vehicle", "vehicle,licenseplate"]
 
+## Request body
+BODY_PREFIX = b'{"image": "'
+BODY_SUFFIX = b'"}'
+ENCODE_CHUNK_SIZE = 3 * 16 * 1024  # multiple of 3 so chunks encode without padding
+
 DETECTIONS_PARAMS = (
     ("type", "all"),
     ("faceOption", "gender,age"),
 )
 
 
-def bbox_to_tf_style(bbox: Dict, img_width: int, img_height: int) -> Tuple:
+def encode_image(image: bytes) -> str:
+    """base64 encode an image."""
+    return base64.b64encode(image).decode("ascii")
+
+
+def build_request_body(image) -> bytearray:
     """
-    Convert Sighthound bounding box to tensorflow box style.
+    Build the JSON request body `{"image": "<base64>"}` for an image.
 
-    In Tensorflow the bounding box is defined by the tuple (y_min, x_min, y_max, x_max)
-    where the coordinates are floats in the range [0.0, 1.0] and
-    relative to the width and height of the image.
-    For example, if an image is 100 x 200 pixels (height x width) and the bounding
-    box is `(0.1, 0.2, 0.5, 0.9)`, the upper-left and bottom-right coordinates of
-    the bounding box will be `(40, 10)` to `(180, 50)` (in (x,y) coordinates).
+    The image may be `bytes`, `bytearray` or a `memoryview`. It is base64 encoded
+    chunk by chunk straight into one preallocated buffer, so peak memory is the
+    body plus one chunk rather than several full copies of the encoded image.
     """
+    view = memoryview(image).cast("B")
+    encoded_size = 4 * ((len(view) + 2) // 3)
+    body = bytearray(len(BODY_PREFIX) + encoded_size + len(BODY_SUFFIX))
+    pos = len(BODY_PREFIX)
+    body[:pos] = BODY_PREFIX
+    for start in range(0, len(view), ENCODE_CHUNK_SIZE):
+        encoded = binascii.b2a_base64(
+            view[start : start + ENCODE_CHUNK_SIZE], newline=False
+        )
+        body[pos : pos + len(encoded)] = encoded
+        pos += len(encoded)
+    body[pos:] = BODY_SUFFIX
+    return body
 
-    decimals = 5
-    x_min = round(bbox["x"] / img_width, decimals)
-    x_max = round((bbox["x"] + bbox["width"]) / img_width, decimals)
-    y_min = round(bbox["y"] / img_height, decimals)
-    y_max = round((bbox["y"] + bbox["height"]) / img_height, decimals)
-    return (y_min, x_min, y_max, x_max)
 
+class StreamingBody:
+    """
+    File-like JSON request body `{"image": "<base64>"}` for an image buffer.
 
-def bboxvert_to_tf_style(bbox: Dict, img_width: int, img_height: int) -> Tuple:
+    The body is base64 encoded on the fly as it is read, so only the block
+    being sent is ever held encoded, whatever the size of the image. Combined
+    with an mmap of the image file (see `map_file`) peak memory per request no
+    longer scales with image size. Seekable, so the body can be resent.
     """
-    Convert Sighthound bounding box vertices, returned from the recognition API, to tensorflow box style.
 
-    In Tensorflow the bounding box is defined by the tuple (y_min, x_min, y_max, x_max)
-    where the coordinates are floats in the range [0.0, 1.0] and
-    relative to the width and height of the image.
-    For example, if an image is 100 x 200 pixels (height x width) and the bounding
-    box is `(0.1, 0.2, 0.5, 0.9)`, the upper-left and bottom-right coordinates of
-    the bounding box will be `(40, 10)` to `(180, 50)` (in (x,y) coordinates).
+    def __init__(self, image):
+        self._image = image
+        self._encoded_end = len(BODY_PREFIX) + 4 * ((len(image) + 2) // 3)
+        self._length = self._encoded_end + len(BODY_SUFFIX)
+        self._pos = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._pos, os.SEEK_END: self._length}
+        self._pos = min(max(0, base[whence] + offset), self._length)
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        pos = self._pos
+        end = (
+            self._length if size is None or size < 0 else min(self._length, pos + size)
+        )
+        parts = []
+        if pos < len(BODY_PREFIX):
+            parts.append(BODY_PREFIX[pos:end])
+            pos = min(end, len(BODY_PREFIX))
+        if pos < end and pos < self._encoded_end:
+            stop = min(end, self._encoded_end)
+            # Encode whole 3 byte groups covering [pos, stop) of the base64 text.
+            first = (pos - len(BODY_PREFIX)) // 4
+            last = (stop - len(BODY_PREFIX) + 3) // 4
+            encoded = binascii.b2a_base64(
+                self._image[first * 3 : last * 3], newline=False
+            )
+            skip = pos - len(BODY_PREFIX) - first * 4
+            parts.append(encoded[skip : skip + stop - pos])
+            pos = stop
+        if pos < end:
+            parts.append(BODY_SUFFIX[pos - self._encoded_end : end - self._encoded_end])
+        self._pos = end
+        return b"".join(parts)
+
+
+@contextlib.contextmanager
+def map_file(path: str):
+    """Memory-map the file at `path` read-only for the duration of the block."""
+    with open(path, "rb") as image_file:
+        if os.fstat(image_file.fileno()).st_size == 0:
+            yield b""  # empty files cannot be mapped
+            return
+        with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as image:
+            yield image
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> "requests.Session":
+    """
+    Create a keep-alive session with a connection pool of `pool_size` connections.
     """
+    # requests is imported on first use, so importing this module stays cheap.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _sighthound_call(
+    image_encoded: str,
+    api_key: str,
+    url: str,
+    params=(),
+    session: "requests.Session" = None,
+    timeout=None,
+    codec: JsonCodec = DEFAULT_CODEC,
+) -> Dict:
+    body = codec.dumps({"image": image_encoded})
+    return _sighthound_post(body, api_key, url, params, session, timeout, codec)
+
+
+def _sighthound_post(
+    body,
+    api_key: str,
+    url: str,
+    params=(),
+    session=None,
+    timeout=None,
+    codec: JsonCodec = DEFAULT_CODEC,
+    retry: RetryPolicy = None,
+    limiter: TokenBucket = None,
+    metrics: RequestMetrics = None,
+) -> Dict:
+    import requests
 
-    decimals = 5
-    xs = [d["x"] for d in bbox["vertices"]]
-    ys = [d["y"] for d in bbox["vertices"]]
-    x_min = round(min(xs) / img_width, decimals)
-    x_max = round(max(xs) / img_width, decimals)
-    y_min = round(min(ys) / img_height, decimals)
-    y_max = round(max(ys) / img_height, decimals)
-    return (y_min, x_min, y_max, x_max)
+    headers = {"Content-type": "application/json", "X-Access-Token": api_key}
+    post = session.post if session is not None else requests.post
+    if metrics is not None:
+        metrics.bytes_sent = len(body)
+    deadline = None
+    if retry is not None and retry.deadline is not None:
+        deadline = time.monotonic() + retry.deadline
+    attempt = 0
+    status_code = None
+    while True:
+        if limiter is not None and not limiter.acquire(deadline):
+            raise SimplehoundException(
+                "Deadline exceeded waiting for rate limit", status_code
+            )
+        attempt_timeout = timeout
+        if deadline is not None:
+            # The limiter may have slept right up to the deadline.
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SimplehoundException(
+                    "Deadline exceeded calling Sighthound", status_code
+                )
+            attempt_timeout = _attempt_timeout(timeout, remaining)
+        status_code = None
+        start = time.perf_counter()
+        if metrics is not None:
+            metrics.attempts = attempt + 1
+        if hasattr(body, "seek"):
+            body.seek(0)
+        try:
+            response = post(
+                url,
+                headers=headers,
+                params=params,
+                data=body,
+                timeout=attempt_timeout,
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            if retry is None or attempt >= retry.max_retries:
+                raise
+            delay = retry.delay(attempt)
+        else:
+            status_code = response.status_code
+            if metrics is not None:
+                metrics.round_trip_time = time.perf_counter() - start
+                metrics.time_to_first_byte = response.elapsed.total_seconds()
+                metrics.status_code = status_code
+                metrics.response_bytes = len(response.content)
+            if retry is None or status_code not in retry.retry_statuses:
+                return _handle_response(response, codec, metrics)
+            if attempt >= retry.max_retries:
+                raise SimplehoundException(
+                    f"Sighthound returned {status_code} after {attempt + 1} attempts",
+                    status_code,
+                )
+            delay = retry.delay(attempt, response.headers.get("Retry-After"))
+        if deadline is not None and time.monotonic() + delay > deadline:
+            raise SimplehoundException(
+                "Deadline exceeded calling Sighthound", status_code
+            )
+        time.sleep(delay)
+        attempt += 1
 
 
-def encode_image(image: bytes) -> str:
-    """base64 encode an image."""
-    return base64.b64encode(image).decode("ascii")
+def _attempt_timeout(timeout, remaining: float):
+    """Cap a requests `timeout` at the `remaining` seconds before the deadline."""
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(min(part, remaining) for part in timeout)
+    return min(timeout, remaining)
 
 
-def get_faces(detections: Dict) -> List[Dict]:
+def _handle_response(
+    response: "requests.Response", codec: JsonCodec, metrics: RequestMetrics = None
+) -> Dict:
+    if response.status_code == HTTP_OK:
+        if metrics is None:
+            return codec.loads(response.content)
+        start = time.perf_counter()
+        result = codec.loads(response.content)
+        metrics.decode_time = time.perf_counter() - start
+        metrics.request_id = result.get("requestId")
+        return result
+    elif response.status_code == BAD_API_KEY:
+        raise SimplehoundException(f"Bad API key for Sighthound", BAD_API_KEY)
+
+
+def run_detection(
+    image_encoded: str,
+    api_key: str,
+    url_detections: str,
+    session: "requests.Session" = None,
+    timeout=None,
+    codec: JsonCodec = DEFAULT_CODEC,
+) -> Dict:
     """
-    Get the list of the faces.
+    Post an image to Sighthound detection API.
+
+    Pass a `session` (see `create_session`) to reuse pooled keep-alive connections.
     """
-    faces = []
-    for obj in detections["objects"]:
-        if not obj["type"] == "face":
-            continue
-        face = {}
-        face["gender"] = obj["attributes"]["gender"]
-        face["age"] = obj["attributes"]["age"]
-        face["boundingBox"] = obj["boundingBox"]
-        faces.append(face)
-    return faces
+    return _sighthound_call(
+        image_encoded,
+        api_key,
+        url_detections,
+        DETECTIONS_PARAMS,
+        session=session,
+        timeout=timeout,
+        codec=codec,
+    )
 
 
-def get_people(detections: Dict) -> List[Dict]:
+def run_recognition(
+    image_encoded: str,
+    api_key: str,
+    url_recognitions: str,
+    object_type: str,
+    session: "requests.Session" = None,
+    timeout=None,
+    codec: JsonCodec = DEFAULT_CODEC,
+) -> Dict:
     """
-    Get the list of the people.
+    Post an image to Sighthound recognition API.
+
+    Pass a `session` (see `create_session`) to reuse pooled keep-alive connections.
     """
-    people = []
-    for obj in detections["objects"]:
-        if not obj["type"] == "person":
-            continue
-        person = {}
-        person["boundingBox"] = obj["boundingBox"]
-        people.append(person)
-    return people
+    return _sighthound_call(
+        image_encoded,
+        api_key,
+        url_recognitions + object_type,
+        session=session,
+        timeout=timeout,
+        codec=codec,
+    )
 
 
-def get_metadata(detections: Dict) -> Dict:
+def endpoint_urls(mode: str, base_url: str = None) -> Tuple[str, str]:
     """
-    Get the detection metadata.
+    Get the detections and recognitions urls for `mode`, or for a server at
+    `base_url` (such as `simplehound.fakeserver`) if given.
     """
-    metadata = {}
-    metadata["image_width"] = detections["image"]["width"]
-    metadata["image_height"] = detections["image"]["height"]
-    metadata["requestId"] = detections["requestId"]
-    return metadata
+    if base_url is None:
+        base_url = URL_API_BASE.format(mode)
+    base_url = base_url.rstrip("/")
+    return base_url + DETECTIONS_PATH, base_url + RECOGNITIONS_PATH
+
+
+def _is_box(roi) -> bool:
+    return len(roi) == 4 and all(isinstance(value, (int, float)) for value in roi)
+
+
+class SimplehoundException(Exception):
+    def __init__(self, message: str = "", status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
-def get_license_plates(recognitions: Dict) -> List[Dict]:
+class BatchResult(NamedTuple):
     """
-    Get the list of recognized license plates.
+    Outcome of one image in a batch: exactly one of `result` or `error` is set.
     """
-    plates = []
-    for obj in recognitions["objects"]:
-        if not obj["objectType"] == "licenseplate":
-            continue
-        annotation = obj["licenseplateAnnotation"]
-        attributes = annotation["attributes"]["system"]
-        plate = {
-            "boundingBox": annotation["bounding"],
-            "string": attributes["string"],
-            "region": attributes["region"],
-        }
-        plates.append(plate)
-    return plates
 
+    index: int
+    result: Optional[Dict]
+    error: Optional[Exception]
+
+
+def _call_for_batch(index: int, func: Callable, image: bytes) -> BatchResult:
+    try:
+        return BatchResult(index, func(image), None)
+    except Exception as exc:
+        return BatchResult(index, None, exc)
 
-def get_vehicles(detections: Dict) -> List[Dict]:
+
+def run_batch(
+    func: Callable,
+    images: Iterable[bytes],
+    max_workers: int = DEFAULT_POOL_SIZE,
+    ordered: bool = True,
+) -> Iterator[BatchResult]:
     """
-    Get the list of the vehicles.
+    Apply `func` to each image on a pool of `max_workers` threads.
+
+    Yields a `BatchResult` per image, in input order if `ordered` else as each
+    call completes. An exception raised for one image is captured in its
+    `BatchResult.error` and does not abort the rest of the batch.
     """
-    vehicles = []
-    for obj in detections["objects"]:
-        if not obj["objectType"] == "vehicle":
-            continue
-        vehicle = {}
-        vehicle["boundingBox"] = obj["vehicleAnnotation"]["bounding"]
-        vehicle["recognitionConfidence"] = obj["vehicleAnnotation"][
-            "recognitionConfidence"
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_call_for_batch, index, func, image)
+            for index, image in enumerate(images)
         ]
-        attributes = obj["vehicleAnnotation"]["attributes"]["system"]
-        vehicle["vehicleType"] = attributes["vehicleType"]
-        vehicle["make"] = attributes["make"]["name"]
-        vehicle["model"] = attributes["model"]["name"]
-        vehicle["color"] = attributes["color"]["name"]
-        if "licenseplate" in obj["vehicleAnnotation"]:
-            vehicle["licenseplate"] = obj["vehicleAnnotation"]["licenseplate"][
-                "attributes"
-            ]["system"]["string"]["name"]
-            vehicle["region"] = obj["vehicleAnnotation"]["licenseplate"]["attributes"][
-                "system"
-            ]["region"]["name"]
-        else:
-            vehicle["licenseplate"] = "unknown"
-            vehicle["region"] = "unknown"
-        vehicles.append(vehicle)
-    return vehicles
+        try:
+            for future in futures if ordered else as_completed(futures):
+                yield future.result()
+        finally:
+            # Don't run the rest of the batch if the caller stops iterating.
+            for future in futures:
+                future.cancel()
 
 
-def _sighthound_call(image_encoded: str, api_key: str, url: str, params=()) -> Dict:
-    headers = {"Content-type": "application/json", "X-Access-Token": api_key}
-    response = requests.post(
-        url,
-        headers=headers,
-        params=params,
-        data=json.dumps({"image": image_encoded}),
-    )
-    if response.status_code == HTTP_OK:
-        return response.json()
-    elif response.status_code == BAD_API_KEY:
-        raise SimplehoundException(f"Bad API key for Sighthound")
+class cloud:
+    """
+    Work with Sighthound cloud.
 
+    Requests are made over a persistent keep-alive session so the TCP+TLS
+    handshake is only paid once per pooled connection. Call `close()` when done,
+    or use the instance as a context manager.
 
-def run_detection(image_encoded: str, api_key: str, url_detections: str) -> Dict:
-    """Post an image to Sighthound detection API."""
-    return _sighthound_call(image_encoded, api_key, url_detections, DETECTIONS_PARAMS)
+    Pass a `ResultCache` as `cache` to answer byte-identical images from the
+    cache without encoding them or calling Sighthound.
 
+    Pass a `simplehound.preprocess.Preprocessor` as `preprocess` to downscale
+    and/or re-encode images before upload. Coordinates and image dimensions in
+    the results are mapped back to the original resolution.
 
-def run_recognition(
-    image_encoded: str, api_key: str, url_recognitions: str, object_type: str
-) -> Dict:
-    """Post an image to Sighthound recognition API."""
-    return _sighthound_call(image_encoded, api_key, url_recognitions + object_type)
+    Responses are decoded with `json_codec`, by default the fastest installed
+    JSON library (see `simplehound.codec.get_codec`).
 
+    Set `rate_limit` (requests per second) and optionally `burst` to pace calls
+    to your plan's quota with a token bucket. Pass a `RetryPolicy` as `retry` to
+    retry 429, 5xx and connection errors with backoff; once its retries or
+    deadline are exhausted a `SimplehoundException` carrying the last
+    `status_code` is raised.
 
-class SimplehoundException(Exception):
-    pass
+    Every request made is reported as a `RequestMetrics` record to the hooks
+    registered with `add_hook`, for example a `MetricsRegistry`.
 
+    Set `base_url` to talk to another server than Sighthound cloud, such as the
+    local stand-in in `simplehound.fakeserver`.
 
-class cloud:
-    """Work with Sighthound cloud."""
+    Pass a `simplehound.gate.FrameGate` as `gate` and a `stream` key (e.g. the
+    camera name) to `detect`/`recognize` to skip frames nearly identical to
+    the last one submitted for that stream.
+
+    Set `coalesce` to share one request between concurrent calls for the same
+    image, endpoint and object type; every caller gets the result or exception.
+
+    Pass `roi` to `detect`/`recognize` to upload only regions of interest of a
+    frame (requires Pillow). Several regions are sent concurrently and their
+    results merged into one payload in full-frame coordinates.
+    """
 
-    def __init__(self, api_key: str, mode: str = "dev"):
+    def __init__(
+        self,
+        api_key: str,
+        mode: str = "dev",
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout=DEFAULT_TIMEOUT,
+        cache: ResultCache = None,
+        preprocess=None,
+        json_codec: JsonCodec = DEFAULT_CODEC,
+        rate_limit: float = None,
+        burst: int = None,
+        retry: RetryPolicy = None,
+        base_url: str = None,
+        gate=None,
+        coalesce: bool = False,
+    ):
         if not mode in ALLOWED_MODES:
             raise SimplehoundException(
                 f"Mode {mode} is not allowed, must be dev or prod"
             )
         self._api_key = api_key
-        self._url_detections = URL_DETECTIONS_BASE.format(mode)
-        self._url_recognitions = URL_RECOGNITIONS_BASE.format(mode)
+        self._url_detections, self._url_recognitions = endpoint_urls(mode, base_url)
+        self._timeout = timeout
+        self._pool_size = pool_size
+        self._session = create_session(pool_size)
+        self._cache = cache
+        self._preprocess = preprocess
+        self._codec = json_codec
+        self._limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self._retry = retry
+        self._gate = gate
+        self._flights = SingleFlight() if coalesce else None
+        self._hooks = []
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the session and release pooled connections."""
+        self._session.close()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._pool_size)
+            return self._executor
+
+    def _cached_call(
+        self, image: bytes, url: str, object_type: str, call: Callable
+    ) -> Dict:
+        if self._cache is None and self._flights is None:
+            return call()
+        key = cache_key(image, url, object_type)
+        if self._cache is not None:
+            result = self._cache.get(key)
+            if result is not None:
+                return result
+        if self._flights is not None:
+            return self._flights.do(key, lambda: self._fetch(key, call))
+        return self._fetch(key, call)
+
+    def _fetch(self, key: str, call: Callable) -> Dict:
+        result = call()
+        if result is not None and self._cache is not None:
+            self._cache.set(key, result)
+        return result
+
+    def add_hook(self, hook: Callable[[RequestMetrics], None]):
+        """Call `hook` with the `RequestMetrics` of every request made."""
+        self._hooks.append(hook)
+
+    def _new_metrics(self, url: str, object_type: str = "") -> RequestMetrics:
+        if not self._hooks:
+            return None
+        if url == self._url_detections:
+            return RequestMetrics("detections")
+        return RequestMetrics("recognition", object_type)
+
+    def _emit(self, metrics: RequestMetrics):
+        # Cache hits make no request, so there is nothing to report.
+        if metrics is None or metrics.bytes_sent is None:
+            return
+        for hook in self._hooks:
+            hook(metrics)
+
+    def _prepare(self, image: bytes, metrics: RequestMetrics = None) -> Tuple:
+        start = time.perf_counter()
+        prepared = None
+        if self._preprocess is not None:
+            prepared = self._preprocess.process(image)
+            image = prepared.image
+        body = build_request_body(image)
+        if metrics is not None:
+            metrics.encode_time = time.perf_counter() - start
+        return body, prepared
+
+    def _request(
+        self,
+        image: bytes,
+        url: str,
+        object_type: str = "",
+        params=(),
+        metrics: RequestMetrics = None,
+        prepare: Callable = None,
+    ) -> Dict:
+        body, prepared = (prepare or self._prepare)(image, metrics)
+        result = _sighthound_post(
+            body,
+            self._api_key,
+            url + object_type,
+            params,
+            self._session,
+            self._timeout,
+            self._codec,
+            self._retry,
+            self._limiter,
+            metrics,
+        )
+        if result is not None and prepared is not None:
+            prepared.restore(result)
+        return result
+
+    def _prepare_stream(self, image, metrics: RequestMetrics = None) -> Tuple:
+        if self._preprocess is not None:
+            return self._prepare(image, metrics)
+        return StreamingBody(image), None
+
+    def _gated_call(
+        self,
+        image: bytes,
+        url: str,
+        object_type: str,
+        params,
+        stream,
+        prepare: Callable = None,
+        roi=None,
+    ) -> Dict:
+        if self._gate is None or stream is None:
+            return self._submit(image, url, object_type, params, prepare, roi)
+        key = (stream, url + object_type)
+        skip, frame_hash, result = self._gate.check(key, image)
+        if skip:
+            return result
+        result = self._submit(image, url, object_type, params, prepare, roi)
+        if result is not None:
+            self._gate.update(key, frame_hash, result)
+        return result
+
+    def _submit(
+        self, image: bytes, url: str, object_type: str, params, prepare, roi
+    ) -> Dict:
+        if roi is None:
+            return self._call(image, url, object_type, params, prepare)
+        from simplehound.preprocess import Region, crop_regions, merge_results
+
+        regions = [roi] if isinstance(roi, Region) or _is_box(roi) else roi
+        frame_size, crops = crop_regions(image, regions)
+        # Send the first crop from this thread and the rest on the executor.
+        futures = [
+            self._get_executor().submit(
+                self._call, crop.image, url, object_type, params
+            )
+            for crop in crops[1:]
+        ]
+        results = [self._call(crops[0].image, url, object_type, params)]
+        results += [future.result() for future in futures]
+        return merge_results(results, crops, frame_size)
+
+    def _call(
+        self,
+        image: bytes,
+        url: str,
+        object_type: str = "",
+        params=(),
+        prepare: Callable = None,
+    ) -> Dict:
+        metrics = self._new_metrics(url, object_type)
+        try:
+            return self._cached_call(
+                image,
+                url,
+                object_type,
+                lambda: self._request(
+                    image, url, object_type, params, metrics, prepare
+                ),
+            )
+        finally:
+            self._emit(metrics)
+
+    def detect(self, image: bytes, stream: Hashable = None, roi=None) -> Dict:
+        """
+        Run detection on an image (bytes).
+
+        Pass a region of interest, or a list of them, as `roi` to upload only
+        those crops of the image (see `simplehound.preprocess.Region`).
+        """
+        return self._gated_call(
+            image, self._url_detections, "", DETECTIONS_PARAMS, stream, roi=roi
+        )
 
-    def detect(self, image: bytes) -> Dict:
-        """Run detection on an image (bytes)."""
-        return run_detection(encode_image(image), self._api_key, self._url_detections)
+    def recognize(
+        self, image: bytes, object_type: str, stream: Hashable = None, roi=None
+    ) -> Dict:
+        """Run recognition on an image (bytes), optionally cropped to `roi`."""
+        if not object_type in ALLOWED_RECOGNITION_OPTIONS:
+            raise SimplehoundException(f"object_type {object_type} is not valid")
+        return self._gated_call(
+            image, self._url_recognitions, object_type, (), stream, roi=roi
+        )
+
+    def detect_file(self, path: str, stream: Hashable = None) -> Dict:
+        """
+        Run detection on an image file, streaming it from an mmap.
+
+        The request body is base64 encoded block by block as it is sent, so
+        memory use does not grow with the size of the image.
+        """
+        with map_file(path) as image:
+            return self._gated_call(
+                image,
+                self._url_detections,
+                "",
+                DETECTIONS_PARAMS,
+                stream,
+                self._prepare_stream,
+            )
+
+    def recognize_file(
+        self, path: str, object_type: str, stream: Hashable = None
+    ) -> Dict:
+        """Run recognition on an image file, streaming it like `detect_file`."""
+        if not object_type in ALLOWED_RECOGNITION_OPTIONS:
+            raise SimplehoundException(f"object_type {object_type} is not valid")
+        with map_file(path) as image:
+            return self._gated_call(
+                image,
+                self._url_recognitions,
+                object_type,
+                (),
+                stream,
+                self._prepare_stream,
+            )
 
-    def recognize(self, image: bytes, object_type: str) -> Dict:
-        """Run recognition on an image (bytes)."""
+    def analyze(
+        self,
+        image: bytes,
+        detect: bool = True,
+        recognize: str = "vehicle,licenseplate",
+    ) -> Dict:
+        """
+        Run detection and recognition on an image (bytes) in a single call.
+
+        The image is encoded once and both endpoints are called concurrently, so
+        latency is that of the slower call rather than the sum of both. Pass
+        `detect=False` or `recognize=None` to skip either endpoint. Returns the
+        raw `detections` and `recognitions` alongside the parsed `faces`,
+        `people`, `vehicles`, `license_plates` and `metadata`.
+        """
+        if recognize and not recognize in ALLOWED_RECOGNITION_OPTIONS:
+            raise SimplehoundException(f"object_type {recognize} is not valid")
+
+        prepared = []
+        prepare_lock = threading.Lock()
+
+        def prepare(image: bytes, metrics: RequestMetrics = None) -> List:
+            with prepare_lock:
+                if not prepared:
+                    prepared.extend(self._prepare(image, metrics))
+            return prepared
+
+        def call(url: str, object_type: str, metrics: RequestMetrics, params=()):
+            return self._cached_call(
+                image,
+                url,
+                object_type,
+                lambda: self._request(
+                    image, url, object_type, params, metrics, prepare
+                ),
+            )
+
+        detection_metrics = self._new_metrics(self._url_detections)
+        recognition_metrics = self._new_metrics(self._url_recognitions, recognize)
+        result = {
+            "detections": None,
+            "recognitions": None,
+            "faces": [],
+            "people": [],
+            "vehicles": [],
+            "license_plates": [],
+            "metadata": None,
+        }
+        try:
+            future = None
+            if detect and recognize:
+                future = self._get_executor().submit(
+                    call, self._url_recognitions, recognize, recognition_metrics
+                )
+            if detect:
+                result["detections"] = call(
+                    self._url_detections, "", detection_metrics, DETECTIONS_PARAMS
+                )
+            if future is not None:
+                result["recognitions"] = future.result()
+            elif recognize:
+                result["recognitions"] = call(
+                    self._url_recognitions, recognize, recognition_metrics
+                )
+
+            if result["recognitions"]:
+                start = time.perf_counter()
+                result.update(parse_recognitions(result["recognitions"]))
+                if recognition_metrics is not None:
+                    recognition_metrics.parse_time = time.perf_counter() - start
+            if result["detections"]:
+                start = time.perf_counter()
+                result.update(parse_detections(result["detections"]))
+                if detection_metrics is not None:
+                    detection_metrics.parse_time = time.perf_counter() - start
+        finally:
+            self._emit(detection_metrics)
+            self._emit(recognition_metrics)
+        return result
+
+    def detect_many(
+        self,
+        images: Iterable[bytes],
+        max_workers: int = DEFAULT_POOL_SIZE,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult]:
+        """
+        Run detection on many images concurrently, yielding a `BatchResult` per image.
+        """
+        return run_batch(self.detect, images, max_workers, ordered)
+
+    def recognize_many(
+        self,
+        images: Iterable[bytes],
+        object_type: str,
+        max_workers: int = DEFAULT_POOL_SIZE,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult]:
+        """
+        Run recognition on many images concurrently, yielding a `BatchResult` per image.
+        """
         if not object_type in ALLOWED_RECOGNITION_OPTIONS:
             raise SimplehoundException(f"object_type {object_type} is not valid")
-        return run_recognition(
-            encode_image(image), self._api_key, self._url_recognitions, object_type
+        return run_batch(
+            lambda image: self.recognize(image, object_type),
+            images,
+            max_workers,
+            ordered,
         )
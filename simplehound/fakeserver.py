@@ -0,0 +1,376 @@
+"""
+Local stand-in for the Sighthound cloud API.
+
+Serves `/v1/detections` and `/v1/recognition` with the same JSON as Sighthound,
+with configurable latency and injected 401/429/5xx errors, so clients can be
+load tested without spending quota. Point a client at it with `base_url`:
+
+    with FakeSighthound(latency=Latency.lognormal(0.05, 0.5)) as server:
+        api = cloud("key", base_url=server.url)
+
+Or run it standalone with `python -m simplehound.fakeserver --port 8080`.
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import math
+import random
+import threading
+import uuid
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+from simplehound.core import BAD_API_KEY, HTTP_OK
+
+DETECTIONS = {
+    "image": {"width": 960, "height": 480, "orientation": 1},
+    "objects": [
+        {
+            "type": "face",
+            "boundingBox": {"x": 305, "y": 151, "height": 28, "width": 30},
+            "attributes": {
+                "gender": "male",
+                "genderConfidence": 0.9733,
+                "age": 33,
+                "ageConfidence": 0.7801,
+                "frontal": True,
+            },
+        },
+        {
+            "type": "person",
+            "boundingBox": {"x": 227, "y": 133, "height": 245, "width": 125},
+        },
+    ],
+    "requestId": "467f195c4bbf46c69f964b59884dee04",
+}
+
+_PLATE_BOUNDING = {
+    "vertices": [
+        {"x": 755, "y": 377},
+        {"x": 914, "y": 377},
+        {"x": 914, "y": 419},
+        {"x": 755, "y": 419},
+    ]
+}
+
+_PLATE_ATTRIBUTES = {
+    "system": {
+        "string": {"name": "CV67CBU", "confidence": 0.4044},
+        "characters": [
+            {
+                "bounding": {
+                    "vertices": [
+                        {"y": 385, "x": 778},
+                        {"y": 385, "x": 794},
+                        {"y": 413, "x": 794},
+                        {"y": 413, "x": 778},
+                    ]
+                },
+                "index": 0,
+                "confidence": 0.9797,
+                "character": "C",
+            }
+        ],
+        "region": {"name": "UK", "confidence": 0.9972},
+    }
+}
+
+_VEHICLE = {
+    "objectId": "_vehicle_c3b12324-1f19-4606-90c6-39c25c8c39fb",
+    "vehicleAnnotation": {
+        "bounding": {
+            "vertices": [
+                {"x": 289, "y": 150},
+                {"x": 1036, "y": 150},
+                {"x": 1036, "y": 602},
+                {"x": 289, "y": 602},
+            ]
+        },
+        "recognitionConfidence": 0.8554,
+        "attributes": {
+            "system": {
+                "make": {"name": "Ford", "confidence": 0.8554},
+                "model": {"name": "Ranger", "confidence": 0.8554},
+                "color": {"name": "black", "confidence": 0.9988},
+                "vehicleType": "car",
+            }
+        },
+    },
+    "objectType": "vehicle",
+}
+
+_VEHICLE_WITH_PLATE = copy.deepcopy(_VEHICLE)
+_VEHICLE_WITH_PLATE["vehicleAnnotation"]["licenseplate"] = {
+    "bounding": _PLATE_BOUNDING,
+    "attributes": _PLATE_ATTRIBUTES,
+}
+
+_LICENSEPLATE = {
+    "objectType": "licenseplate",
+    "licenseplateAnnotation": {
+        "bounding": _PLATE_BOUNDING,
+        "attributes": _PLATE_ATTRIBUTES,
+    },
+}
+
+_RECOGNITIONS_IMAGE = {"width": 1080, "height": 675, "orientation": 1}
+
+RECOGNITIONS = {
+    object_type: {
+        "image": _RECOGNITIONS_IMAGE,
+        "requestId": "a14d1d7e426a429d960fa100d2351cdb",
+        "objects": objects,
+    }
+    for object_type, objects in [
+        ("licenseplate", [_LICENSEPLATE]),
+        ("vehicle", [_VEHICLE]),
+        ("vehicle,licenseplate", [_VEHICLE_WITH_PLATE]),
+    ]
+}
+
+
+class Latency:
+    """
+    A latency distribution for the fake server, in seconds.
+
+    With probability `spike_probability` a sample is increased by
+    `spike_seconds`, to reproduce latency spikes.
+    """
+
+    def __init__(
+        self,
+        sample=lambda rng: 0.0,
+        spike_probability: float = 0.0,
+        spike_seconds: float = 0.0,
+    ):
+        self._sample = sample
+        self.spike_probability = spike_probability
+        self.spike_seconds = spike_seconds
+
+    @classmethod
+    def fixed(cls, seconds: float, **spikes) -> "Latency":
+        return cls(lambda rng: seconds, **spikes)
+
+    @classmethod
+    def uniform(cls, low: float, high: float, **spikes) -> "Latency":
+        return cls(lambda rng: rng.uniform(low, high), **spikes)
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float, **spikes) -> "Latency":
+        return cls(lambda rng: rng.lognormvariate(math.log(median), sigma), **spikes)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """
+        Parse `fixed:S`, `uniform:LOW:HIGH` or `lognormal:MEDIAN:SIGMA`, each
+        optionally followed by `@PROBABILITY:SPIKE_SECONDS`.
+        """
+        spec, _, spike = spec.partition("@")
+        kind, *args = spec.split(":")
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution {kind}")
+        spikes = {}
+        if spike:
+            probability, seconds = spike.split(":")
+            spikes = dict(
+                spike_probability=float(probability), spike_seconds=float(seconds)
+            )
+        return getattr(cls, kind)(*map(float, args), **spikes)
+
+    def sample(self, rng: random.Random) -> float:
+        seconds = self._sample(rng)
+        if self.spike_probability and rng.random() < self.spike_probability:
+            seconds += self.spike_seconds
+        return max(0.0, seconds)
+
+
+_REASONS = {200: "OK", 401: "Unauthorized", 404: "Not Found", 429: "Too Many Requests"}
+
+
+class FakeSighthound:
+    """
+    A fake Sighthound server running an asyncio event loop on a background thread.
+
+    `error_rates` maps HTTP status codes (e.g. 401, 429, 500) to the probability
+    of answering a request with them. If `api_key` is set, requests with any
+    other `X-Access-Token` get a 401. `port=0` picks a free port. Latency is
+    simulated without blocking, so thousands of requests can be in flight.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Latency = None,
+        error_rates: Dict[int, float] = None,
+        api_key: str = None,
+        retry_after: float = 1,
+        seed: int = None,
+    ):
+        self.latency = latency or Latency()
+        self.error_rates = error_rates or {}
+        self.api_key = api_key
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.status_counts = {}
+        self._host = host
+        self._port = port
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._connections = set()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _bind(self):
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(self._start_server())
+
+    async def _start_server(self):
+        return await asyncio.start_server(
+            self._handle_connection, self._host, self._port
+        )
+
+    def start(self):
+        """Start serving on a background thread."""
+        self._bind()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def wait(self):
+        """Block until the server is stopped."""
+        self._thread.join()
+
+    def stop(self):
+        if self._loop is None or self._loop.is_closed():
+            return
+        if self._thread is not None and self._thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        else:
+            self._loop.run_until_complete(self._shutdown())
+        self._loop.close()
+
+    async def _shutdown(self):
+        self._server.close()
+        # Idle keep-alive connections are parked in readuntil(). Closing them
+        # ends the read, so their handlers return normally.
+        handlers = list(self._connections)
+        for _, writer in handlers:
+            writer.close()
+        await asyncio.gather(*(task for task, _ in handlers), return_exceptions=True)
+        await self._server.wait_closed()
+
+    def pick_status(self, api_key: str) -> int:
+        if self.api_key is not None and api_key != self.api_key:
+            return BAD_API_KEY
+        roll = self.rng.random()
+        for status, rate in self.error_rates.items():
+            if roll < rate:
+                return status
+            roll -= rate
+        return HTTP_OK
+
+    def _route(self, target: str, headers: Dict) -> tuple:
+        url = urlparse(target)
+        if url.path == "/v1/detections":
+            payload = DETECTIONS
+        elif url.path == "/v1/recognition":
+            object_type = parse_qs(url.query).get("objectType", [""])[0]
+            payload = RECOGNITIONS.get(object_type)
+        else:
+            payload = None
+        if payload is None:
+            return 404, {"error": "Not found"}, {}
+        status = self.pick_status(headers.get("x-access-token"))
+        if status != HTTP_OK:
+            extra = {"Retry-After": str(self.retry_after)} if status == 429 else {}
+            return status, {"error": "Injected error"}, extra
+        return HTTP_OK, dict(payload, requestId=uuid.uuid4().hex), {}
+
+    async def _handle_connection(self, reader, writer):
+        connection = (asyncio.current_task(), writer)
+        self._connections.add(connection)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                _, target, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in filter(None, header_lines):
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload, extra_headers = self._route(target, headers)
+                await asyncio.sleep(self.latency.sample(self.rng))
+                self.status_counts[status] = self.status_counts.get(status, 0) + 1
+                body = json.dumps(payload).encode("utf-8")
+                lines = [
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(body)}",
+                ]
+                lines += [f"{name}: {value}" for name, value in extra_headers.items()]
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+                writer.write(body)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+
+
+def parse_error_rates(spec: str) -> Dict[int, float]:
+    """Parse `STATUS=RATE,...`, e.g. `429=0.05,500=0.01`."""
+    rates = {}
+    for item in filter(None, spec.split(",")):
+        status, rate = item.split("=")
+        rates[int(status)] = float(rate)
+    return rates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a fake Sighthound server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", default="fixed:0", help="e.g. lognormal:0.05:0.5")
+    parser.add_argument("--errors", default="", help="e.g. 429=0.05,500=0.01")
+    parser.add_argument("--api-key", default=None)
+    args = parser.parse_args(argv)
+
+    server = FakeSighthound(
+        args.host,
+        args.port,
+        Latency.parse(args.latency),
+        parse_error_rates(args.errors),
+        args.api_key,
+    )
+    server.start()
+    print(f"Fake Sighthound listening on {server.url}", flush=True)
+    try:
+        server.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
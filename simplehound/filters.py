@@ -0,0 +1,202 @@
+"""
+Simplehound result filtering.
+
+An `ObjectFilter` declares which objects to keep, by object type, confidence,
+box area and polygonal zones, and evaluates the box tests as NumPy masks over
+the objects of a payload or a whole batch of payloads at once. Filtered payloads
+reuse the original object dicts, so nothing is built for rejected objects.
+
+Requires NumPy, install with `pip install simplehound[numpy]`.
+"""
+
+from typing import Collection, Dict, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from simplehound.vectorized import _object_bounds
+
+
+class Zone(NamedTuple):
+    """
+    A polygonal zone of a frame, as a sequence of `(x, y)` vertices.
+
+    Given in pixels, or as fractions of the frame width and height if
+    `normalized`.
+    """
+
+    points: Sequence[Tuple[float, float]]
+    normalized: bool = False
+
+
+def points_in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """
+    Whether each `(x, y)` row of `points` lies inside `polygon`, an `(K, 2)`
+    array of vertices, by the even-odd rule.
+    """
+    x, y = points[:, 0], points[:, 1]
+    inside = np.zeros(len(points), dtype=bool)
+    for (x1, y1), (x2, y2) in zip(polygon, np.roll(polygon, -1, axis=0)):
+        if y1 == y2:
+            continue  # a horizontal edge is never crossed by a horizontal ray
+        crosses = (y1 > y) != (y2 > y)
+        x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= crosses & (x < x_cross)
+    return inside
+
+
+def _confidence(obj: Dict) -> float:
+    annotation = obj.get("vehicleAnnotation")
+    if annotation is not None:
+        return annotation.get("recognitionConfidence", np.nan)
+    annotation = obj.get("licenseplateAnnotation")
+    if annotation is not None:
+        return annotation["attributes"]["system"]["string"]["confidence"]
+    return np.nan
+
+
+class ObjectFilter:
+    """
+    Keep the objects that pass every given test:
+
+    - `object_types`: the object's `type` or `objectType` is one of these.
+    - `min_confidence`: the `recognitionConfidence` of a vehicle, or the string
+      confidence of a license plate, is at least this. Faces and people have
+      no overall confidence and pass.
+    - `min_area`, `max_area`: the box covers at least / at most this fraction
+      of the frame.
+    - `zones`: the box center lies in at least one of these `Zone`s.
+    - `exclude_zones`: the box center lies in none of these `Zone`s.
+
+    Objects without a bounding box are dropped.
+    """
+
+    def __init__(
+        self,
+        object_types: Collection[str] = None,
+        min_confidence: float = None,
+        min_area: float = None,
+        max_area: float = None,
+        zones: Sequence[Zone] = None,
+        exclude_zones: Sequence[Zone] = None,
+    ):
+        self.object_types = None if object_types is None else frozenset(object_types)
+        self.min_confidence = min_confidence
+        self.min_area = min_area
+        self.max_area = max_area
+        self.zones = list(zones or [])
+        self.exclude_zones = list(exclude_zones or [])
+        self._zones = self._polygons(self.zones)
+        self._exclude_zones = self._polygons(self.exclude_zones)
+
+    @classmethod
+    def from_dict(cls, spec: Dict) -> "ObjectFilter":
+        """
+        Build a filter from a dict of the constructor arguments, e.g. loaded
+        from JSON, with zones as `{"points": [[x, y], ...], "normalized": true}`.
+        """
+        spec = dict(spec)
+        for key in ("zones", "exclude_zones"):
+            if key in spec:
+                spec[key] = [Zone(**zone) for zone in spec[key]]
+        return cls(**spec)
+
+    @staticmethod
+    def _polygons(zones: List[Zone]) -> List[Tuple[bool, np.ndarray]]:
+        return [
+            (zone.normalized, np.asarray(zone.points, dtype=np.float64))
+            for zone in zones
+        ]
+
+    @staticmethod
+    def _in_zones(
+        zones: List[Tuple[bool, np.ndarray]],
+        centers: np.ndarray,
+        pixel_centers: np.ndarray,
+    ) -> np.ndarray:
+        inside = np.zeros(len(centers), dtype=bool)
+        for normalized, polygon in zones:
+            inside |= points_in_polygon(
+                centers if normalized else pixel_centers, polygon
+            )
+        return inside
+
+    def _mask(self, bounds: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        """The area and zone tests of pixel `bounds` rows in frames of `sizes`."""
+        keep = np.ones(len(bounds), dtype=bool)
+        if self.min_area is not None or self.max_area is not None:
+            area = (bounds[:, 2] - bounds[:, 0]) * (bounds[:, 3] - bounds[:, 1])
+            area /= sizes[:, 0] * sizes[:, 1]
+            if self.min_area is not None:
+                keep &= area >= self.min_area
+            if self.max_area is not None:
+                keep &= area <= self.max_area
+        if self._zones or self._exclude_zones:
+            pixel_centers = (bounds[:, :2] + bounds[:, 2:]) / 2
+            centers = pixel_centers / sizes
+            if self._zones:
+                keep &= self._in_zones(self._zones, centers, pixel_centers)
+            if self._exclude_zones:
+                keep &= ~self._in_zones(self._exclude_zones, centers, pixel_centers)
+        return keep
+
+    def select(self, payloads: Union[Dict, List[Dict]]) -> np.ndarray:
+        """
+        The `(payload index, object index)` rows of the objects kept from one
+        or more payloads, in order.
+
+        Type and confidence are checked while walking the objects, so boxes
+        are only read for objects that pass. The area and zone tests then run
+        as masks over all of those boxes at once.
+        """
+        if isinstance(payloads, dict):
+            payloads = [payloads]
+        object_types, min_confidence = self.object_types, self.min_confidence
+        rows = []
+        bounds = []
+        for i, payload in enumerate(payloads):
+            for j, obj in enumerate(payload["objects"]):
+                if (
+                    object_types is not None
+                    and (obj.get("type") or obj.get("objectType")) not in object_types
+                ):
+                    continue
+                # No confidence is NaN, which is never below the minimum.
+                if min_confidence is not None and _confidence(obj) < min_confidence:
+                    continue
+                obj_bounds = _object_bounds(obj)
+                if obj_bounds is not None:
+                    rows.append((i, j))
+                    bounds.append(obj_bounds)
+        if not rows:
+            return np.zeros((0, 2), dtype=np.intp)
+        index = np.array(rows, dtype=np.intp)
+        sizes = np.array(
+            [(p["image"]["width"], p["image"]["height"]) for p in payloads],
+            dtype=np.float64,
+        )
+        keep = self._mask(np.array(bounds, dtype=np.float64), sizes[index[:, 0]])
+        return index[keep]
+
+    def apply(self, payloads: Union[Dict, List[Dict]]) -> Union[Dict, List[Dict]]:
+        """
+        Filter one payload, or a list of payloads.
+
+        Returns shallow copies of the payloads whose `objects` list holds only
+        the kept objects (the original dicts, not copies), so the `get_*`
+        helpers can be used on the result.
+        """
+        single = isinstance(payloads, dict)
+        if single:
+            payloads = [payloads]
+        kept = self.select(payloads)
+        # Rows are grouped by payload, in order, so split at payload boundaries.
+        bounds = np.searchsorted(kept[:, 0], np.arange(len(payloads) + 1))
+        filtered = []
+        for i, payload in enumerate(payloads):
+            objects = payload["objects"]
+            payload = dict(payload)
+            payload["objects"] = [
+                objects[j] for j in kept[bounds[i] : bounds[i + 1], 1].tolist()
+            ]
+            filtered.append(payload)
+        return filtered[0] if single else filtered
@@ -0,0 +1,132 @@
+"""
+Simplehound near-duplicate frame gate.
+
+Frames from fixed cameras are mostly near-identical to the previous one, but
+sensor noise defeats the exact-hash result cache. The gate compares a
+difference hash (dHash) of each frame with that of the last frame submitted
+for the same stream, and skips the API call when they differ in fewer than
+`threshold` bits.
+
+Requires Pillow, install with `pip install simplehound[preprocess]`.
+"""
+
+import copy
+import io
+import mmap
+import threading
+from typing import Dict, Hashable, Optional, Tuple
+
+from PIL import Image
+
+DEFAULT_HASH_SIZE = 8
+DEFAULT_THRESHOLD = 5
+
+
+class _Skipped:
+    def __repr__(self):
+        return "SKIPPED"
+
+
+SKIPPED = _Skipped()
+"""Returned in place of a result for a skipped frame when `return_previous` is off."""
+
+
+def difference_hash(image: bytes, hash_size: int = DEFAULT_HASH_SIZE) -> int:
+    """
+    Compute the `hash_size` x `hash_size` bit difference hash of an image (bytes
+    or an mmap of an image file).
+
+    Each bit records whether a pixel of the downsampled greyscale image is
+    brighter than its right-hand neighbour.
+    """
+    # An mmap (see `detect_file`) is read in place; wrapping it in a BytesIO
+    # would copy the whole file into memory.
+    if isinstance(image, mmap.mmap):
+        image.seek(0)
+        img = Image.open(image)
+    else:
+        img = Image.open(io.BytesIO(image))
+    # Let the JPEG decoder downscale by up to 8x while decoding, which is
+    # much cheaper than decoding at full size and resizing.
+    img.draft("L", (hash_size * 8, hash_size * 8))
+    pixels = (
+        img.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR).tobytes()
+    )
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class GateStats:
+    """Counters of frames submitted to and skipped by a gate."""
+
+    __slots__ = ("submitted", "skipped")
+
+    def __init__(self):
+        self.submitted = 0
+        self.skipped = 0
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class FrameGate:
+    """
+    Skip frames nearly identical to the last one submitted for their stream.
+
+    A frame is skipped when its hash is fewer than `threshold` bits away from
+    the hash of the last submitted frame of the same stream, so a slow drift
+    is still submitted once it accumulates. Skipped frames get a copy of the
+    last result for the stream, or `SKIPPED` if `return_previous` is False.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_THRESHOLD,
+        hash_size: int = DEFAULT_HASH_SIZE,
+        return_previous: bool = True,
+    ):
+        self._threshold = threshold
+        self._hash_size = hash_size
+        self._return_previous = return_previous
+        self._last = {}
+        self._lock = threading.Lock()
+        self.stats = GateStats()
+
+    def check(self, stream: Hashable, image: bytes) -> Tuple[bool, int, Optional[Dict]]:
+        """
+        Hash a frame of `stream`, returning `(skip, frame_hash, result)`.
+
+        `result` is what to return for a skipped frame.
+        """
+        frame_hash = difference_hash(image, self._hash_size)
+        with self._lock:
+            last = self._last.get(stream)
+            if last is None or hamming_distance(last[0], frame_hash) >= self._threshold:
+                self.stats.submitted += 1
+                return False, frame_hash, None
+            self.stats.skipped += 1
+            result = last[1]
+        if self._return_previous:
+            return True, frame_hash, copy.deepcopy(result)
+        return True, frame_hash, SKIPPED
+
+    def update(self, stream: Hashable, frame_hash: int, result: Dict):
+        """Record `result` as the last submitted frame of `stream`."""
+        with self._lock:
+            self._last[stream] = (frame_hash, copy.deepcopy(result))
+
+    def reset(self, stream: Hashable = None):
+        """Forget the last frame of `stream`, or of every stream if None."""
+        with self._lock:
+            if stream is None:
+                self._last.clear()
+            else:
+                self._last.pop(stream, None)
@@ -0,0 +1,196 @@
+"""
+Load generator for the Simplehound clients.
+
+Drives `cloud.detect` (sync), `cloud.detect` on `run_batch` (batch) or
+`AsyncCloud.detect` (async) against a Sighthound-compatible server and reports
+the achieved requests per second, latency percentiles and error counts. By default an
+in-process `simplehound.fakeserver` is started; pass `--url` to target a server
+started separately with `python -m simplehound.fakeserver`, which avoids the
+client and server competing for the same interpreter.
+
+    python -m simplehound.loadgen --client async --requests 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import contextvars
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from simplehound.core import SimplehoundException, cloud, run_batch
+from simplehound.fakeserver import FakeSighthound, Latency, parse_error_rates
+from simplehound.metrics import QUANTILES, Histogram, RequestMetrics
+from simplehound.ratelimit import RetryPolicy
+
+CLIENTS = ["sync", "batch", "async"]
+API_KEY = "loadgen"
+# Status of the last response in the current thread or task, set by a metrics
+# hook, as the clients return None rather than raise for most error statuses.
+_status_code = contextvars.ContextVar("status_code", default=None)
+
+
+def _record_status(metrics: RequestMetrics):
+    _status_code.set(metrics.status_code)
+
+
+def _checked(result):
+    """Raise for a missing result, with the status of the response."""
+    if result is None:
+        status_code = _status_code.get()
+        raise SimplehoundException(f"HTTP status {status_code}", status_code)
+    return result
+
+
+def _outcome(result=None, error: Exception = None) -> str:
+    if error is None:
+        return "ok"
+    if isinstance(error, SimplehoundException) and error.status_code is not None:
+        return str(error.status_code)
+    return type(error).__name__
+
+
+def _timed_detect(api: cloud, image: bytes) -> Tuple[float, str]:
+    """The latency and outcome of one `api.detect` call."""
+    start = time.perf_counter()
+    _status_code.set(None)
+    try:
+        outcome = _outcome(_checked(api.detect(image)))
+    except Exception as exc:
+        outcome = _outcome(error=exc)
+    return time.perf_counter() - start, outcome
+
+
+def _run_sync(api: cloud, image: bytes, num_requests: int, concurrency: int) -> List:
+    samples = []
+    remaining = iter(range(num_requests))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            samples.append(_timed_detect(api, image))
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def _run_batch(api: cloud, image: bytes, num_requests: int, concurrency: int) -> List:
+    images = [image] * num_requests
+    return [
+        item.result
+        for item in run_batch(
+            lambda image: _timed_detect(api, image), images, concurrency, ordered=False
+        )
+    ]
+
+
+def _run_async(api_kwargs: Dict, image: bytes, num_requests: int, concurrency: int):
+    from simplehound.aio import AsyncCloud
+
+    async def worker(api, remaining, samples):
+        for _ in remaining:
+            start = time.perf_counter()
+            _status_code.set(None)
+            try:
+                outcome = _outcome(_checked(await api.detect(image)))
+            except Exception as exc:
+                outcome = _outcome(error=exc)
+            samples.append((time.perf_counter() - start, outcome))
+
+    async def run() -> List:
+        samples = []
+        remaining = iter(range(num_requests))
+        async with AsyncCloud(max_concurrency=concurrency, **api_kwargs) as api:
+            api.add_hook(_record_status)
+            await asyncio.gather(
+                *[worker(api, remaining, samples) for _ in range(concurrency)]
+            )
+        return samples
+
+    return asyncio.run(run())
+
+
+def run_load(args, url: str) -> Dict:
+    """Run one load test against `url`, returning a report dict."""
+    image = bytes(args.image_size)
+    api_kwargs = dict(api_key=API_KEY, base_url=url)
+    start = time.perf_counter()
+    if args.client == "async":
+        samples = _run_async(api_kwargs, image, args.requests, args.concurrency)
+    else:
+        retry = RetryPolicy(max_retries=args.retries) if args.retries else None
+        with cloud(pool_size=args.concurrency, retry=retry, **api_kwargs) as api:
+            run = _run_sync if args.client == "sync" else _run_batch
+            api.add_hook(_record_status)
+            samples = run(api, image, args.requests, args.concurrency)
+    elapsed = time.perf_counter() - start
+
+    latencies = Histogram(window=len(samples))
+    for latency, _ in samples:
+        latencies.observe(latency)
+    return {
+        "client": args.client,
+        "requests": len(samples),
+        "seconds": elapsed,
+        "rps": len(samples) / elapsed,
+        "latency": {f"p{int(q * 100)}": latencies.quantile(q) for q in QUANTILES},
+        "outcomes": dict(Counter(outcome for _, outcome in samples)),
+    }
+
+
+def print_report(report: Dict):
+    latency = ", ".join(
+        f"{name} {seconds * 1000:.1f} ms" for name, seconds in report["latency"].items()
+    )
+    outcomes = ", ".join(f"{k}: {v}" for k, v in sorted(report["outcomes"].items()))
+    print(
+        f"{report['client']:>5}: {report['requests']} requests in "
+        f"{report['seconds']:.2f} s = {report['rps']:.0f} req/s | {latency} | {outcomes}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Simplehound clients.")
+    parser.add_argument("--client", choices=CLIENTS + ["all"], default="all")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--retries", type=int, default=0, help="sync/batch only")
+    parser.add_argument("--image-size", type=int, default=16 * 1024)
+    parser.add_argument(
+        "--url", default=None, help="target server, default: in-process fake"
+    )
+    parser.add_argument("--latency", default="fixed:0.01", help="fake server latency")
+    parser.add_argument(
+        "--errors", default="", help="fake server errors, e.g. 429=0.05"
+    )
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if url is None:
+        server = FakeSighthound(
+            latency=Latency.parse(args.latency),
+            error_rates=parse_error_rates(args.errors),
+            retry_after=0,
+        )
+        server.start()
+        url = server.url
+    try:
+        for client in CLIENTS if args.client == "all" else [args.client]:
+            args.client = client
+            print_report(run_load(args, url))
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Simplehound request instrumentation.
+
+`cloud` reports a `RequestMetrics` record for every request it makes to each
+hook registered with `cloud.add_hook`. `MetricsRegistry` is such a hook, keeping
+rolling latency and size histograms per endpoint with p50/p95/p99 summaries and
+a Prometheus text-format exporter.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Dict, List
+
+QUANTILES = (0.5, 0.95, 0.99)
+DEFAULT_WINDOW = 1000
+
+
+class RequestMetrics:
+    """
+    Timings (seconds) and sizes (bytes) of one request to Sighthound.
+
+    `encode_time` covers preprocessing and body encoding, `time_to_first_byte`
+    runs until the response headers arrived, `round_trip_time` until the body
+    was read, `decode_time` covers JSON decoding and `parse_time` the `get_*`
+    helpers (set by `cloud.analyze` only). Timings of stages that did not run
+    are None.
+    """
+
+    __slots__ = (
+        "endpoint",
+        "object_type",
+        "status_code",
+        "request_id",
+        "attempts",
+        "encode_time",
+        "bytes_sent",
+        "time_to_first_byte",
+        "round_trip_time",
+        "response_bytes",
+        "decode_time",
+        "parse_time",
+    )
+
+    def __init__(self, endpoint: str, object_type: str = None):
+        self.endpoint = endpoint
+        self.object_type = object_type
+        for name in self.__slots__[2:]:
+            setattr(self, name, None)
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"RequestMetrics({self.as_dict()})"
+
+
+class Histogram:
+    """Rolling window of the last `window` observations, plus running totals."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self._values = deque(maxlen=window)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self._values.append(value)
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Nearest-rank quantile of the window, NaN if it is empty."""
+        if not self._values:
+            return math.nan
+        values = sorted(self._values)
+        return values[max(0, math.ceil(q * len(values)) - 1)]
+
+    def summary(self) -> Dict:
+        summary = {f"p{int(q * 100)}": self.quantile(q) for q in QUANTILES}
+        summary.update(count=self.count, sum=self.sum)
+        return summary
+
+
+# RequestMetrics field -> (Prometheus metric name, help text)
+HISTOGRAM_FIELDS = {
+    "encode_time": ("simplehound_encode_seconds", "Image encoding time."),
+    "time_to_first_byte": (
+        "simplehound_time_to_first_byte_seconds",
+        "Time until response headers arrived.",
+    ),
+    "round_trip_time": (
+        "simplehound_round_trip_seconds",
+        "Time until the response body was read.",
+    ),
+    "decode_time": ("simplehound_decode_seconds", "Response JSON decoding time."),
+    "parse_time": ("simplehound_parse_seconds", "Response parsing time."),
+    "bytes_sent": ("simplehound_request_bytes", "Request body size."),
+    "response_bytes": ("simplehound_response_bytes", "Response body size."),
+}
+
+
+class MetricsRegistry:
+    """
+    Hook aggregating `RequestMetrics` into rolling histograms per endpoint.
+
+    Register with `cloud.add_hook(registry)`.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self._window = window
+        self._histograms = {}
+        self._status_counts = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, metrics: RequestMetrics):
+        with self._lock:
+            key = (metrics.endpoint, metrics.status_code)
+            self._status_counts[key] = self._status_counts.get(key, 0) + 1
+            for field in HISTOGRAM_FIELDS:
+                value = getattr(metrics, field)
+                if value is None:
+                    continue
+                hist_key = (metrics.endpoint, field)
+                if hist_key not in self._histograms:
+                    self._histograms[hist_key] = Histogram(self._window)
+                self._histograms[hist_key].observe(value)
+
+    def endpoints(self) -> List[str]:
+        with self._lock:
+            return sorted({endpoint for endpoint, _ in self._status_counts})
+
+    def summary(self, endpoint: str) -> Dict:
+        """
+        Summaries (p50/p95/p99, count, sum) of each recorded field of `endpoint`,
+        and its request counts by status code.
+        """
+        with self._lock:
+            summary = {
+                field: hist.summary()
+                for (hist_endpoint, field), hist in self._histograms.items()
+                if hist_endpoint == endpoint
+            }
+            summary["status_codes"] = {
+                status: count
+                for (count_endpoint, status), count in self._status_counts.items()
+                if count_endpoint == endpoint
+            }
+        return summary
+
+    def to_prometheus(self) -> str:
+        """Export the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP simplehound_requests_total Requests made to Sighthound.",
+            "# TYPE simplehound_requests_total counter",
+        ]
+        with self._lock:
+            for (endpoint, status), count in sorted(
+                self._status_counts.items(), key=lambda item: str(item[0])
+            ):
+                lines.append(
+                    f'simplehound_requests_total{{endpoint="{endpoint}",'
+                    f'status="{status}"}} {count}'
+                )
+            for field, (name, help_text) in HISTOGRAM_FIELDS.items():
+                histograms = sorted(
+                    [
+                        (endpoint, hist)
+                        for (endpoint, hist_field), hist in self._histograms.items()
+                        if hist_field == field
+                    ],
+                    key=lambda item: item[0],
+                )
+                if not histograms:
+                    continue
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} summary")
+                for endpoint, hist in histograms:
+                    labels = f'endpoint="{endpoint}"'
+                    for q in QUANTILES:
+                        lines.append(
+                            f'{name}{{{labels},quantile="{q}"}} {hist.quantile(q)}'
+                        )
+                    lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {hist.count}")
+        return "\n".join(lines) + "\n"
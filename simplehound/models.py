@@ -0,0 +1,260 @@
+"""
+Simplehound result models.
+
+Compact, `__slots__` based alternatives to the dicts returned by the `get_*`
+helpers, produced when they are called with `as_objects=True`. Each model copies
+the fields it exposes into slots when it is created and keeps no reference to the
+rest of the raw Sighthound object, so the payload can be freed after parsing.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Tuple
+
+
+class BoundingBox:
+    """An axis-aligned bounding box in pixels."""
+
+    __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x: int, y: int, width: int, height: int):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def from_raw(cls, bbox: Dict) -> "BoundingBox":
+        """
+        Create from a Sighthound `boundingBox` or `bounding` (with `vertices`) dict.
+        """
+        if "vertices" not in bbox:
+            return cls(bbox["x"], bbox["y"], bbox["width"], bbox["height"])
+        xs = [vertex["x"] for vertex in bbox["vertices"]]
+        ys = [vertex["y"] for vertex in bbox["vertices"]]
+        return cls(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BoundingBox):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return (
+            f"BoundingBox(x={self.x}, y={self.y}, "
+            f"width={self.width}, height={self.height})"
+        )
+
+    def to_dict(self) -> Dict:
+        return {"x": self.x, "y": self.y, "width": self.width, "height": self.height}
+
+
+class _Model(ABC):
+    __slots__ = ()
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()})"
+
+    @classmethod
+    @abstractmethod
+    def from_raw(cls, raw: Dict) -> "_Model":
+        """Create from a raw Sighthound object or payload."""
+
+    @abstractmethod
+    def to_dict(self) -> Dict:
+        """The dict returned by the matching `get_*` helper."""
+
+
+def _vertices(bounding: Dict) -> Tuple[Tuple[int, int], ...]:
+    return tuple((vertex["x"], vertex["y"]) for vertex in bounding["vertices"])
+
+
+def _bounding(vertices: Tuple[Tuple[int, int], ...]) -> Dict:
+    return {"vertices": [{"x": x, "y": y} for x, y in vertices]}
+
+
+class Face(_Model):
+    """A detected face."""
+
+    __slots__ = ("gender", "age", "bounding_box")
+
+    def __init__(self, gender: str, age: int, bounding_box: BoundingBox):
+        self.gender = gender
+        self.age = age
+        self.bounding_box = bounding_box
+
+    @classmethod
+    def from_raw(cls, raw: Dict) -> "Face":
+        attributes = raw["attributes"]
+        return cls(
+            attributes["gender"],
+            attributes["age"],
+            BoundingBox.from_raw(raw["boundingBox"]),
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "gender": self.gender,
+            "age": self.age,
+            "boundingBox": self.bounding_box.to_dict(),
+        }
+
+
+class Person(_Model):
+    """A detected person."""
+
+    __slots__ = ("bounding_box",)
+
+    def __init__(self, bounding_box: BoundingBox):
+        self.bounding_box = bounding_box
+
+    @classmethod
+    def from_raw(cls, raw: Dict) -> "Person":
+        return cls(BoundingBox.from_raw(raw["boundingBox"]))
+
+    def to_dict(self) -> Dict:
+        return {"boundingBox": self.bounding_box.to_dict()}
+
+
+class LicensePlate(_Model):
+    """A recognized license plate."""
+
+    __slots__ = (
+        "_vertices",
+        "string",
+        "string_confidence",
+        "region",
+        "region_confidence",
+    )
+
+    def __init__(
+        self,
+        vertices: Tuple[Tuple[int, int], ...],
+        string: str,
+        string_confidence: float,
+        region: str,
+        region_confidence: float,
+    ):
+        self._vertices = vertices
+        self.string = string
+        self.string_confidence = string_confidence
+        self.region = region
+        self.region_confidence = region_confidence
+
+    @classmethod
+    def from_raw(cls, raw: Dict) -> "LicensePlate":
+        annotation = raw["licenseplateAnnotation"]
+        attributes = annotation["attributes"]["system"]
+        return cls(
+            _vertices(annotation["bounding"]),
+            attributes["string"]["name"],
+            attributes["string"]["confidence"],
+            attributes["region"]["name"],
+            attributes["region"]["confidence"],
+        )
+
+    @property
+    def bounding_box(self) -> BoundingBox:
+        return BoundingBox.from_raw(_bounding(self._vertices))
+
+    def to_dict(self) -> Dict:
+        return {
+            "boundingBox": _bounding(self._vertices),
+            "string": {"name": self.string, "confidence": self.string_confidence},
+            "region": {"name": self.region, "confidence": self.region_confidence},
+        }
+
+
+class Vehicle(_Model):
+    """A recognized vehicle."""
+
+    __slots__ = (
+        "_vertices",
+        "recognition_confidence",
+        "vehicle_type",
+        "make",
+        "model",
+        "color",
+        "licenseplate",
+        "region",
+    )
+
+    def __init__(
+        self,
+        vertices: Tuple[Tuple[int, int], ...],
+        recognition_confidence: float,
+        vehicle_type: str,
+        make: str,
+        model: str,
+        color: str,
+        licenseplate: str = "unknown",
+        region: str = "unknown",
+    ):
+        self._vertices = vertices
+        self.recognition_confidence = recognition_confidence
+        self.vehicle_type = vehicle_type
+        self.make = make
+        self.model = model
+        self.color = color
+        self.licenseplate = licenseplate
+        self.region = region
+
+    @classmethod
+    def from_raw(cls, raw: Dict) -> "Vehicle":
+        annotation = raw["vehicleAnnotation"]
+        attributes = annotation["attributes"]["system"]
+        vehicle = cls(
+            _vertices(annotation["bounding"]),
+            annotation["recognitionConfidence"],
+            attributes["vehicleType"],
+            attributes["make"]["name"],
+            attributes["model"]["name"],
+            attributes["color"]["name"],
+        )
+        if "licenseplate" in annotation:
+            plate = annotation["licenseplate"]["attributes"]["system"]
+            vehicle.licenseplate = plate["string"]["name"]
+            vehicle.region = plate["region"]["name"]
+        return vehicle
+
+    @property
+    def bounding_box(self) -> BoundingBox:
+        return BoundingBox.from_raw(_bounding(self._vertices))
+
+    def to_dict(self) -> Dict:
+        return {
+            "boundingBox": _bounding(self._vertices),
+            "recognitionConfidence": self.recognition_confidence,
+            "vehicleType": self.vehicle_type,
+            "make": self.make,
+            "model": self.model,
+            "color": self.color,
+            "licenseplate": self.licenseplate,
+            "region": self.region,
+        }
+
+
+class Metadata(_Model):
+    """Metadata of a detections or recognitions payload."""
+
+    __slots__ = ("image_width", "image_height", "request_id")
+
+    def __init__(self, image_width: int, image_height: int, request_id: str):
+        self.image_width = image_width
+        self.image_height = image_height
+        self.request_id = request_id
+
+    @classmethod
+    def from_raw(cls, raw: Dict) -> "Metadata":
+        return cls(raw["image"]["width"], raw["image"]["height"], raw["requestId"])
+
+    def to_dict(self) -> Dict:
+        return {
+            "image_width": self.image_width,
+            "image_height": self.image_height,
+            "requestId": self.request_id,
+        }
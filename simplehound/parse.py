@@ -0,0 +1,301 @@
+"""
+Simplehound payload parsing and geometry.
+
+Pure functions over Sighthound JSON payloads with no network dependencies, so
+they can be imported without loading `requests` (e.g. by workers that only
+parse stored results). They are also available from `simplehound.core`.
+"""
+
+from typing import Dict, List, Tuple
+
+from simplehound.models import Face, LicensePlate, Metadata, Person, Vehicle
+
+
+def bbox_to_tf_style(bbox: Dict, img_width: int, img_height: int) -> Tuple:
+    """
+    Convert Sighthound bounding box to tensorflow box style.
+
+    In Tensorflow the bounding box is defined by the tuple (y_min, x_min, y_max, x_max)
+    where the coordinates are floats in the range [0.0, 1.0] and
+    relative to the width and height of the image.
+    For example, if an image is 100 x 200 pixels (height x width) and the bounding
+    box is `(0.1, 0.2, 0.5, 0.9)`, the upper-left and bottom-right coordinates of
+    the bounding box will be `(40, 10)` to `(180, 50)` (in (x,y) coordinates).
+    """
+
+    decimals = 5
+    x_min = round(bbox["x"] / img_width, decimals)
+    x_max = round((bbox["x"] + bbox["width"]) / img_width, decimals)
+    y_min = round(bbox["y"] / img_height, decimals)
+    y_max = round((bbox["y"] + bbox["height"]) / img_height, decimals)
+    return (y_min, x_min, y_max, x_max)
+
+
+def bboxvert_to_tf_style(bbox: Dict, img_width: int, img_height: int) -> Tuple:
+    """
+    Convert Sighthound bounding box vertices, returned from the recognition API, to tensorflow box style.
+
+    In Tensorflow the bounding box is defined by the tuple (y_min, x_min, y_max, x_max)
+    where the coordinates are floats in the range [0.0, 1.0] and
+    relative to the width and height of the image.
+    For example, if an image is 100 x 200 pixels (height x width) and the bounding
+    box is `(0.1, 0.2, 0.5, 0.9)`, the upper-left and bottom-right coordinates of
+    the bounding box will be `(40, 10)` to `(180, 50)` (in (x,y) coordinates).
+    """
+
+    decimals = 5
+    xs = [d["x"] for d in bbox["vertices"]]
+    ys = [d["y"] for d in bbox["vertices"]]
+    x_min = round(min(xs) / img_width, decimals)
+    x_max = round(max(xs) / img_width, decimals)
+    y_min = round(min(ys) / img_height, decimals)
+    y_max = round(max(ys) / img_height, decimals)
+    return (y_min, x_min, y_max, x_max)
+
+
+def transform_coordinates(
+    payload: Dict,
+    scale_x: float,
+    scale_y: float,
+    offset_x: float = 0,
+    offset_y: float = 0,
+) -> Dict:
+    """
+    Map every `boundingBox` and `vertices` coordinate in a payload, in place.
+
+    Each point is mapped to `(x * scale_x + offset_x, y * scale_y + offset_y)` and
+    rounded to whole pixels, which covers both detections and recognitions
+    (including nested license plates and characters). Returns the payload.
+    """
+    for obj in payload.get("objects", []):
+        _transform_node(obj, scale_x, scale_y, offset_x, offset_y)
+    return payload
+
+
+def _transform_node(node, scale_x, scale_y, offset_x, offset_y):
+    if isinstance(node, list):
+        for item in node:
+            _transform_node(item, scale_x, scale_y, offset_x, offset_y)
+    elif isinstance(node, dict):
+        for key, value in node.items():
+            if key == "boundingBox":
+                value["x"] = round(value["x"] * scale_x + offset_x)
+                value["y"] = round(value["y"] * scale_y + offset_y)
+                value["width"] = round(value["width"] * scale_x)
+                value["height"] = round(value["height"] * scale_y)
+            elif key == "vertices":
+                for vertex in value:
+                    vertex["x"] = round(vertex["x"] * scale_x + offset_x)
+                    vertex["y"] = round(vertex["y"] * scale_y + offset_y)
+            else:
+                _transform_node(value, scale_x, scale_y, offset_x, offset_y)
+
+
+def _object_type(obj: Dict) -> str:
+    return obj.get("type") or obj.get("objectType")
+
+
+def partition_objects(payload: Dict) -> Dict[str, List[Dict]]:
+    """
+    Partition the raw objects of a detections or recognitions payload by type,
+    in one scan of its objects.
+    """
+    partition = {}
+    for obj in payload["objects"]:
+        partition.setdefault(_object_type(obj), []).append(obj)
+    return partition
+
+
+def _face(obj: Dict) -> Dict:
+    return {
+        "gender": obj["attributes"]["gender"],
+        "age": obj["attributes"]["age"],
+        "boundingBox": obj["boundingBox"],
+    }
+
+
+def _person(obj: Dict) -> Dict:
+    return {"boundingBox": obj["boundingBox"]}
+
+
+def _license_plate(obj: Dict) -> Dict:
+    annotation = obj["licenseplateAnnotation"]
+    attributes = annotation["attributes"]["system"]
+    return {
+        "boundingBox": annotation["bounding"],
+        "string": attributes["string"],
+        "region": attributes["region"],
+    }
+
+
+def _vehicle(obj: Dict) -> Dict:
+    annotation = obj["vehicleAnnotation"]
+    attributes = annotation["attributes"]["system"]
+    vehicle = {
+        "boundingBox": annotation["bounding"],
+        "recognitionConfidence": annotation["recognitionConfidence"],
+        "vehicleType": attributes["vehicleType"],
+        "make": attributes["make"]["name"],
+        "model": attributes["model"]["name"],
+        "color": attributes["color"]["name"],
+    }
+    if "licenseplate" in annotation:
+        plate = annotation["licenseplate"]["attributes"]["system"]
+        vehicle["licenseplate"] = plate["string"]["name"]
+        vehicle["region"] = plate["region"]["name"]
+    else:
+        vehicle["licenseplate"] = "unknown"
+        vehicle["region"] = "unknown"
+    return vehicle
+
+
+def parse_detections(detections: Dict, as_objects: bool = False) -> Dict:
+    """
+    Parse a detections payload in one pass into `faces`, `people` and `metadata`.
+    """
+    partition = partition_objects(detections)
+    face, person = (Face.from_raw, Person.from_raw) if as_objects else (_face, _person)
+    return {
+        "faces": [face(obj) for obj in partition.get("face", [])],
+        "people": [person(obj) for obj in partition.get("person", [])],
+        "metadata": get_metadata(detections, as_objects),
+    }
+
+
+def parse_recognitions(recognitions: Dict, as_objects: bool = False) -> Dict:
+    """
+    Parse a recognitions payload in one pass into `vehicles`, `license_plates`
+    and `metadata`.
+    """
+    partition = partition_objects(recognitions)
+    if as_objects:
+        vehicle, license_plate = Vehicle.from_raw, LicensePlate.from_raw
+    else:
+        vehicle, license_plate = _vehicle, _license_plate
+    return {
+        "vehicles": [vehicle(obj) for obj in partition.get("vehicle", [])],
+        "license_plates": [
+            license_plate(obj) for obj in partition.get("licenseplate", [])
+        ],
+        "metadata": get_metadata(recognitions, as_objects),
+    }
+
+
+def get_faces(detections: Dict, as_objects: bool = False) -> List:
+    """
+    Get the list of the faces.
+
+    If `as_objects`, return compact `Face` models instead of dicts.
+    """
+    objects = detections["objects"]
+    if as_objects:
+        return [Face.from_raw(obj) for obj in objects if obj["type"] == "face"]
+    # Inlined rather than calling `_face`, as these helpers are called per frame.
+    return [
+        {
+            "gender": obj["attributes"]["gender"],
+            "age": obj["attributes"]["age"],
+            "boundingBox": obj["boundingBox"],
+        }
+        for obj in objects
+        if obj["type"] == "face"
+    ]
+
+
+def get_people(detections: Dict, as_objects: bool = False) -> List:
+    """
+    Get the list of the people.
+
+    If `as_objects`, return compact `Person` models instead of dicts.
+    """
+    objects = detections["objects"]
+    if as_objects:
+        return [Person.from_raw(obj) for obj in objects if obj["type"] == "person"]
+    return [
+        {"boundingBox": obj["boundingBox"]}
+        for obj in objects
+        if obj["type"] == "person"
+    ]
+
+
+def get_metadata(detections: Dict, as_objects: bool = False):
+    """
+    Get the detection metadata.
+
+    If `as_objects`, return a compact `Metadata` model instead of a dict.
+    """
+    if as_objects:
+        return Metadata.from_raw(detections)
+    image = detections["image"]
+    return {
+        "image_width": image["width"],
+        "image_height": image["height"],
+        "requestId": detections["requestId"],
+    }
+
+
+def get_license_plates(recognitions: Dict, as_objects: bool = False) -> List:
+    """
+    Get the list of recognized license plates.
+
+    If `as_objects`, return compact `LicensePlate` models instead of dicts.
+    """
+    objects = recognitions["objects"]
+    if as_objects:
+        return [
+            LicensePlate.from_raw(obj)
+            for obj in objects
+            if obj["objectType"] == "licenseplate"
+        ]
+    plates = []
+    for obj in objects:
+        if obj["objectType"] != "licenseplate":
+            continue
+        annotation = obj["licenseplateAnnotation"]
+        attributes = annotation["attributes"]["system"]
+        plates.append(
+            {
+                "boundingBox": annotation["bounding"],
+                "string": attributes["string"],
+                "region": attributes["region"],
+            }
+        )
+    return plates
+
+
+def get_vehicles(detections: Dict, as_objects: bool = False) -> List:
+    """
+    Get the list of the vehicles.
+
+    If `as_objects`, return compact `Vehicle` models instead of dicts.
+    """
+    objects = detections["objects"]
+    if as_objects:
+        return [
+            Vehicle.from_raw(obj) for obj in objects if obj["objectType"] == "vehicle"
+        ]
+    vehicles = []
+    for obj in objects:
+        if obj["objectType"] != "vehicle":
+            continue
+        annotation = obj["vehicleAnnotation"]
+        attributes = annotation["attributes"]["system"]
+        if "licenseplate" in annotation:
+            plate = annotation["licenseplate"]["attributes"]["system"]
+            licenseplate = plate["string"]["name"]
+            region = plate["region"]["name"]
+        else:
+            licenseplate = region = "unknown"
+        vehicles.append(
+            {
+                "boundingBox": annotation["bounding"],
+                "recognitionConfidence": annotation["recognitionConfidence"],
+                "vehicleType": attributes["vehicleType"],
+                "make": attributes["make"]["name"],
+                "model": attributes["model"]["name"],
+                "color": attributes["color"]["name"],
+                "licenseplate": licenseplate,
+                "region": region,
+            }
+        )
+    return vehicles
@@ -0,0 +1,219 @@
+"""
+Simplehound client pool spreading requests over several API keys and endpoints.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence
+
+from simplehound.core import (
+    ALLOWED_MODES,
+    BAD_API_KEY,
+    DEFAULT_POOL_SIZE,
+    BatchResult,
+    SimplehoundException,
+    cloud,
+    run_batch,
+)
+from simplehound.metrics import RequestMetrics
+
+TOO_MANY_REQUESTS = 429
+DEFAULT_COOLDOWN = 30.0
+
+
+class PoolMember:
+    """One API key on one endpoint of a `CloudPool`, with its usage counters."""
+
+    def __init__(self, api_key: str, mode: str, client: cloud):
+        self.api_key = api_key
+        self.mode = mode
+        self.client = client
+        self.in_flight = 0
+        self.requests = 0  # attempts sent, i.e. quota used
+        self.bad_key = 0
+        self.throttled = 0
+        self.throttled_until = 0.0
+        self.ejected = False
+
+    def as_dict(self) -> Dict:
+        return {
+            "api_key": "..." + self.api_key[-4:],
+            "mode": self.mode,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "bad_key": self.bad_key,
+            "throttled": self.throttled,
+            "ejected": self.ejected,
+        }
+
+
+class CloudPool:
+    """
+    Spread requests over several API keys, and optionally both endpoints.
+
+    A `cloud` client is created per key and mode in `modes`, passing on any
+    other `cloud` keyword arguments (e.g. a shared `cache`, or a per-key
+    `rate_limit`). Each request is routed to the healthy member with the fewest
+    requests in flight, then the fewest sent. A member answering 401 is ejected
+    for good. A member answering 429 is avoided for `cooldown` seconds, unless
+    every member is. Either way the request is retried on another member.
+    Members that have sent, or are sending, `quota` requests are not used again.
+
+    Raises `SimplehoundException` if no usable member is left.
+    """
+
+    def __init__(
+        self,
+        api_keys: Sequence[str],
+        modes: Sequence[str] = ("dev",),
+        cooldown: float = DEFAULT_COOLDOWN,
+        quota: int = None,
+        **cloud_kwargs,
+    ):
+        if not api_keys:
+            raise SimplehoundException("At least one API key is required")
+        for mode in modes:
+            if not mode in ALLOWED_MODES:
+                raise SimplehoundException(
+                    f"Mode {mode} is not allowed, must be dev or prod"
+                )
+        self._cooldown = cooldown
+        self._quota = quota
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pool_size = cloud_kwargs.get("pool_size", DEFAULT_POOL_SIZE)
+        self.members = []
+        for api_key in api_keys:
+            for mode in modes:
+                member = PoolMember(api_key, mode, cloud(api_key, mode, **cloud_kwargs))
+                member.client.add_hook(self._make_hook(member))
+                self.members.append(member)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for member in self.members:
+            member.client.close()
+
+    def stats(self) -> List[Dict]:
+        """Usage counters of every member."""
+        with self._lock:
+            return [member.as_dict() for member in self.members]
+
+    def _make_hook(self, member: PoolMember) -> Callable[[RequestMetrics], None]:
+        def hook(metrics: RequestMetrics):
+            with self._lock:
+                member.requests += metrics.attempts or 1
+            self._local.status_code = metrics.status_code
+
+        return hook
+
+    def _acquire(self) -> PoolMember:
+        with self._lock:
+            now = time.monotonic()
+            # Requests in flight hold a reservation against the quota, as
+            # `requests` is only counted once they complete.
+            usable = [
+                member
+                for member in self.members
+                if not member.ejected
+                and (
+                    self._quota is None
+                    or member.requests + member.in_flight < self._quota
+                )
+            ]
+            if not usable:
+                raise SimplehoundException("No usable API key left in the pool")
+            healthy = [m for m in usable if m.throttled_until <= now] or usable
+            member = min(
+                healthy,
+                key=lambda m: (m.throttled_until > now, m.in_flight, m.requests),
+            )
+            member.in_flight += 1
+            return member
+
+    def _release(self, member: PoolMember, status_code: int = None):
+        with self._lock:
+            member.in_flight -= 1
+            if status_code == BAD_API_KEY:
+                member.bad_key += 1
+                member.ejected = True
+            elif status_code == TOO_MANY_REQUESTS:
+                member.throttled += 1
+                member.throttled_until = time.monotonic() + self._cooldown
+
+    def _route(self, method: str, *args, **kwargs) -> Dict:
+        attempts = 0
+        while True:
+            member = self._acquire()
+            self._local.status_code = None
+            try:
+                result = getattr(member.client, method)(*args, **kwargs)
+            except SimplehoundException as exc:
+                self._release(member, exc.status_code)
+                if exc.status_code not in (BAD_API_KEY, TOO_MANY_REQUESTS):
+                    raise
+                attempts += 1
+                if attempts >= len(self.members):
+                    raise
+                continue
+            except BaseException:
+                self._release(member)
+                raise
+            status_code = self._local.status_code
+            self._release(member, status_code)
+            # Without a RetryPolicy, cloud returns None for a 429.
+            if result is None and status_code == TOO_MANY_REQUESTS:
+                attempts += 1
+                if attempts < len(self.members):
+                    continue
+            return result
+
+    def detect(self, image: bytes, **kwargs) -> Dict:
+        """Run detection on an image (bytes), see `cloud.detect`."""
+        return self._route("detect", image, **kwargs)
+
+    def recognize(self, image: bytes, object_type: str, **kwargs) -> Dict:
+        """Run recognition on an image (bytes), see `cloud.recognize`."""
+        return self._route("recognize", image, object_type, **kwargs)
+
+    def detect_file(self, path: str, **kwargs) -> Dict:
+        """Run detection on an image file, see `cloud.detect_file`."""
+        return self._route("detect_file", path, **kwargs)
+
+    def recognize_file(self, path: str, object_type: str, **kwargs) -> Dict:
+        """Run recognition on an image file, see `cloud.recognize_file`."""
+        return self._route("recognize_file", path, object_type, **kwargs)
+
+    def detect_many(
+        self, images: Iterable[bytes], max_workers: int = None, ordered: bool = True
+    ) -> Iterator[BatchResult]:
+        """
+        Run detection on many images concurrently, yielding a `BatchResult` per image.
+
+        `max_workers` defaults to the connection pool size of every member.
+        """
+        max_workers = max_workers or self._pool_size * len(self.members)
+        return run_batch(self.detect, images, max_workers, ordered)
+
+    def recognize_many(
+        self,
+        images: Iterable[bytes],
+        object_type: str,
+        max_workers: int = None,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult]:
+        """
+        Run recognition on many images concurrently, yielding a `BatchResult` per image.
+        """
+        max_workers = max_workers or self._pool_size * len(self.members)
+        return run_batch(
+            lambda image: self.recognize(image, object_type),
+            images,
+            max_workers,
+            ordered,
+        )
@@ -0,0 +1,152 @@
+"""
+Simplehound client-side image preprocessing.
+
+Downscaling/re-encoding images before upload, and cropping them to regions of
+interest with results mapped back to full-frame coordinates.
+
+Requires Pillow, install with `pip install simplehound[preprocess]`.
+"""
+
+import io
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from PIL import Image
+
+from simplehound.parse import transform_coordinates
+
+
+class PreprocessedImage(NamedTuple):
+    """An image as sent to Sighthound, with the size of the original."""
+
+    image: bytes
+    original_size: Tuple[int, int]
+    size: Tuple[int, int]
+
+    def restore(self, result: Dict) -> Dict:
+        """
+        Map a result for this image back to the original resolution, in place.
+        """
+        if self.size != self.original_size:
+            transform_coordinates(
+                result,
+                self.original_size[0] / self.size[0],
+                self.original_size[1] / self.size[1],
+            )
+        if "image" in result:
+            result["image"]["width"], result["image"]["height"] = self.original_size
+        return result
+
+
+class Preprocessor:
+    """
+    Downscale and/or re-encode images before they are uploaded.
+
+    Images with a side longer than `max_dimension` pixels are downscaled,
+    preserving aspect ratio. If `jpeg_quality` is set, images are re-encoded as
+    JPEG at that quality. Images needing neither are sent untouched.
+    """
+
+    def __init__(self, max_dimension: int = None, jpeg_quality: int = None):
+        self._max_dimension = max_dimension
+        self._jpeg_quality = jpeg_quality
+
+    def process(self, image: bytes) -> PreprocessedImage:
+        """Preprocess an image (bytes)."""
+        img = Image.open(io.BytesIO(image))
+        original_size = img.size
+        downscale = (
+            self._max_dimension is not None and max(img.size) > self._max_dimension
+        )
+        if not downscale and self._jpeg_quality is None:
+            return PreprocessedImage(image, original_size, original_size)
+        if downscale:
+            img.thumbnail((self._max_dimension, self._max_dimension), Image.BILINEAR)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=self._jpeg_quality or 90)
+        return PreprocessedImage(buffer.getvalue(), original_size, img.size)
+
+
+class Region(NamedTuple):
+    """
+    A rectangular region of interest of a frame.
+
+    Given in pixels, or as fractions of the frame width and height if
+    `normalized`.
+    """
+
+    x: float
+    y: float
+    width: float
+    height: float
+    normalized: bool = False
+
+    def to_box(self, frame_size: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """The region as a pixel `(left, top, right, bottom)` box clipped to the frame."""
+        frame_width, frame_height = frame_size
+        x, y, width, height = self[:4]
+        if self.normalized:
+            x, width = x * frame_width, width * frame_width
+            y, height = y * frame_height, height * frame_height
+        left = min(max(0, round(x)), frame_width)
+        top = min(max(0, round(y)), frame_height)
+        right = min(max(left, round(x + width)), frame_width)
+        bottom = min(max(top, round(y + height)), frame_height)
+        if right == left or bottom == top:
+            raise ValueError(f"Region {self} does not overlap the frame")
+        return left, top, right, bottom
+
+
+class Crop(NamedTuple):
+    """A region of a frame encoded for upload, with its offset in the frame."""
+
+    image: bytes
+    offset: Tuple[int, int]
+
+
+def crop_regions(
+    image: bytes, regions: Iterable, jpeg_quality: int = 90
+) -> Tuple[Tuple[int, int], List[Crop]]:
+    """
+    Crop an image (bytes) to `regions`, returning the frame size and the crops.
+
+    Regions may be `Region`s or plain `(x, y, width, height)` pixel tuples. The
+    frame is decoded once and each crop is encoded as JPEG at `jpeg_quality`.
+    """
+    regions = list(regions)
+    if not regions:
+        raise ValueError("At least one region is required")
+    img = Image.open(io.BytesIO(image))
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    crops = []
+    for region in regions:
+        box = Region(*region).to_box(img.size)
+        buffer = io.BytesIO()
+        img.crop(box).save(buffer, format="JPEG", quality=jpeg_quality)
+        crops.append(Crop(buffer.getvalue(), box[:2]))
+    return img.size, crops
+
+
+def merge_results(
+    results: List[Dict], crops: List[Crop], frame_size: Tuple[int, int]
+) -> Optional[Dict]:
+    """
+    Merge the results for `crops` into one payload in full-frame coordinates.
+
+    The first result's `requestId` and image metadata are kept, with the image
+    size set to the frame size. Objects in overlapping regions are reported
+    once per region. The results are modified in place.
+    """
+    if any(result is None for result in results):
+        return None
+    objects = []
+    for result, crop in zip(results, crops):
+        transform_coordinates(result, 1, 1, *crop.offset)
+        objects.extend(result.get("objects", []))
+    merged = dict(results[0], objects=objects)
+    if "image" in merged:
+        merged["image"] = dict(merged["image"])
+        merged["image"]["width"], merged["image"]["height"] = frame_size
+    return merged
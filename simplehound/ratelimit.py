@@ -0,0 +1,96 @@
+"""
+Simplehound client-side rate limiting and retry scheduling.
+"""
+
+import random
+import threading
+import time
+from typing import Iterable, Optional
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing `rate` calls per second on average and
+    bursts of up to `burst` calls (default: one second's worth of calls).
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._rate = rate
+        self._burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: float = None) -> bool:
+        """
+        Take a token, sleeping until one is available.
+
+        Returns False without taking a token if none would be available before
+        `deadline`, a `time.monotonic()` timestamp.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            # Reserve a token now and wait outside the lock for the debt to clear.
+            wait = max(0.0, (1 - self._tokens) / self._rate)
+            if deadline is not None and now + wait > deadline:
+                return False
+            self._tokens -= 1
+        if wait:
+            time.sleep(wait)
+        return True
+
+
+class RetryPolicy:
+    """
+    Retry 429, 5xx and connection errors with jittered exponential backoff.
+
+    Up to `max_retries` retries are made. The n-th retry waits a random delay
+    of up to `backoff * 2**n` seconds, capped at `max_backoff`, unless the
+    response carries a `Retry-After` header, which is honoured instead. If
+    `deadline` is set, a call gives up once that many seconds have passed.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        deadline: float = None,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def delay(self, attempt: int, retry_after: str = None) -> float:
+        """Seconds to wait before retrying after failed attempt number `attempt`."""
+        seconds = parse_retry_after(retry_after)
+        if seconds is not None:
+            return seconds
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime  # rarely needed, slow to import
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,349 @@
+"""
+Simplehound result store.
+
+Ingests detection and recognition payloads into an indexed SQLite database, one
+row per face, person, vehicle or license plate, so questions like "when was
+plate ABC123 last seen" or "all red Toyotas yesterday" are answered from
+indexes instead of scanning stored JSON.
+
+Plates are also indexed under a key that folds common OCR confusions (O/0/Q/D,
+I/1/L, Z/2, S/5, B/8, G/6). Fuzzy search for one further edit probes that index
+for every key one edit away from the query, so it costs nothing at ingest.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from simplehound.parse import parse_detections, parse_recognitions
+
+OCR_CONFUSIONS = str.maketrans("OQDILZSBG", "000112586")
+PLATE_KEY_CHARS = "ACEFHJKMNPRTUVWXY0123456789"  # all plate_key can produce
+BATCH_SIZE = 10000
+CACHE_SIZE_KB = 64 * 1024
+MAX_PARAMS = 500  # bound parameters per statement, well below SQLite's limit
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS payloads ("
+    "request_id TEXT PRIMARY KEY, timestamp REAL NOT NULL, source TEXT, "
+    "width INTEGER, height INTEGER)",
+    "CREATE TABLE IF NOT EXISTS sightings ("
+    "id INTEGER PRIMARY KEY, request_id TEXT NOT NULL, timestamp REAL NOT NULL, "
+    "source TEXT, kind TEXT NOT NULL, plate TEXT, plate_key TEXT, "
+    "region TEXT COLLATE NOCASE, make TEXT COLLATE NOCASE, "
+    "model TEXT COLLATE NOCASE, color TEXT COLLATE NOCASE, "
+    "vehicle_type TEXT COLLATE NOCASE, confidence REAL, gender TEXT, age INTEGER, "
+    "x INTEGER, y INTEGER, width INTEGER, height INTEGER)",
+    "CREATE TABLE IF NOT EXISTS plates (plate_key TEXT PRIMARY KEY) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS sightings_plate ON sightings (plate_key, timestamp)",
+    "CREATE INDEX IF NOT EXISTS sightings_vehicle "
+    "ON sightings (make, model, timestamp)",
+    "CREATE INDEX IF NOT EXISTS sightings_color ON sightings (color, timestamp)",
+    "CREATE INDEX IF NOT EXISTS sightings_region ON sightings (region, timestamp)",
+    "CREATE INDEX IF NOT EXISTS sightings_time ON sightings (timestamp)",
+]
+_COLUMNS = (
+    "request_id, timestamp, source, kind, plate, plate_key, region, make, model, "
+    "color, vehicle_type, confidence, gender, age, x, y, width, height"
+)
+_INSERT_SIGHTING = (
+    f"INSERT INTO sightings ({_COLUMNS}) "
+    f"VALUES ({', '.join('?' * len(_COLUMNS.split(',')))})"
+)
+
+
+def plate_key(plate: str) -> str:
+    """Normalize a plate string: alphanumerics only, upper case, OCR confusions folded."""
+    return "".join(filter(str.isalnum, plate.upper())).translate(OCR_CONFUSIONS)
+
+
+def _neighbours(key: str) -> Set[str]:
+    """`key` and every key one substitution, insertion or deletion away."""
+    splits = [(key[:i], key[i:]) for i in range(len(key) + 1)]
+    neighbours = {key}
+    neighbours.update(head + tail[1:] for head, tail in splits if tail)
+    for char in PLATE_KEY_CHARS:
+        neighbours.update(head + char + tail[1:] for head, tail in splits if tail)
+        neighbours.update(head + char + tail for head, tail in splits)
+    return neighbours
+
+
+def edit_distance(a: str, b: str, limit: int = None) -> int:
+    """
+    Levenshtein distance between `a` and `b`.
+
+    If `limit` is given, stops early and returns `limit + 1` once the distance
+    is known to exceed it.
+    """
+    if limit is not None and abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _chunks(items: List, size: int) -> Iterator[List]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _box(bounding: Dict) -> Tuple:
+    if "vertices" in bounding:
+        xs = [vertex["x"] for vertex in bounding["vertices"]]
+        ys = [vertex["y"] for vertex in bounding["vertices"]]
+        return min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)
+    return bounding["x"], bounding["y"], bounding["width"], bounding["height"]
+
+
+def _sightings(payload: Dict, timestamp: float, source: Optional[str]) -> List[Tuple]:
+    """One row per face, person, vehicle and license plate of a payload."""
+    head = (payload["requestId"], timestamp, source)
+    # Either parser accepts both payload kinds, returning no objects of the other.
+    detections = parse_detections(payload)
+    recognitions = parse_recognitions(payload)
+    rows = []
+    for face in detections["faces"]:
+        rows.append(
+            head
+            + ("face",)
+            + (None,) * 8
+            + (face["gender"], face["age"])
+            + _box(face["boundingBox"])
+        )
+    for person in detections["people"]:
+        rows.append(head + ("person",) + (None,) * 10 + _box(person["boundingBox"]))
+    for vehicle in recognitions["vehicles"]:
+        plate = (
+            vehicle["licenseplate"] if vehicle["licenseplate"] != "unknown" else None
+        )
+        region = vehicle["region"] if vehicle["region"] != "unknown" else None
+        rows.append(
+            head
+            + ("vehicle", plate, plate_key(plate) if plate else None, region)
+            + (vehicle["make"], vehicle["model"], vehicle["color"])
+            + (vehicle["vehicleType"], vehicle["recognitionConfidence"], None, None)
+            + _box(vehicle["boundingBox"])
+        )
+    for plate in recognitions["license_plates"]:
+        string = plate["string"]
+        rows.append(
+            head
+            + ("licenseplate", string["name"], plate_key(string["name"]))
+            + (plate["region"]["name"],)
+            + (None,) * 4
+            + (string["confidence"], None, None)
+            + _box(plate["boundingBox"])
+        )
+    return rows
+
+
+class ResultStore:
+    """
+    Indexed SQLite store of Sighthound results at `path` (in memory by default).
+
+    Each payload is stored once per `requestId`. Query methods return sighting
+    dicts, newest first, with the columns `request_id`, `timestamp`, `source`,
+    `kind`, `plate`, `plate_key`, `region`, `make`, `model`, `color`,
+    `vehicle_type`, `confidence`, `gender`, `age`, `x`, `y`, `width` and `height`.
+    Text attributes are compared case-insensitively.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Keep the indexes' hot pages in memory during bulk inserts.
+        self._conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sightings").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def add(self, payload: Dict, timestamp: float = None, source: str = None) -> bool:
+        """
+        Store a detections or recognitions payload seen at `timestamp` (default:
+        now) from `source`, e.g. a camera name. Returns False if a payload with
+        the same `requestId` is already stored.
+        """
+        return self.add_many([(payload, timestamp, source)]) == 1
+
+    def add_many(self, items: Iterable[Tuple[Dict, float, Optional[str]]]) -> int:
+        """
+        Store many `(payload, timestamp, source)` items in one transaction.
+
+        Returns the number of payloads stored, skipping already stored ones.
+        """
+        stored = 0
+        rows = []
+        with self._lock, self._conn:
+            for payload, timestamp, source in items:
+                timestamp = time.time() if timestamp is None else timestamp
+                image = payload.get("image", {})
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO payloads VALUES (?, ?, ?, ?, ?)",
+                    (
+                        payload["requestId"],
+                        timestamp,
+                        source,
+                        image.get("width"),
+                        image.get("height"),
+                    ),
+                )
+                if cursor.rowcount == 0:
+                    continue
+                stored += 1
+                rows += _sightings(payload, timestamp, source)
+                if len(rows) >= BATCH_SIZE:
+                    self._insert(rows)
+                    rows = []
+            self._insert(rows)
+        return stored
+
+    def _insert(self, rows: List[Tuple]):
+        self._conn.executemany(_INSERT_SIGHTING, rows)
+        keys = {row[5] for row in rows if row[5]}
+        # Sorted, so the B-tree is filled in order rather than at random pages.
+        new_keys = sorted(keys - self._stored_plates(keys))
+        self._conn.executemany(
+            "INSERT INTO plates VALUES (?)", [(key,) for key in new_keys]
+        )
+
+    def _stored_plates(self, keys: Iterable[str]) -> Set[str]:
+        stored = set()
+        for chunk in _chunks(sorted(keys), MAX_PARAMS):
+            stored.update(
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT plate_key FROM plates WHERE plate_key IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        return stored
+
+    def _query(self, where: List[str], params: List, limit: int = None) -> List[Dict]:
+        sql = f"SELECT {_COLUMNS} FROM sightings"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + [limit]
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def matching_plates(self, plate: str, max_distance: int = 0) -> List[str]:
+        """
+        Plate keys stored within `max_distance` edits of `plate`, after folding
+        OCR confusions.
+        """
+        key = plate_key(plate)
+        with self._lock:
+            if max_distance <= 1:
+                return sorted(
+                    self._stored_plates(_neighbours(key) if max_distance else [key])
+                )
+            # Too many neighbours to probe, scan the plates of a possible length.
+            candidates = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT plate_key FROM plates WHERE length(plate_key) BETWEEN ? AND ?",
+                    (len(key) - max_distance, len(key) + max_distance),
+                )
+            ]
+        return sorted(
+            candidate
+            for candidate in candidates
+            if edit_distance(key, candidate, max_distance) <= max_distance
+        )
+
+    def find_plate(
+        self,
+        plate: str,
+        max_distance: int = 0,
+        since: float = None,
+        until: float = None,
+        limit: int = None,
+    ) -> List[Dict]:
+        """
+        Sightings of a plate, on vehicles or on their own, between `since` and
+        `until`. OCR confusions always match, and up to `max_distance` other
+        character edits are tolerated.
+        """
+        keys = self.matching_plates(plate, max_distance)
+        if not keys:
+            return []
+        where = [f"plate_key IN ({', '.join('?' * len(keys))})"]
+        params = list(keys)
+        self._time_range(where, params, since, until)
+        return self._query(where, params, limit)
+
+    def last_seen(self, plate: str, max_distance: int = 0) -> Optional[Dict]:
+        """The most recent sighting of a plate, or None."""
+        sightings = self.find_plate(plate, max_distance, limit=1)
+        return sightings[0] if sightings else None
+
+    def find_vehicles(
+        self,
+        make: str = None,
+        model: str = None,
+        color: str = None,
+        region: str = None,
+        vehicle_type: str = None,
+        since: float = None,
+        until: float = None,
+        limit: int = None,
+    ) -> List[Dict]:
+        """Vehicle sightings matching every given attribute, between `since` and `until`."""
+        where = ["kind = 'vehicle'"]
+        params = []
+        for column, value in [
+            ("make", make),
+            ("model", model),
+            ("color", color),
+            ("region", region),
+            ("vehicle_type", vehicle_type),
+        ]:
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        self._time_range(where, params, since, until)
+        return self._query(where, params, limit)
+
+    @staticmethod
+    def _time_range(where: List[str], params: List, since: float, until: float):
+        if since is not None:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("timestamp < ?")
+            params.append(until)
@@ -0,0 +1,232 @@
+"""
+Simplehound object tracking across frames.
+
+Every API call is stateless, so a parked car or a person standing still is
+reported again on every frame. `Tracker` matches the boxes of successive
+payloads of a stream by intersection over union (IoU), gives each object a
+stable track ID, and emits an event only when a track enters or leaves.
+
+Requires NumPy, install with `pip install simplehound[numpy]`.
+"""
+
+import itertools
+import threading
+from typing import Dict, Hashable, List, NamedTuple, Tuple
+
+import numpy as np
+
+from simplehound.vectorized import tf_boxes
+
+ENTER = "enter"
+EXIT = "exit"
+DEFAULT_IOU_THRESHOLD = 0.3
+DEFAULT_MAX_MISSES = 1
+DEFAULT_MIN_HITS = 1
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Intersection over union of every box in `a` with every box in `b`.
+
+    Boxes are `(y_min, x_min, y_max, x_max)` rows, as returned by `tf_boxes`.
+    Returns an `(len(a), len(b))` array.
+    """
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    # Work in place on (N, M) arrays, the per-box terms are only (N, 1) or (1, M).
+    intersection = np.minimum(a[:, None, 2], b[None, :, 2])
+    intersection -= np.maximum(a[:, None, 0], b[None, :, 0])
+    np.maximum(intersection, 0, out=intersection)
+    width = np.minimum(a[:, None, 3], b[None, :, 3])
+    width -= np.maximum(a[:, None, 1], b[None, :, 1])
+    np.maximum(width, 0, out=width)
+    intersection *= width
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = np.add(area_a[:, None], area_b[None, :], out=width)
+    union -= intersection
+    return np.divide(intersection, union, out=intersection, where=union > 0)
+
+
+def greedy_match(iou: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pair rows with columns of `iou`, highest IoU first, skipping pairs below
+    `threshold`. Returns the matched row and column indices.
+    """
+    rows, cols = np.nonzero(iou >= threshold)
+    order = np.argsort(-iou[rows, cols], kind="stable")
+    used_rows, used_cols = set(), set()
+    matched_rows, matched_cols = [], []
+    for row, col in zip(rows[order].tolist(), cols[order].tolist()):
+        if row in used_rows or col in used_cols:
+            continue
+        used_rows.add(row)
+        used_cols.add(col)
+        matched_rows.append(row)
+        matched_cols.append(col)
+    return np.asarray(matched_rows, dtype=np.intp), np.asarray(matched_cols, np.intp)
+
+
+class TrackEvent(NamedTuple):
+    """A track entering (`ENTER`) or leaving (`EXIT`) a stream."""
+
+    kind: str
+    stream: Hashable
+    track_id: int
+    object_type: str
+    box: Tuple[float, float, float, float]  # last tf-style box
+    obj: Dict  # last raw object matched to the track
+    frame: int
+
+
+class _Tracks:
+    """The tracks of one stream, as parallel arrays."""
+
+    def __init__(self):
+        self.frame = 0
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.boxes = np.zeros((0, 4), dtype=np.float32)
+        self.types = np.zeros(0, dtype=np.intp)
+        self.hits = np.zeros(0, dtype=np.intp)
+        self.misses = np.zeros(0, dtype=np.intp)
+        self.confirmed = np.zeros(0, dtype=bool)
+        self.objs = []
+
+    def keep(self, mask: np.ndarray):
+        for name in ("ids", "boxes", "types", "hits", "misses", "confirmed"):
+            setattr(self, name, getattr(self, name)[mask])
+        self.objs = [obj for obj, kept in zip(self.objs, mask.tolist()) if kept]
+
+
+class Tracker:
+    """
+    Track objects across successive payloads of one or more streams.
+
+    Each box of a new payload is matched to the track of the same object type
+    whose last box overlaps it most, provided their IoU is at least
+    `iou_threshold`; matching is greedy, highest IoU first. Unmatched boxes
+    start new tracks. A track enters once it has been seen on `min_hits`
+    frames, and exits after it is missing from more than `max_misses`
+    consecutive frames, so one dropped detection does not end it.
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = DEFAULT_IOU_THRESHOLD,
+        max_misses: int = DEFAULT_MAX_MISSES,
+        min_hits: int = DEFAULT_MIN_HITS,
+    ):
+        self._iou_threshold = iou_threshold
+        self._max_misses = max_misses
+        self._min_hits = min_hits
+        self._streams = {}
+        self._type_codes = {}
+        self._type_names = []
+        self._next_id = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _type_code(self, obj_type: str) -> int:
+        code = self._type_codes.get(obj_type)
+        if code is None:
+            code = self._type_codes[obj_type] = len(self._type_names)
+            self._type_names.append(obj_type)
+        return code
+
+    def _event(self, kind: str, stream: Hashable, tracks: _Tracks, i: int):
+        return TrackEvent(
+            kind,
+            stream,
+            int(tracks.ids[i]),
+            self._type_names[tracks.types[i]],
+            tuple(tracks.boxes[i].tolist()),
+            tracks.objs[i],
+            tracks.frame,
+        )
+
+    def update(self, payload: Dict, stream: Hashable = None) -> List[TrackEvent]:
+        """
+        Match the objects of the next detections or recognitions payload of
+        `stream` to its tracks, returning the exit events, then the enter events.
+        """
+        boxes, index = tf_boxes(payload)
+        objs = [payload["objects"][i] for i in index[:, 1].tolist()]
+        with self._lock:
+            tracks = self._streams.setdefault(stream, _Tracks())
+            tracks.frame += 1
+            types = np.fromiter(
+                (
+                    self._type_code(obj.get("type") or obj.get("objectType"))
+                    for obj in objs
+                ),
+                dtype=np.intp,
+                count=len(objs),
+            )
+            iou = iou_matrix(tracks.boxes, boxes)
+            iou[tracks.types[:, None] != types[None, :]] = 0
+            rows, cols = greedy_match(iou, self._iou_threshold)
+
+            matched = np.zeros(len(tracks.ids), dtype=bool)
+            matched[rows] = True
+            tracks.boxes[rows] = boxes[cols]
+            tracks.hits[rows] += 1
+            tracks.misses[rows] = 0
+            tracks.misses[~matched] += 1
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                tracks.objs[row] = objs[col]
+
+            events = []
+            lost = tracks.misses > self._max_misses
+            for i in np.flatnonzero(lost & tracks.confirmed).tolist():
+                events.append(self._event(EXIT, stream, tracks, i))
+            entering = ~tracks.confirmed & (tracks.hits >= self._min_hits) & ~lost
+            tracks.confirmed |= entering
+            tracks.keep(~lost)
+
+            new = np.ones(len(objs), dtype=bool)
+            new[cols] = False
+            count = int(new.sum())
+            tracks.ids = np.concatenate(
+                [tracks.ids, [next(self._next_id) for _ in range(count)]]
+            ).astype(np.int64)
+            tracks.boxes = np.concatenate([tracks.boxes, boxes[new]])
+            tracks.types = np.concatenate([tracks.types, types[new]])
+            tracks.hits = np.concatenate([tracks.hits, np.ones(count, dtype=np.intp)])
+            tracks.misses = np.concatenate([tracks.misses, np.zeros(count, np.intp)])
+            confirmed = np.full(count, self._min_hits <= 1)
+            tracks.confirmed = np.concatenate([tracks.confirmed, confirmed])
+            tracks.objs += [obj for obj, is_new in zip(objs, new.tolist()) if is_new]
+            entering = np.concatenate([entering[~lost], confirmed])
+
+            for i in np.flatnonzero(entering).tolist():
+                events.append(self._event(ENTER, stream, tracks, i))
+            return events
+
+    def active(self, stream: Hashable = None) -> Dict[int, Dict]:
+        """The last raw object of each entered track of `stream`, by track ID."""
+        with self._lock:
+            tracks = self._streams.get(stream)
+            if tracks is None:
+                return {}
+            return {
+                int(track_id): obj
+                for track_id, obj, confirmed in zip(
+                    tracks.ids, tracks.objs, tracks.confirmed
+                )
+                if confirmed
+            }
+
+    def flush(self, stream: Hashable = None) -> List[TrackEvent]:
+        """
+        End every track of `stream` (of every stream if None), returning exit
+        events for the tracks that had entered.
+        """
+        with self._lock:
+            streams = list(self._streams) if stream is None else [stream]
+            events = []
+            for name in streams:
+                tracks = self._streams.pop(name, None)
+                if tracks is None:
+                    continue
+                for i in np.flatnonzero(tracks.confirmed).tolist():
+                    events.append(self._event(EXIT, name, tracks, i))
+            return events
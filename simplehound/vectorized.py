@@ -0,0 +1,86 @@
+"""
+Simplehound vectorized helpers.
+
+Requires NumPy, install with `pip install simplehound[numpy]`.
+"""
+
+from itertools import chain
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+DECIMALS = 5
+
+
+def _object_bounds(obj: Dict) -> Tuple:
+    """Return (x_min, y_min, x_max, y_max) in pixels, or None if obj has no box."""
+    bbox = obj.get("boundingBox")
+    if bbox is not None:
+        x, y = bbox["x"], bbox["y"]
+        return (x, y, x + bbox["width"], y + bbox["height"])
+    annotation = obj.get("vehicleAnnotation") or obj.get("licenseplateAnnotation")
+    if annotation is None:
+        return None
+    vertices = annotation["bounding"]["vertices"]
+    xs = [vertex["x"] for vertex in vertices]
+    ys = [vertex["y"] for vertex in vertices]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _round(values: np.ndarray) -> np.ndarray:
+    """
+    Round to DECIMALS places, matching Python's `round` used by the scalar helpers.
+
+    `np.round` scales by 10**DECIMALS and rounds half to even, which can differ
+    from `round` for values that land (almost) exactly halfway, e.g. 879 / 960.
+    Those rare near-ties are rounded with `round` instead.
+    """
+    rounded = np.round(values, DECIMALS)
+    fraction = np.abs(np.modf(values * 10**DECIMALS)[0])
+    near_ties = np.flatnonzero(np.abs(fraction - 0.5) < 1e-6)
+    flat_values, flat_rounded = values.ravel(), rounded.ravel()
+    for i in near_ties:
+        flat_rounded[i] = round(float(flat_values[i]), DECIMALS)
+    return rounded
+
+
+def tf_boxes(payloads: Union[Dict, List[Dict]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert every object box in one or more payloads to tensorflow box style.
+
+    Accepts a detections or recognitions payload, or a list of them. Returns an
+    `(N, 4)` float32 array of `(y_min, x_min, y_max, x_max)` rows, equivalent to
+    `bbox_to_tf_style` / `bboxvert_to_tf_style`, and an `(N, 2)` int array of
+    `(payload index, object index)` mapping each row back to its object.
+    """
+    if isinstance(payloads, dict):
+        payloads = [payloads]
+    bounds = []
+    object_idx = []
+    counts = []
+    sizes = []
+    for payload in payloads:
+        payload_bounds = list(map(_object_bounds, payload["objects"]))
+        kept = [i for i, obj_bounds in enumerate(payload_bounds) if obj_bounds]
+        if len(kept) != len(payload_bounds):
+            payload_bounds = [payload_bounds[i] for i in kept]
+        bounds.extend(payload_bounds)
+        object_idx.extend(kept)
+        counts.append(len(kept))
+        sizes.append((payload["image"]["width"], payload["image"]["height"]))
+    num_boxes = len(bounds)
+    if not num_boxes:
+        return np.zeros((0, 4), dtype=np.float32), np.zeros((0, 2), dtype=np.intp)
+
+    bounds = np.fromiter(
+        chain.from_iterable(bounds), dtype=np.float64, count=4 * num_boxes
+    ).reshape(num_boxes, 4)
+    sizes = np.repeat(np.asarray(sizes, dtype=np.float64), counts, axis=0)
+    scale = np.concatenate([sizes, sizes], axis=1)  # (w, h, w, h)
+    normalized = _round(bounds / scale)
+    # (x_min, y_min, x_max, y_max) -> (y_min, x_min, y_max, x_max)
+    boxes = normalized[:, [1, 0, 3, 2]].astype(np.float32)
+    index = np.empty((num_boxes, 2), dtype=np.intp)
+    index[:, 0] = np.repeat(np.arange(len(payloads)), counts)
+    index[:, 1] = object_idx
+    return boxes, index
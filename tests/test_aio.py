@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import simplehound.core as hound
+from simplehound.aio import AsyncCloud
+from tests.test_simplehound import (
+    DETECTIONS,
+    MOCK_API_KEY,
+    MOCK_BYTES,
+    RECOGNITIONS_LICENSEPLATE,
+    URL_DETECTIONS_DEV,
+    URL_RECOGNITIONS_DEV,
+)
+
+
+def make_app(status=hound.HTTP_OK, delay=0.0, stats=None):
+    stats = stats if stats is not None else {}
+    stats.update(in_flight=0, max_in_flight=0, requests=[])
+
+    async def handler(request):
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        body = await request.json()
+        stats["requests"].append((request, body))
+        await asyncio.sleep(delay)
+        stats["in_flight"] -= 1
+        if "objectType" in request.query:
+            return web.json_response(RECOGNITIONS_LICENSEPLATE, status=status)
+        return web.json_response(DETECTIONS, status=status)
+
+    app = web.Application()
+    app.router.add_post("/v1/detections", handler)
+    app.router.add_post("/v1/recognition", handler)
+    return app
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_async_cloud_init():
+    api = AsyncCloud(MOCK_API_KEY)
+    assert api._url_detections == URL_DETECTIONS_DEV
+    assert api._url_recognitions == URL_RECOGNITIONS_DEV
+
+    assert api._timeout.sock_connect == hound.DEFAULT_TIMEOUT[0]
+    assert api._timeout.sock_read == hound.DEFAULT_TIMEOUT[1]
+    api = AsyncCloud(MOCK_API_KEY, timeout=3)
+    assert (api._timeout.sock_connect, api._timeout.sock_read) == (3, 3)
+    api = AsyncCloud(MOCK_API_KEY, timeout=None)
+    assert api._timeout.total is None and api._timeout.sock_read is None
+
+    with pytest.raises(hound.SimplehoundException) as exc:
+        AsyncCloud(MOCK_API_KEY, mode="bad")
+    assert str(exc.value) == "Mode bad is not allowed, must be dev or prod"
+
+
+def test_async_cloud_detect_and_recognize_good():
+    stats = {}
+
+    async def main():
+        async with TestServer(make_app(stats=stats)) as server:
+            async with AsyncCloud(
+                MOCK_API_KEY, base_url=str(server.make_url("/"))
+            ) as api:
+                detections = await api.detect(MOCK_BYTES)
+                recognitions = await api.recognize(MOCK_BYTES, "licenseplate")
+        return detections, recognitions
+
+    detections, recognitions = run(main())
+    assert detections == DETECTIONS
+    assert recognitions == RECOGNITIONS_LICENSEPLATE
+    request, body = stats["requests"][0]
+    assert request.headers["X-Access-Token"] == MOCK_API_KEY
+    assert body == {"image": "VGVzdA=="}
+
+
+def test_async_cloud_bounded_concurrency():
+    stats = {}
+
+    async def main():
+        async with TestServer(make_app(delay=0.05, stats=stats)) as server:
+            async with AsyncCloud(
+                MOCK_API_KEY, max_concurrency=3, base_url=str(server.make_url("/"))
+            ) as api:
+                return await asyncio.gather(*[api.detect(MOCK_BYTES) for _ in range(9)])
+
+    results = run(main())
+    assert results == [DETECTIONS] * 9
+    assert stats["max_in_flight"] == 3
+
+
+def test_async_cloud_detect_bad_key():
+    async def main():
+        async with TestServer(make_app(status=hound.BAD_API_KEY)) as server:
+            async with AsyncCloud(
+                MOCK_API_KEY, base_url=str(server.make_url("/"))
+            ) as api:
+                await api.detect(MOCK_BYTES)
+
+    with pytest.raises(hound.SimplehoundException) as exc:
+        run(main())
+    assert str(exc.value) == "Bad API key for Sighthound"
+    assert exc.value.status_code == hound.BAD_API_KEY
+
+
+def test_async_cloud_hooks_see_error_statuses():
+    records = []
+
+    async def main():
+        async with TestServer(make_app(status=500)) as server:
+            async with AsyncCloud(
+                MOCK_API_KEY, base_url=str(server.make_url("/"))
+            ) as api:
+                api.add_hook(records.append)
+                return await api.recognize(MOCK_BYTES, "licenseplate")
+
+    assert run(main()) is None
+    (metrics,) = records
+    assert (metrics.endpoint, metrics.object_type) == ("recognition", "licenseplate")
+    assert metrics.status_code == 500
+    assert metrics.bytes_sent > 0 and metrics.round_trip_time > 0
+
+
+def test_async_cloud_recognize_bad_object_type():
+    api = AsyncCloud(MOCK_API_KEY)
+    with pytest.raises(hound.SimplehoundException):
+        run(api.recognize(MOCK_BYTES, "bad"))
+
+
+def test_async_cloud_coalesces_identical_requests():
+    stats = {}
+
+    async def main():
+        async with TestServer(make_app(delay=0.05, stats=stats)) as server:
+            async with AsyncCloud(
+                MOCK_API_KEY, coalesce=True, base_url=str(server.make_url("/"))
+            ) as api:
+                calls = [api.detect(MOCK_BYTES) for _ in range(4)]
+                calls.append(api.recognize(MOCK_BYTES, "licenseplate"))
+                return await asyncio.gather(*calls)
+
+    results = run(main())
+    assert results == [DETECTIONS] * 4 + [RECOGNITIONS_LICENSEPLATE]
+    assert results[0] is not results[1]
+    assert len(stats["requests"]) == 2
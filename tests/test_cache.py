@@ -0,0 +1,145 @@
+from unittest import mock
+
+import requests_mock
+
+import simplehound.core as hound
+from simplehound.cache import ResultCache, SQLiteCache, cache_key
+from tests.test_simplehound import (
+    DETECTIONS,
+    MOCK_API_KEY,
+    MOCK_BYTES,
+    RECOGNITIONS_LICENSEPLATE,
+    URL_DETECTIONS_DEV,
+    URL_DETECTIONS_PROD,
+    URL_RECOGNITIONS_DEV,
+)
+
+
+def test_cache_key():
+    key = cache_key(MOCK_BYTES, URL_DETECTIONS_DEV)
+    assert key == cache_key(MOCK_BYTES, URL_DETECTIONS_DEV)
+    assert key != cache_key(b"Other", URL_DETECTIONS_DEV)
+    assert key != cache_key(MOCK_BYTES, URL_DETECTIONS_PROD)
+    assert cache_key(MOCK_BYTES, URL_RECOGNITIONS_DEV, "vehicle") != cache_key(
+        MOCK_BYTES, URL_RECOGNITIONS_DEV, "licenseplate"
+    )
+
+
+def test_result_cache_lru_eviction():
+    cache = ResultCache(max_size=2)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}
+    cache.set("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+    assert len(cache) == 2
+    assert cache.stats.as_dict() == {
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+        "expirations": 0,
+    }
+
+
+def test_result_cache_ttl():
+    cache = ResultCache(ttl=10)
+    with mock.patch("simplehound.cache.time.time", return_value=100.0):
+        cache.set("a", {"n": 1})
+    with mock.patch("simplehound.cache.time.time", return_value=105.0):
+        assert cache.get("a") == {"n": 1}
+    with mock.patch("simplehound.cache.time.time", return_value=111.0):
+        assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+    assert cache.stats.misses == 1
+
+
+def test_result_cache_returns_copies():
+    cache = ResultCache()
+    cache.set("a", {"objects": []})
+    cache.get("a")["objects"].append("mutated")
+    assert cache.get("a") == {"objects": []}
+
+
+def test_sqlite_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResultCache(persistent=SQLiteCache(path))
+    cache.set("a", DETECTIONS)
+
+    restarted = ResultCache(persistent=SQLiteCache(path))
+    assert restarted.get("a") == DETECTIONS
+    assert restarted.stats.hits == 1
+    assert len(restarted) == 1
+
+
+def test_sqlite_cache_ttl(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), ttl=10)
+    with mock.patch("simplehound.cache.time.time", return_value=100.0):
+        cache.set("a", {"n": 1})
+    with mock.patch("simplehound.cache.time.time", return_value=105.0):
+        assert cache.get("a") == ({"n": 1}, 100.0)
+    with mock.patch("simplehound.cache.time.time", return_value=111.0):
+        assert cache.get("a") is None
+    assert cache.get("a") is None
+
+
+def test_result_cache_ttl_applies_to_persistent_tier(tmp_path):
+    path = str(tmp_path / "cache.db")
+    with mock.patch("simplehound.cache.time.time", return_value=100.0):
+        ResultCache(ttl=10, persistent=SQLiteCache(path)).set("a", {"n": 1})
+
+    restarted = ResultCache(ttl=10, persistent=SQLiteCache(path))
+    with mock.patch("simplehound.cache.time.time", return_value=105.0):
+        assert restarted.get("a") == {"n": 1}
+    # Promoted with its original age, so it still expires at 110.
+    with mock.patch("simplehound.cache.time.time", return_value=111.0):
+        assert restarted.get("a") is None
+    assert restarted.stats.as_dict() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 2,
+    }
+
+
+def test_cloud_detect_cache_hit_skips_network_and_encoding():
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=hound.HTTP_OK, json=DETECTIONS)
+        api = hound.cloud(MOCK_API_KEY, cache=ResultCache())
+        assert api.detect(MOCK_BYTES) == DETECTIONS
+        with mock.patch("simplehound.core.build_request_body") as build:
+            assert api.detect(MOCK_BYTES) == DETECTIONS
+        build.assert_not_called()
+        assert mock_req.call_count == 1
+
+
+def test_cloud_recognize_cache_keyed_on_object_type():
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(
+            URL_RECOGNITIONS_DEV + "licenseplate",
+            status_code=hound.HTTP_OK,
+            json=RECOGNITIONS_LICENSEPLATE,
+        )
+        mock_req.post(
+            URL_RECOGNITIONS_DEV + "vehicle",
+            status_code=hound.HTTP_OK,
+            json=RECOGNITIONS_LICENSEPLATE,
+        )
+        cache = ResultCache()
+        api = hound.cloud(MOCK_API_KEY, cache=cache)
+        api.recognize(MOCK_BYTES, "licenseplate")
+        api.recognize(MOCK_BYTES, "licenseplate")
+        api.recognize(MOCK_BYTES, "vehicle")
+        assert mock_req.call_count == 2
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+
+
+def test_cloud_does_not_cache_failed_calls():
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=500)
+        cache = ResultCache()
+        api = hound.cloud(MOCK_API_KEY, cache=cache)
+        assert api.detect(MOCK_BYTES) is None
+        assert len(cache) == 0
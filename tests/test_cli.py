@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from simplehound import cli
+from simplehound.fakeserver import FakeSighthound
+from tests.test_simplehound import MOCK_API_KEY, MOCK_BYTES
+
+
+@pytest.fixture
+def server():
+    with FakeSighthound(api_key=MOCK_API_KEY, seed=0) as server:
+        yield server
+
+
+@pytest.fixture
+def frames(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name in ["a.jpg", "b.JPEG", "sub/c.png"]:
+        (tmp_path / name).write_bytes(MOCK_BYTES)
+    (tmp_path / "notes.txt").write_text("not an image")
+    return tmp_path
+
+
+def run(server, *args):
+    return cli.main(["--api-key", MOCK_API_KEY, "--base-url", server.url, *args])
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_find_images(frames):
+    found = cli.find_images([str(frames), str(frames / "*.jpg")])
+    assert [p[len(str(frames)) + 1 :] for p in found] == [
+        "a.jpg",
+        "b.JPEG",
+        "sub/c.png",
+    ]
+    assert cli.find_images([str(frames / "notes.txt")]) == [str(frames / "notes.txt")]
+
+
+def test_cli_detect_parsed(server, frames, tmp_path):
+    output = tmp_path / "out.jsonl"
+    assert run(server, str(frames), "-o", str(output), "--parsed") == 0
+    records = read_records(output)
+    assert len(records) == 3
+    assert all(len(record["result"]["faces"]) == 1 for record in records)
+    assert server.status_counts == {200: 3}
+
+
+def test_cli_recognize_raw(server, frames, tmp_path):
+    output = tmp_path / "out.jsonl"
+    args = [str(frames / "a.jpg"), "-o", str(output), "--recognize", "vehicle"]
+    assert run(server, *args) == 0
+    (record,) = read_records(output)
+    assert record["result"]["objects"][0]["objectType"] == "vehicle"
+
+
+def test_cli_resumes_from_checkpoint(server, frames, tmp_path):
+    output = tmp_path / "out.jsonl"
+    checkpoint = tmp_path / "out.jsonl.checkpoint"
+    checkpoint.write_text(str(frames / "a.jpg") + "\n")
+    assert run(server, str(frames), "-o", str(output)) == 0
+    assert server.status_counts == {200: 2}
+    assert len(checkpoint.read_text().splitlines()) == 3
+
+    assert run(server, str(frames), "-o", str(output)) == 0
+    assert server.status_counts == {200: 2}
+    assert len(read_records(output)) == 2
+
+
+def test_cli_failures_are_not_checkpointed(server, frames, tmp_path):
+    output = tmp_path / "out.jsonl"
+    args = ["--api-key", "wrong", "--base-url", server.url, str(frames)]
+    assert cli.main(args + ["-o", str(output), "--retries", "0"]) == 1
+    records = read_records(output)
+    assert {record["status_code"] for record in records} == {401}
+    assert (tmp_path / "out.jsonl.checkpoint").read_text() == ""
+
+
+@pytest.mark.parametrize("parsed", [[], ["--parsed"]])
+def test_cli_missing_results_are_failures(frames, tmp_path, parsed):
+    output = tmp_path / "out.jsonl"
+    with FakeSighthound(api_key=MOCK_API_KEY, error_rates={500: 1.0}) as server:
+        assert (
+            run(server, str(frames), "-o", str(output), "--retries", "0", *parsed) == 1
+        )
+    records = read_records(output)
+    assert len(records) == 3
+    assert all("result" not in record for record in records)
+    assert {record["status_code"] for record in records} == {500}
+    assert (tmp_path / "out.jsonl.checkpoint").read_text() == ""
+
+
+def test_cli_requires_api_key(monkeypatch, tmp_path):
+    monkeypatch.delenv(cli.API_KEY_ENV, raising=False)
+    with pytest.raises(SystemExit):
+        cli.main([str(tmp_path), "-o", str(tmp_path / "out.jsonl")])
@@ -0,0 +1,67 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import simplehound.core as hound
+from simplehound.coalesce import SingleFlight
+from simplehound.fakeserver import FakeSighthound, Latency
+from tests.test_simplehound import MOCK_API_KEY, MOCK_BYTES
+
+
+def run_concurrently(flight, call, callers=4):
+    """Start `callers` calls of `flight.do`, releasing `call` once all have joined."""
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [executor.submit(flight.do, "key", call) for _ in range(callers)]
+        while flight.coalesced < callers - 1:
+            time.sleep(0.001)
+        call.release.set()
+        return futures
+
+
+def blocking_call(result=None, error=None):
+    calls = []
+
+    def call():
+        calls.append(threading.get_ident())
+        call.release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    call.release = threading.Event()
+    call.calls = calls
+    return call
+
+
+def test_single_flight_shares_result():
+    flight = SingleFlight()
+    call = blocking_call(result={"objects": []})
+    results = [future.result() for future in run_concurrently(flight, call)]
+    assert len(call.calls) == 1
+    assert results == [{"objects": []}] * 4
+    assert len({id(result) for result in results}) == 4
+    assert flight.coalesced == 3
+
+    assert flight.do("key", lambda: {"objects": [1]}) == {"objects": [1]}
+
+
+def test_single_flight_shares_exception():
+    flight = SingleFlight()
+    call = blocking_call(error=hound.SimplehoundException("boom", 500))
+    for future in run_concurrently(flight, call):
+        with pytest.raises(hound.SimplehoundException) as exc:
+            future.result()
+        assert exc.value.status_code == 500
+    assert len(call.calls) == 1
+
+
+def test_cloud_coalesces_identical_requests():
+    with FakeSighthound(latency=Latency.fixed(0.1)) as server:
+        with hound.cloud(MOCK_API_KEY, base_url=server.url, coalesce=True) as api:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(api.detect, [MOCK_BYTES] * 4))
+                api.detect(b"other")
+        assert server.status_counts == {200: 2}
+    assert all(result["objects"] == results[0]["objects"] for result in results)
@@ -0,0 +1,57 @@
+import pytest
+import requests_mock
+
+import simplehound.core as hound
+from simplehound.codec import CODEC_PREFERENCE, DEFAULT_CODEC, get_codec
+from tests.test_simplehound import (
+    B64_ENCODED_MOCK_BYTES,
+    DETECTIONS,
+    MOCK_API_KEY,
+    MOCK_BYTES,
+    URL_DETECTIONS_DEV,
+)
+
+
+def available_codecs():
+    codecs = []
+    for name in ["json", "orjson", "ujson"]:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            pass
+    return codecs
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+def test_codec_roundtrip(codec):
+    encoded = codec.dumps(DETECTIONS)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == DETECTIONS
+
+
+def test_get_codec_prefers_fast_libraries():
+    names = [codec.name for codec in available_codecs()]
+    preferred = next(name for name in CODEC_PREFERENCE if name in names)
+    assert DEFAULT_CODEC.name == preferred
+    with pytest.raises(ValueError):
+        get_codec("bad")
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+def test_run_detection_with_codec(codec):
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=hound.HTTP_OK, json=DETECTIONS)
+        response = hound.run_detection(
+            B64_ENCODED_MOCK_BYTES, MOCK_API_KEY, URL_DETECTIONS_DEV, codec=codec
+        )
+        assert response == DETECTIONS
+        assert mock_req.last_request.json() == {"image": B64_ENCODED_MOCK_BYTES}
+
+
+def test_cloud_uses_json_codec():
+    stdlib = get_codec("json")
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=hound.HTTP_OK, json=DETECTIONS)
+        api = hound.cloud(MOCK_API_KEY, json_codec=stdlib)
+        assert api._codec is stdlib
+        assert api.detect(MOCK_BYTES) == DETECTIONS
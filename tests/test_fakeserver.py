@@ -0,0 +1,105 @@
+import argparse
+import random
+
+import pytest
+
+import simplehound.core as hound
+from simplehound import loadgen
+from simplehound.fakeserver import FakeSighthound, Latency, parse_error_rates
+from simplehound.ratelimit import RetryPolicy
+from tests.test_simplehound import MOCK_API_KEY, MOCK_BYTES
+
+
+@pytest.fixture
+def server():
+    with FakeSighthound(api_key=MOCK_API_KEY, seed=0) as server:
+        yield server
+
+
+def test_fake_server_stops_cleanly_with_idle_connections(capfd):
+    server = FakeSighthound(api_key=MOCK_API_KEY)
+    server.stop()  # not started yet
+    server.start()
+    with hound.cloud(MOCK_API_KEY, base_url=server.url) as api:
+        api.detect(MOCK_BYTES)
+        server.stop()  # while the client still holds a keep-alive connection
+    server.stop()
+    assert "Error" not in capfd.readouterr().err
+
+
+def test_fake_server_detect_and_recognize(server):
+    with hound.cloud(MOCK_API_KEY, base_url=server.url) as api:
+        detections = api.detect(MOCK_BYTES)
+        recognitions = api.recognize(MOCK_BYTES, "vehicle,licenseplate")
+    assert len(hound.get_faces(detections)) == 1
+    assert len(hound.get_people(detections)) == 1
+    assert len(detections["requestId"]) == 32
+    vehicle = hound.get_vehicles(recognitions)[0]
+    assert (vehicle["make"], vehicle["licenseplate"]) == ("Ford", "CV67CBU")
+    assert server.status_counts == {200: 2}
+
+
+def test_fake_server_detect_file(server, tmp_path):
+    path = tmp_path / "image.jpg"
+    path.write_bytes(bytes(range(256)) * 1000)
+    with hound.cloud(MOCK_API_KEY, base_url=server.url) as api:
+        assert len(hound.get_faces(api.detect_file(str(path)))) == 1
+    assert server.status_counts == {200: 1}
+
+
+def test_fake_server_bad_key(server):
+    with hound.cloud("wrong", base_url=server.url) as api:
+        with pytest.raises(hound.SimplehoundException) as exc:
+            api.detect(MOCK_BYTES)
+    assert exc.value.status_code == hound.BAD_API_KEY
+
+
+def test_fake_server_injected_errors():
+    with FakeSighthound(error_rates={429: 1.0}, retry_after=0) as server:
+        retry = RetryPolicy(max_retries=1)
+        with hound.cloud(MOCK_API_KEY, base_url=server.url, retry=retry) as api:
+            with pytest.raises(hound.SimplehoundException) as exc:
+                api.detect(MOCK_BYTES)
+        assert server.status_counts == {429: 2}
+    assert exc.value.status_code == 429
+
+
+def test_latency_parse():
+    rng = random.Random(0)
+    assert Latency.parse("fixed:0.5").sample(rng) == 0.5
+    assert 0.1 <= Latency.parse("uniform:0.1:0.2").sample(rng) <= 0.2
+    assert Latency.parse("lognormal:0.05:0.5").sample(rng) > 0
+    assert Latency.parse("fixed:0.5@1:2").sample(rng) == 2.5
+    with pytest.raises(ValueError):
+        Latency.parse("bad:1")
+
+
+def test_parse_error_rates():
+    assert parse_error_rates("429=0.05,500=0.01") == {429: 0.05, 500: 0.01}
+    assert parse_error_rates("") == {}
+
+
+def test_loadgen_reports_every_client(capsys):
+    loadgen.main(["--requests", "20", "--concurrency", "4", "--errors", "500=0.5"])
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split(":")[0].strip() for line in lines] == loadgen.CLIENTS
+    assert all("20 requests" in line and "p99" in line for line in lines)
+
+
+def test_loadgen_reports_error_statuses(capsys):
+    args = ["--requests", "40", "--concurrency", "4"]
+    loadgen.main(args + ["--errors", "429=0.2,500=0.2,401=0.2"])
+    for line in capsys.readouterr().out.splitlines():
+        outcomes = dict(item.split(": ") for item in line.split(" | ")[-1].split(", "))
+        assert set(outcomes) == {"ok", "401", "429", "500"}, line
+
+
+def test_loadgen_batch_latency_is_per_request():
+    args = argparse.Namespace(
+        client="batch", requests=40, concurrency=4, retries=0, image_size=1024
+    )
+    with FakeSighthound(latency=Latency.fixed(0.02)) as server:
+        report = loadgen.run_load(args, server.url)
+    # Ten rounds of four requests, each taking about 20 ms.
+    assert report["outcomes"] == {"ok": 40}
+    assert report["latency"]["p99"] < report["seconds"] / 3
@@ -0,0 +1,107 @@
+import copy
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import simplehound.core as hound
+from simplehound.filters import ObjectFilter, Zone, points_in_polygon
+from tests.test_simplehound import (
+    DETECTIONS,
+    RECOGNITIONS_ALL,
+    RECOGNITIONS_LICENSEPLATE,
+)
+
+# Left half of the 960 x 480 fixture frames.
+LEFT = [(0, 0), (480, 0), (480, 480), (0, 480)]
+
+
+def kept(payload):
+    return [obj.get("type") or obj.get("objectType") for obj in payload["objects"]]
+
+
+def test_points_in_polygon():
+    triangle = np.array([(0, 0), (10, 0), (0, 10)], dtype=np.float64)
+    points = np.array([(1, 1), (6, 6), (-1, 1), (4.9, 4.9), (1, 11)])
+    assert points_in_polygon(points, triangle).tolist() == [
+        True,
+        False,
+        False,
+        True,
+        False,
+    ]
+
+
+def test_no_tests_keeps_everything():
+    assert ObjectFilter().apply(DETECTIONS) == DETECTIONS
+
+
+def test_object_types():
+    payload = ObjectFilter(object_types=["face"]).apply(DETECTIONS)
+    assert kept(payload) == ["face", "face"]
+    assert hound.get_faces(payload) == hound.get_faces(DETECTIONS)
+    assert hound.get_people(payload) == []
+
+
+def test_min_confidence():
+    payloads = [RECOGNITIONS_ALL, RECOGNITIONS_LICENSEPLATE, DETECTIONS]
+    # The vehicle has 0.8554, the plate 0.116, faces and people have none.
+    filtered = ObjectFilter(min_confidence=0.7).apply(payloads)
+    assert [kept(payload) for payload in filtered] == [
+        ["vehicle"],
+        [],
+        ["face", "face", "person", "person"],
+    ]
+    assert ObjectFilter(min_confidence=0.9).apply(RECOGNITIONS_ALL)["objects"] == []
+
+
+def test_area():
+    # Faces cover about 0.2% of the frame, people about 5-7%.
+    assert kept(ObjectFilter(min_area=0.01).apply(DETECTIONS)) == ["person", "person"]
+    assert kept(ObjectFilter(max_area=0.01).apply(DETECTIONS)) == ["face", "face"]
+
+
+def test_zones():
+    assert ObjectFilter(zones=[Zone(LEFT)]).select(DETECTIONS).tolist() == [
+        [0, 0],
+        [0, 2],
+    ]
+    normalized = Zone([(0, 0), (0.5, 0), (0.5, 1), (0, 1)], normalized=True)
+    assert ObjectFilter(zones=[normalized]).select(DETECTIONS).tolist() == [
+        [0, 0],
+        [0, 2],
+    ]
+    assert ObjectFilter(exclude_zones=[Zone(LEFT)]).select(DETECTIONS).tolist() == [
+        [0, 1],
+        [0, 3],
+    ]
+
+
+def test_combined_over_batch():
+    spec = {
+        "object_types": ["vehicle", "person"],
+        "min_confidence": 0.7,
+        "min_area": 0.05,
+        "exclude_zones": [{"points": LEFT}],
+    }
+    object_filter = ObjectFilter.from_dict(spec)
+    payloads = [DETECTIONS, RECOGNITIONS_ALL, RECOGNITIONS_LICENSEPLATE]
+    assert object_filter.select(payloads).tolist() == [[0, 3], [1, 0]]
+    filtered = object_filter.apply(payloads)
+    assert [kept(payload) for payload in filtered] == [["person"], ["vehicle"], []]
+    assert filtered[1]["requestId"] == RECOGNITIONS_ALL["requestId"]
+    assert hound.get_vehicles(filtered[1]) == hound.get_vehicles(RECOGNITIONS_ALL)
+
+
+def test_apply_reuses_objects():
+    payload = copy.deepcopy(DETECTIONS)
+    filtered = ObjectFilter(object_types=["person"]).apply(payload)
+    assert filtered is not payload
+    assert len(payload["objects"]) == 4
+    assert filtered["objects"][0] is payload["objects"][2]
+
+
+def test_empty():
+    payload = dict(DETECTIONS, objects=[])
+    assert ObjectFilter(min_area=0.1).apply(payload)["objects"] == []
+    assert ObjectFilter().select([]).shape == (0, 2)
@@ -0,0 +1,100 @@
+import io
+import os
+import random
+import tracemalloc
+
+import pytest
+import requests_mock
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image
+
+import simplehound.core as hound
+from simplehound.gate import SKIPPED, FrameGate, difference_hash, hamming_distance
+from tests.test_simplehound import DETECTIONS, MOCK_API_KEY, URL_DETECTIONS_DEV
+
+IMAGES_DIR = os.path.join(os.path.dirname(__file__), "images")
+
+
+def read_image(name):
+    with open(os.path.join(IMAGES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def add_noise(image, amount=6, seed=0):
+    """Re-encode `image` with per-pixel sensor-style noise."""
+    rng = random.Random(seed)
+    img = Image.open(io.BytesIO(image)).convert("L")
+    pixels = bytes(
+        min(255, max(0, p + rng.randint(-amount, amount))) for p in img.tobytes()
+    )
+    img = Image.frombytes("L", img.size, pixels)
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def test_difference_hash_tolerates_noise():
+    frame = read_image("people_car.jpg")
+    noisy = add_noise(frame)
+    other = read_image("two_cars.jpg")
+    assert frame != noisy
+    assert hamming_distance(difference_hash(frame), difference_hash(noisy)) < 5
+    assert hamming_distance(difference_hash(frame), difference_hash(other)) > 10
+
+
+def test_difference_hash_reads_mmap_in_place(tmp_path):
+    path = tmp_path / "noise.jpg"
+    Image.effect_noise((1000, 1000), 64).save(path, format="JPEG", quality=95)
+    image = path.read_bytes()
+    with hound.map_file(str(path)) as mapped:
+        tracemalloc.start()
+        frame_hash = difference_hash(mapped)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    assert frame_hash == difference_hash(image)
+    # The decoder reads fixed size blocks, the file is never copied whole.
+    assert peak < len(image) / 4
+
+
+def test_gate_skips_near_duplicates_per_stream():
+    gate = FrameGate()
+    frame = read_image("people_car.jpg")
+    skip, frame_hash, _ = gate.check("cam1", frame)
+    assert not skip
+    gate.update("cam1", frame_hash, {"objects": [1]})
+
+    skip, _, result = gate.check("cam1", add_noise(frame))
+    assert skip and result == {"objects": [1]}
+    assert not gate.check("cam2", frame)[0]
+    assert not gate.check("cam1", read_image("two_cars.jpg"))[0]
+    assert gate.stats.as_dict() == {"submitted": 3, "skipped": 1}
+
+    gate.reset("cam1")
+    assert not gate.check("cam1", frame)[0]
+
+
+def test_cloud_detect_with_gate():
+    gate = FrameGate()
+    api = hound.cloud(MOCK_API_KEY, gate=gate)
+    frame = read_image("people_car.jpg")
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=200, json=DETECTIONS)
+        first = api.detect(frame, stream="cam1")
+        second = api.detect(add_noise(frame), stream="cam1")
+        api.detect(add_noise(frame), stream="cam2")
+        api.detect(add_noise(frame))
+        assert mock_req.call_count == 3
+    assert second == first == DETECTIONS
+    assert second is not first
+    assert gate.stats.as_dict() == {"submitted": 2, "skipped": 1}
+
+
+def test_cloud_detect_with_gate_skipped_marker():
+    api = hound.cloud(MOCK_API_KEY, gate=FrameGate(return_previous=False))
+    frame = read_image("people_car.jpg")
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=200, json=DETECTIONS)
+        api.detect(frame, stream="cam1")
+        assert api.detect(frame, stream="cam1") is SKIPPED
+        assert mock_req.call_count == 1
@@ -0,0 +1,113 @@
+import math
+
+import pytest
+import requests_mock
+
+import simplehound.core as hound
+from simplehound.cache import ResultCache
+from simplehound.metrics import Histogram, MetricsRegistry, RequestMetrics
+from tests.test_simplehound import (
+    DETECTIONS,
+    MOCK_API_KEY,
+    MOCK_BYTES,
+    RECOGNITIONS_ALL,
+    URL_DETECTIONS_DEV,
+    URL_RECOGNITIONS_DEV,
+)
+
+
+def test_histogram_quantiles():
+    hist = Histogram(window=100)
+    assert math.isnan(hist.quantile(0.5))
+    for value in range(1, 201):
+        hist.observe(value)
+    assert hist.quantile(0.5) == 150
+    assert hist.quantile(0.99) == 199
+    assert hist.count == 200
+    assert hist.summary()["p95"] == 195
+
+
+def test_cloud_reports_request_metrics():
+    records = []
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=hound.HTTP_OK, json=DETECTIONS)
+        api = hound.cloud(MOCK_API_KEY)
+        api.add_hook(records.append)
+        api.detect(MOCK_BYTES)
+        bytes_sent = len(mock_req.last_request.body)
+
+    (metrics,) = records
+    assert metrics.endpoint == "detections"
+    assert metrics.status_code == hound.HTTP_OK
+    assert metrics.request_id == DETECTIONS["requestId"]
+    assert metrics.attempts == 1
+    assert metrics.bytes_sent == bytes_sent
+    assert metrics.response_bytes > 0
+    for timing in ["encode_time", "time_to_first_byte", "round_trip_time"]:
+        assert getattr(metrics, timing) >= 0
+    assert metrics.decode_time >= 0
+    assert metrics.parse_time is None
+
+
+def test_cloud_reports_failed_requests_but_not_cache_hits():
+    records = []
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(
+            URL_DETECTIONS_DEV,
+            [
+                {"status_code": hound.HTTP_OK, "json": DETECTIONS},
+                {"status_code": hound.BAD_API_KEY},
+            ],
+        )
+        api = hound.cloud(MOCK_API_KEY, cache=ResultCache())
+        api.add_hook(records.append)
+        api.detect(MOCK_BYTES)
+        api.detect(MOCK_BYTES)
+        with pytest.raises(hound.SimplehoundException):
+            api.detect(b"Other")
+    assert [metrics.status_code for metrics in records] == [200, 401]
+
+
+def test_cloud_analyze_reports_parse_time():
+    records = []
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, json=DETECTIONS)
+        mock_req.post(
+            URL_RECOGNITIONS_DEV + "vehicle,licenseplate", json=RECOGNITIONS_ALL
+        )
+        api = hound.cloud(MOCK_API_KEY)
+        api.add_hook(records.append)
+        api.analyze(MOCK_BYTES)
+    assert sorted(metrics.endpoint for metrics in records) == [
+        "detections",
+        "recognition",
+    ]
+    assert all(metrics.parse_time >= 0 for metrics in records)
+    # The image is encoded once, for whichever request got there first.
+    assert sum(metrics.encode_time is not None for metrics in records) == 1
+
+
+def test_metrics_registry_summary_and_prometheus():
+    registry = MetricsRegistry()
+    for i, status in enumerate([200, 200, 429]):
+        metrics = RequestMetrics("detections")
+        metrics.status_code = status
+        metrics.round_trip_time = 0.1 * (i + 1)
+        metrics.bytes_sent = 100
+        registry(metrics)
+
+    assert registry.endpoints() == ["detections"]
+    summary = registry.summary("detections")
+    assert summary["status_codes"] == {200: 2, 429: 1}
+    assert summary["round_trip_time"]["p50"] == pytest.approx(0.2)
+    assert summary["round_trip_time"]["count"] == 3
+    assert "encode_time" not in summary
+
+    text = registry.to_prometheus()
+    assert 'simplehound_requests_total{endpoint="detections",status="200"} 2' in text
+    assert "# TYPE simplehound_round_trip_seconds summary" in text
+    assert (
+        'simplehound_round_trip_seconds{endpoint="detections",quantile="0.99"} 0.3'
+        in text.replace("0.30000000000000004", "0.3")
+    )
+    assert 'simplehound_request_bytes_count{endpoint="detections"} 3' in text
@@ -0,0 +1,104 @@
+import copy
+
+import pytest
+
+import simplehound.core as hound
+from simplehound.models import (
+    BoundingBox,
+    Face,
+    LicensePlate,
+    Metadata,
+    Vehicle,
+    _Model,
+)
+from tests.test_simplehound import (
+    ALL_PROCESSED,
+    DETECTIONS,
+    FACES,
+    LICENSEPLATE_PROCESSED,
+    METADATA,
+    PEOPLE,
+    RECOGNITIONS_ALL,
+    RECOGNITIONS_LICENSEPLATE,
+    RECOGNITIONS_VEHICLES,
+    VEHICLES_PROCESSED,
+)
+
+
+def test_bounding_box_from_raw():
+    assert BoundingBox.from_raw(FACES[0]["boundingBox"]) == BoundingBox(
+        305, 151, 30, 28
+    )
+    vertices = LICENSEPLATE_PROCESSED[0]["boundingBox"]
+    assert BoundingBox.from_raw(vertices).to_dict() == {
+        "x": 494,
+        "y": 294,
+        "width": 48,
+        "height": 24,
+    }
+
+
+def test_models_to_dict_match_get_helpers():
+    faces = hound.get_faces(DETECTIONS, as_objects=True)
+    assert all(isinstance(face, Face) for face in faces)
+    assert [face.to_dict() for face in faces] == FACES
+    people = hound.get_people(DETECTIONS, as_objects=True)
+    assert [person.to_dict() for person in people] == PEOPLE
+    metadata = hound.get_metadata(DETECTIONS, as_objects=True)
+    assert isinstance(metadata, Metadata)
+    assert metadata.to_dict() == METADATA
+    plates = hound.get_license_plates(RECOGNITIONS_LICENSEPLATE, as_objects=True)
+    assert [plate.to_dict() for plate in plates] == LICENSEPLATE_PROCESSED
+    vehicles = hound.get_vehicles(RECOGNITIONS_VEHICLES, as_objects=True)
+    assert [vehicle.to_dict() for vehicle in vehicles] == VEHICLES_PROCESSED
+    vehicles = hound.get_vehicles(RECOGNITIONS_ALL, as_objects=True)
+    assert [vehicle.to_dict() for vehicle in vehicles] == ALL_PROCESSED
+
+
+def test_model_attributes():
+    face = hound.get_faces(DETECTIONS, as_objects=True)[0]
+    assert (face.gender, face.age) == ("male", 33)
+    assert face.bounding_box == BoundingBox(305, 151, 30, 28)
+
+    plate = hound.get_license_plates(RECOGNITIONS_LICENSEPLATE, as_objects=True)[0]
+    assert isinstance(plate, LicensePlate)
+    assert (plate.string, plate.region) == ("7XJT316", "California")
+    assert plate.string_confidence == 0.116
+
+    vehicle = hound.get_vehicles(RECOGNITIONS_ALL, as_objects=True)[0]
+    assert isinstance(vehicle, Vehicle)
+    assert (vehicle.make, vehicle.model, vehicle.color) == ("Ford", "Ranger", "black")
+    assert (vehicle.licenseplate, vehicle.region) == ("CV67CBU", "UK")
+    assert vehicle.bounding_box == BoundingBox(289, 150, 747, 452)
+
+    metadata = hound.get_metadata(DETECTIONS, as_objects=True)
+    assert metadata.request_id == DETECTIONS["requestId"]
+
+
+def test_models_have_no_instance_dict():
+    face = hound.get_faces(DETECTIONS, as_objects=True)[0]
+    assert not hasattr(face, "__dict__")
+    assert not hasattr(BoundingBox(0, 0, 1, 1), "__dict__")
+
+
+def test_models_do_not_reference_the_payload():
+    payload = copy.deepcopy(RECOGNITIONS_ALL)
+    vehicle = hound.get_vehicles(payload, as_objects=True)[0]
+    metadata = hound.get_metadata(payload, as_objects=True)
+    annotation = payload["objects"][0]["vehicleAnnotation"]
+    annotation["bounding"]["vertices"].clear()
+    annotation["attributes"]["system"]["make"]["name"] = "changed"
+    payload["image"]["width"] = 0
+    assert [vehicle.to_dict()] == ALL_PROCESSED
+    assert metadata.image_width == RECOGNITIONS_ALL["image"]["width"]
+
+
+def test_model_base_is_abstract():
+    with pytest.raises(TypeError):
+        _Model()
+
+
+def test_parse_detections_as_objects():
+    parsed = hound.parse_detections(DETECTIONS, as_objects=True)
+    assert [face.to_dict() for face in parsed["faces"]] == FACES
+    assert parsed["metadata"].to_dict() == METADATA
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import simplehound.core as hound
+import simplehound.parse as parse
+
+
+def modules_loaded_by(code):
+    check = "import sys; print(sorted(m for m in ('requests', 'asyncio') if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}; {check}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_core_reexports_parse_helpers():
+    for name in [
+        "get_faces",
+        "get_vehicles",
+        "bbox_to_tf_style",
+        "transform_coordinates",
+    ]:
+        assert getattr(hound, name) is getattr(parse, name)
+
+
+def test_parse_and_core_import_without_http_stack():
+    assert modules_loaded_by("import simplehound.parse") == "[]"
+    assert modules_loaded_by("import simplehound.core") == "[]"
+    code = "import simplehound.core; simplehound.core.cloud('key')"
+    assert modules_loaded_by(code) == "['requests']"
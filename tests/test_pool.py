@@ -0,0 +1,100 @@
+import pytest
+import requests_mock
+
+import simplehound.core as hound
+from simplehound.fakeserver import FakeSighthound, Latency
+from simplehound.pool import CloudPool
+from simplehound.ratelimit import RetryPolicy
+from tests.test_simplehound import (
+    DETECTIONS,
+    MOCK_BYTES,
+    URL_DETECTIONS_DEV,
+    URL_DETECTIONS_PROD,
+)
+
+
+def respond_by_key(statuses):
+    """Answer with the status configured for the request's API key."""
+
+    def respond(request, context):
+        context.status_code = statuses.get(request.headers["X-Access-Token"], 200)
+        return DETECTIONS if context.status_code == 200 else {"error": "no"}
+
+    return respond
+
+
+def test_pool_init():
+    pool = CloudPool(["key-a", "key-b"], modes=["dev", "prod"])
+    assert [(m.api_key, m.mode) for m in pool.members] == [
+        ("key-a", "dev"),
+        ("key-a", "prod"),
+        ("key-b", "dev"),
+        ("key-b", "prod"),
+    ]
+    assert pool.members[1].client._url_detections == URL_DETECTIONS_PROD
+    with pytest.raises(hound.SimplehoundException):
+        CloudPool([])
+    with pytest.raises(hound.SimplehoundException):
+        CloudPool(["key-a"], modes=["bad"])
+
+
+def test_pool_ejects_bad_key():
+    pool = CloudPool(["bad-key", "good-key"])
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, json=respond_by_key({"bad-key": 401}))
+        assert pool.detect(MOCK_BYTES) == DETECTIONS
+        assert pool.detect(MOCK_BYTES) == DETECTIONS
+        assert mock_req.call_count == 3
+    bad, good = pool.stats()
+    assert bad["ejected"] and bad["bad_key"] == 1
+    assert good["requests"] == 2 and not good["ejected"]
+
+    pool = CloudPool(["bad-key"])
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, json=respond_by_key({"bad-key": 401}))
+        with pytest.raises(hound.SimplehoundException) as exc:
+            pool.detect(MOCK_BYTES)
+        assert exc.value.status_code == hound.BAD_API_KEY
+        with pytest.raises(hound.SimplehoundException):
+            pool.detect(MOCK_BYTES)
+
+
+@pytest.mark.parametrize("retry", [None, RetryPolicy(max_retries=0)])
+def test_pool_avoids_throttled_key(retry):
+    pool = CloudPool(["busy-key", "free-key"], retry=retry)
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, json=respond_by_key({"busy-key": 429}))
+        for _ in range(3):
+            assert pool.detect(MOCK_BYTES) == DETECTIONS
+        assert mock_req.call_count == 4
+    busy, free = pool.stats()
+    assert (busy["throttled"], busy["requests"], busy["ejected"]) == (1, 1, False)
+    assert free["requests"] == 3
+
+
+def test_pool_quota():
+    pool = CloudPool(["key-a", "key-b"], quota=1)
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, json=DETECTIONS)
+        pool.detect(MOCK_BYTES)
+        pool.detect(MOCK_BYTES)
+        with pytest.raises(hound.SimplehoundException):
+            pool.detect(MOCK_BYTES)
+    assert [member["requests"] for member in pool.stats()] == [1, 1]
+
+
+def test_pool_quota_under_concurrency():
+    with FakeSighthound(latency=Latency.fixed(0.05)) as server:
+        with CloudPool(["key-a", "key-b"], quota=3, base_url=server.url) as pool:
+            results = list(pool.detect_many([MOCK_BYTES] * 20, max_workers=10))
+            assert sum(result.error is None for result in results) == 6
+            assert [member["requests"] for member in pool.stats()] == [3, 3]
+
+
+def test_pool_routes_to_least_loaded_key():
+    with FakeSighthound(latency=Latency.fixed(0.05)) as server:
+        with CloudPool(["key-a", "key-b", "key-c"], base_url=server.url) as pool:
+            results = list(pool.detect_many([MOCK_BYTES] * 12, max_workers=6))
+            assert all(result.error is None for result in results)
+            assert [member["requests"] for member in pool.stats()] == [4, 4, 4]
+            assert [member["in_flight"] for member in pool.stats()] == [0, 0, 0]
@@ -0,0 +1,160 @@
+import copy
+import io
+import os
+
+import pytest
+import requests_mock
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image
+
+import simplehound.core as hound
+from simplehound.preprocess import Preprocessor, Region
+from tests.test_simplehound import (
+    DETECTIONS,
+    MOCK_API_KEY,
+    RECOGNITIONS_VEHICLES,
+    URL_DETECTIONS_DEV,
+    URL_RECOGNITIONS_DEV,
+)
+
+IMAGES_DIR = os.path.join(os.path.dirname(__file__), "images")
+
+
+def read_image(name):
+    with open(os.path.join(IMAGES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def sent_image_size(request):
+    image = hound.base64.b64decode(request.json()["image"])
+    return Image.open(io.BytesIO(image)).size
+
+
+def test_transform_coordinates():
+    detections = copy.deepcopy(DETECTIONS)
+    hound.transform_coordinates(detections, 2, 0.5, offset_x=10, offset_y=20)
+    assert detections["objects"][2]["boundingBox"] == {
+        "x": 464,
+        "y": 86,
+        "height": 122,
+        "width": 250,
+    }
+    vehicles = copy.deepcopy(RECOGNITIONS_VEHICLES)
+    hound.transform_coordinates(vehicles, 0.5, 2)
+    vertices = vehicles["objects"][0]["vehicleAnnotation"]["bounding"]["vertices"]
+    assert vertices[0] == {"x": 144, "y": 300}
+    assert vertices[2] == {"x": 518, "y": 1204}
+
+
+def test_preprocessor_passthrough():
+    image = read_image("people_car.jpg")
+    prepared = Preprocessor(max_dimension=1000).process(image)
+    assert prepared.image is image
+    assert prepared.size == prepared.original_size == (960, 480)
+
+
+def test_preprocessor_downscale_and_reencode():
+    image = read_image("people_car.jpg")
+    prepared = Preprocessor(max_dimension=480, jpeg_quality=50).process(image)
+    assert prepared.original_size == (960, 480)
+    assert prepared.size == (480, 240)
+    assert Image.open(io.BytesIO(prepared.image)).size == (480, 240)
+    assert len(prepared.image) < len(image)
+
+
+def test_cloud_detect_with_preprocess_restores_coordinates():
+    image = read_image("people_car.jpg")
+    sent_sizes = []
+
+    def half_scale_detections(request, context):
+        sent_sizes.append(sent_image_size(request))
+        detections = copy.deepcopy(DETECTIONS)
+        detections["image"].update(width=480, height=240)
+        return hound.transform_coordinates(detections, 0.5, 0.5)
+
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, json=half_scale_detections)
+        api = hound.cloud(MOCK_API_KEY, preprocess=Preprocessor(max_dimension=480))
+        detections = api.detect(image)
+
+    assert sent_sizes == [(480, 240)]
+    assert hound.get_metadata(detections)["image_width"] == 960
+    assert hound.get_metadata(detections)["image_height"] == 480
+    for restored, original in zip(
+        hound.get_people(detections) + hound.get_faces(detections),
+        hound.get_people(DETECTIONS) + hound.get_faces(DETECTIONS),
+    ):
+        for key, value in original["boundingBox"].items():
+            assert abs(restored["boundingBox"][key] - value) <= 2
+
+
+def test_cloud_recognize_with_preprocess_restores_vertices():
+    image = read_image("vehicle.jpg")
+
+    def half_scale_vehicles(request, context):
+        vehicles = copy.deepcopy(RECOGNITIONS_VEHICLES)
+        vehicles["image"].update(width=540, height=338)
+        return hound.transform_coordinates(vehicles, 0.5, 0.5)
+
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_RECOGNITIONS_DEV + "vehicle", json=half_scale_vehicles)
+        api = hound.cloud(MOCK_API_KEY, preprocess=Preprocessor(max_dimension=540))
+        recognitions = api.recognize(image, "vehicle")
+
+    bbox = hound.get_vehicles(recognitions)[0]["boundingBox"]
+    expected = hound.get_vehicles(RECOGNITIONS_VEHICLES)[0]["boundingBox"]
+    assert hound.bboxvert_to_tf_style(bbox, 1080, 675) == pytest.approx(
+        hound.bboxvert_to_tf_style(expected, 1080, 675), abs=0.005
+    )
+    assert recognitions["image"]["width"] == 1080
+
+
+def test_region_to_box():
+    frame = (960, 480)
+    assert Region(100, 50, 200, 100).to_box(frame) == (100, 50, 300, 150)
+    assert Region(0.5, 0.5, 0.25, 0.5, normalized=True).to_box(frame) == (
+        480,
+        240,
+        720,
+        480,
+    )
+    assert Region(900, -10, 200, 100).to_box(frame) == (900, 0, 960, 90)
+    with pytest.raises(ValueError):
+        Region(1000, 0, 10, 10).to_box(frame)
+
+
+def test_cloud_detect_with_regions_merges_in_frame_coordinates():
+    image = read_image("people_car.jpg")
+    sent_sizes = []
+
+    def crop_detections(request, context):
+        sent_sizes.append(sent_image_size(request))
+        face = copy.deepcopy(DETECTIONS["objects"][0])
+        face["boundingBox"] = {"x": 10, "y": 20, "width": 30, "height": 40}
+        width, height = sent_sizes[-1]
+        return {"image": {"width": width, "height": height}, "objects": [face]}
+
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, json=crop_detections)
+        api = hound.cloud(MOCK_API_KEY)
+        single = api.detect(image, roi=(100, 50, 200, 100))
+        merged = api.detect(
+            image,
+            roi=[Region(100, 50, 200, 100), Region(0.5, 0.5, 0.5, 0.5, True)],
+        )
+
+    assert sorted(sent_sizes) == [(200, 100), (200, 100), (480, 240)]
+    assert single["image"] == {"width": 960, "height": 480}
+    assert [face["boundingBox"] for face in hound.get_faces(single)] == [
+        {"x": 110, "y": 70, "width": 30, "height": 40}
+    ]
+    assert merged["image"] == {"width": 960, "height": 480}
+    boxes = [face["boundingBox"] for face in hound.get_faces(merged)]
+    assert boxes == [
+        {"x": 110, "y": 70, "width": 30, "height": 40},
+        {"x": 490, "y": 260, "width": 30, "height": 40},
+    ]
+    assert hound.bbox_to_tf_style(boxes[1], 960, 480) == pytest.approx(
+        (0.5417, 0.5104, 0.625, 0.5417), abs=1e-4
+    )
@@ -0,0 +1,160 @@
+from unittest import mock
+
+import pytest
+import requests
+import requests_mock
+
+import simplehound.core as hound
+from simplehound.ratelimit import RetryPolicy, TokenBucket, parse_retry_after
+from tests.test_simplehound import (
+    DETECTIONS,
+    MOCK_API_KEY,
+    MOCK_BYTES,
+    URL_DETECTIONS_DEV,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with mock.patch(
+        "simplehound.ratelimit.time.monotonic", clock.monotonic
+    ), mock.patch("simplehound.ratelimit.time.sleep", clock.sleep):
+        yield clock
+
+
+def test_token_bucket_burst_then_paced(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    for _ in range(3):
+        assert bucket.acquire()
+    assert clock.sleeps == []
+    assert bucket.acquire()
+    assert bucket.acquire()
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_token_bucket_deadline(clock):
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.acquire()
+    assert not bucket.acquire(deadline=0.5)
+    assert bucket.acquire(deadline=1.0)
+    assert clock.sleeps == [1.0]
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(backoff=1, max_backoff=5)
+    for attempt in range(6):
+        assert 0 <= policy.delay(attempt) <= min(5, 2**attempt)
+    assert policy.delay(0, retry_after="7") == 7
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("garbage") is None
+
+
+@pytest.fixture
+def sleeps():
+    with mock.patch("simplehound.core.time.sleep") as sleep:
+        yield sleep
+
+
+def test_cloud_retries_throttling_and_server_errors(sleeps):
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(
+            URL_DETECTIONS_DEV,
+            [
+                {"status_code": 429, "headers": {"Retry-After": "3"}},
+                {"status_code": 503},
+                {"exc": requests.exceptions.ConnectionError},
+                {"status_code": hound.HTTP_OK, "json": DETECTIONS},
+            ],
+        )
+        api = hound.cloud(MOCK_API_KEY, retry=RetryPolicy(max_retries=3))
+        assert api.detect(MOCK_BYTES) == DETECTIONS
+        assert mock_req.call_count == 4
+    assert sleeps.call_count == 3
+    assert sleeps.call_args_list[0] == mock.call(3.0)
+
+
+def test_cloud_retries_exhausted(sleeps):
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=429)
+        api = hound.cloud(MOCK_API_KEY, retry=RetryPolicy(max_retries=2))
+        with pytest.raises(hound.SimplehoundException) as exc:
+            api.detect(MOCK_BYTES)
+        assert mock_req.call_count == 3
+    assert exc.value.status_code == 429
+    assert str(exc.value) == "Sighthound returned 429 after 3 attempts"
+
+
+def test_cloud_connection_errors_exhausted(sleeps):
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, exc=requests.exceptions.ConnectTimeout)
+        api = hound.cloud(MOCK_API_KEY, retry=RetryPolicy(max_retries=1))
+        with pytest.raises(requests.exceptions.ConnectTimeout):
+            api.detect(MOCK_BYTES)
+        assert mock_req.call_count == 2
+
+
+def test_cloud_retry_deadline(sleeps):
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(
+            URL_DETECTIONS_DEV, status_code=503, headers={"Retry-After": "60"}
+        )
+        api = hound.cloud(MOCK_API_KEY, retry=RetryPolicy(deadline=10))
+        with pytest.raises(hound.SimplehoundException) as exc:
+            api.detect(MOCK_BYTES)
+        assert mock_req.call_count == 1
+        assert mock_req.last_request.timeout[1] <= 10
+    assert exc.value.status_code == 503
+    sleeps.assert_not_called()
+
+
+def test_cloud_bad_key_not_retried(sleeps):
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=hound.BAD_API_KEY)
+        api = hound.cloud(MOCK_API_KEY, retry=RetryPolicy())
+        with pytest.raises(hound.SimplehoundException) as exc:
+            api.detect(MOCK_BYTES)
+        assert mock_req.call_count == 1
+    assert exc.value.status_code == hound.BAD_API_KEY
+
+
+def test_cloud_rate_limit(clock):
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=hound.HTTP_OK, json=DETECTIONS)
+        api = hound.cloud(MOCK_API_KEY, rate_limit=4, burst=2)
+        for _ in range(4):
+            api.detect(MOCK_BYTES)
+    assert clock.sleeps == [0.25, 0.25]
+
+
+def test_cloud_deadline_passes_waiting_for_rate_limit(clock):
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=hound.HTTP_OK, json=DETECTIONS)
+        api = hound.cloud(
+            MOCK_API_KEY, rate_limit=2, burst=1, retry=RetryPolicy(deadline=0.5)
+        )
+        api.detect(MOCK_BYTES)
+        # The limiter sleeps exactly until the deadline, leaving no time to post.
+        with pytest.raises(hound.SimplehoundException) as exc:
+            api.detect(MOCK_BYTES)
+        assert "Deadline exceeded" in str(exc.value)
+        assert mock_req.call_count == 1
+    assert clock.sleeps == [0.5]
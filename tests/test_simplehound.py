@@ -1,8 +1,13 @@
+import json
+import threading
+from unittest import mock
+
 import pytest
 import requests
 import requests_mock
 
 import simplehound.core as hound
+from simplehound.ratelimit import RetryPolicy
 
 MOCK_API_KEY = "mock_api_key"
 MOCK_BYTES = b"Test"
@@ -535,3 +540,240 @@ def test_cloud_detect_bad_key():
         api = hound.cloud(MOCK_API_KEY)
         detections = api.detect(MOCK_BYTES)
     assert str(exc.value) == "Bad API key for Sighthound"
+
+
+def test_run_detection_with_session():
+    session = hound.create_session(pool_size=2)
+    with requests_mock.Mocker(session=session) as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=hound.HTTP_OK, json=DETECTIONS)
+        response = hound.run_detection(
+            B64_ENCODED_MOCK_BYTES, MOCK_API_KEY, URL_DETECTIONS_DEV, session=session
+        )
+        assert response == DETECTIONS
+    adapter = session.get_adapter(URL_DETECTIONS_DEV)
+    assert adapter._pool_maxsize == 2
+
+
+def test_cloud_session_reuse():
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=hound.HTTP_OK, json=DETECTIONS)
+        with hound.cloud(MOCK_API_KEY, timeout=3) as api:
+            session = api._session
+            api.detect(MOCK_BYTES)
+            api.detect(MOCK_BYTES)
+            assert api._session is session
+        assert mock_req.call_count == 2
+        assert mock_req.last_request.timeout == 3
+
+
+def test_cloud_detect_many():
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(
+            URL_DETECTIONS_DEV,
+            [
+                {"status_code": hound.HTTP_OK, "json": DETECTIONS},
+                {"status_code": hound.BAD_API_KEY},
+                {"status_code": hound.HTTP_OK, "json": DETECTIONS},
+            ],
+        )
+        api = hound.cloud(MOCK_API_KEY)
+        results = list(api.detect_many([MOCK_BYTES] * 3, max_workers=1))
+    assert [r.index for r in results] == [0, 1, 2]
+    assert results[0] == (0, DETECTIONS, None)
+    assert results[1].result is None
+    assert isinstance(results[1].error, hound.SimplehoundException)
+    assert results[2] == (2, DETECTIONS, None)
+
+
+def test_cloud_recognize_many_unordered():
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(
+            URL_RECOGNITIONS_DEV + "licenseplate",
+            status_code=hound.HTTP_OK,
+            json=RECOGNITIONS_LICENSEPLATE,
+        )
+        api = hound.cloud(MOCK_API_KEY)
+        results = list(
+            api.recognize_many([MOCK_BYTES] * 5, "licenseplate", ordered=False)
+        )
+    assert sorted(r.index for r in results) == [0, 1, 2, 3, 4]
+    assert all(r.result == RECOGNITIONS_LICENSEPLATE for r in results)
+
+    with pytest.raises(hound.SimplehoundException):
+        api.recognize_many([MOCK_BYTES], "bad")
+
+
+@pytest.mark.parametrize(
+    "image",
+    [MOCK_BYTES, bytearray(MOCK_BYTES), memoryview(MOCK_BYTES), b"", bytes(range(256))],
+)
+def test_build_request_body(image):
+    body = hound.build_request_body(image)
+    expected = json.dumps({"image": hound.encode_image(bytes(image))}).encode()
+    assert body == expected
+
+
+def test_build_request_body_multiple_chunks(monkeypatch):
+    monkeypatch.setattr(hound, "ENCODE_CHUNK_SIZE", 3)
+    image = bytes(range(100))
+    body = hound.build_request_body(image)
+    assert json.loads(body) == {"image": hound.encode_image(image)}
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 4, 5, 100, 1001])
+@pytest.mark.parametrize("block_size", [1, 7, 16384])
+def test_streaming_body_matches_build_request_body(length, block_size):
+    image = bytes(range(256)) * 4
+    image = image[:length]
+    body = hound.StreamingBody(image)
+    expected = bytes(hound.build_request_body(image))
+    assert len(body) == len(expected)
+    blocks = iter(lambda: body.read(block_size), b"")
+    assert b"".join(blocks) == expected
+    assert body.tell() == len(expected)
+
+    body.seek(5)
+    assert body.read() == expected[5:]
+    body.seek(-3, 2)
+    assert body.read(10) == expected[-3:]
+
+
+def test_cloud_detect_file_streams_body(tmp_path):
+    path = tmp_path / "image.jpg"
+    path.write_bytes(bytes(range(256)) * 100)
+    bodies = []
+
+    def respond(request, context):
+        assert not isinstance(request.body, (bytes, bytearray))
+        assert int(request.headers["Content-Length"]) == len(request.body)
+        bodies.append(json.loads(request.body.read()))
+        return DETECTIONS if len(bodies) > 1 else {"error": "retry"}
+
+    retry = RetryPolicy(max_retries=1, backoff=0)
+    api = hound.cloud(MOCK_API_KEY, retry=retry)
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(
+            URL_DETECTIONS_DEV,
+            [{"status_code": 500, "json": respond}, {"json": respond}],
+        )
+        assert api.detect_file(str(path)) == DETECTIONS
+    expected = {"image": hound.encode_image(path.read_bytes())}
+    assert bodies == [expected, expected]
+
+
+def test_cloud_recognize_file(tmp_path):
+    path = tmp_path / "empty.jpg"
+    path.write_bytes(b"")
+    api = hound.cloud(MOCK_API_KEY)
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(
+            URL_RECOGNITIONS_DEV + "licenseplate", json=RECOGNITIONS_LICENSEPLATE
+        )
+        assert api.recognize_file(str(path), "licenseplate") == (
+            RECOGNITIONS_LICENSEPLATE
+        )
+        body = mock_req.last_request.body
+        body.seek(0)
+        assert body.read() == b'{"image": ""}'
+    with pytest.raises(hound.SimplehoundException):
+        api.recognize_file(str(path), "bad")
+
+
+def test_cloud_detect_posts_image_body():
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, status_code=hound.HTTP_OK, json=DETECTIONS)
+        api = hound.cloud(MOCK_API_KEY)
+        api.detect(MOCK_BYTES)
+        assert mock_req.last_request.json() == {"image": B64_ENCODED_MOCK_BYTES}
+        assert mock_req.last_request.headers["X-Access-Token"] == MOCK_API_KEY
+        assert mock_req.last_request.qs == {
+            "type": ["all"],
+            "faceoption": ["gender,age"],
+        }
+
+
+def test_cloud_analyze():
+    threads = set()
+
+    def respond(payload):
+        def callback(request, context):
+            threads.add(threading.current_thread())
+            return payload
+
+        return callback
+
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(URL_DETECTIONS_DEV, json=respond(DETECTIONS))
+        mock_req.post(
+            URL_RECOGNITIONS_DEV + "vehicle,licenseplate",
+            json=respond(RECOGNITIONS_ALL),
+        )
+        with hound.cloud(MOCK_API_KEY) as api, mock.patch(
+            "simplehound.core.build_request_body", wraps=hound.build_request_body
+        ) as build:
+            result = api.analyze(MOCK_BYTES)
+        build.assert_called_once()
+        assert mock_req.call_count == 2
+        assert len(threads) == 2  # endpoints are called concurrently
+
+    assert result["detections"] == DETECTIONS
+    assert result["recognitions"] == RECOGNITIONS_ALL
+    assert result["faces"] == FACES
+    assert result["people"] == PEOPLE
+    assert result["vehicles"] == ALL_PROCESSED
+    assert result["license_plates"] == []
+    assert result["metadata"] == METADATA
+
+
+def test_cloud_analyze_single_endpoint():
+    with requests_mock.Mocker() as mock_req:
+        mock_req.post(
+            URL_RECOGNITIONS_DEV + "licenseplate",
+            status_code=hound.HTTP_OK,
+            json=RECOGNITIONS_LICENSEPLATE,
+        )
+        api = hound.cloud(MOCK_API_KEY)
+        result = api.analyze(MOCK_BYTES, detect=False, recognize="licenseplate")
+    assert result["detections"] is None
+    assert result["faces"] == []
+    assert result["license_plates"] == LICENSEPLATE_PROCESSED
+    assert result["metadata"]["requestId"] == RECOGNITIONS_LICENSEPLATE["requestId"]
+
+    with pytest.raises(hound.SimplehoundException):
+        api.analyze(MOCK_BYTES, recognize="bad")
+
+
+def test_parse_detections():
+    assert hound.parse_detections(DETECTIONS) == {
+        "faces": FACES,
+        "people": PEOPLE,
+        "metadata": METADATA,
+    }
+
+
+def test_parse_recognitions():
+    parsed = hound.parse_recognitions(RECOGNITIONS_ALL)
+    assert parsed["vehicles"] == ALL_PROCESSED
+    assert parsed["license_plates"] == []
+    assert parsed["metadata"]["requestId"] == RECOGNITIONS_ALL["requestId"]
+    parsed = hound.parse_recognitions(RECOGNITIONS_LICENSEPLATE)
+    assert parsed["vehicles"] == []
+    assert parsed["license_plates"] == LICENSEPLATE_PROCESSED
+
+
+def test_partition_objects():
+    partition = hound.partition_objects(DETECTIONS)
+    assert {key: len(objs) for key, objs in partition.items()} == {
+        "face": 2,
+        "person": 2,
+    }
+
+
+def test_get_helpers_see_payload_changes():
+    detections = {**DETECTIONS, "objects": list(DETECTIONS["objects"])}
+    assert len(hound.get_faces(detections)) == 2
+    detections["objects"][0] = DETECTIONS["objects"][2]
+    assert len(hound.get_faces(detections)) == 1
+    assert len(hound.get_people(detections)) == 3
+    parsed = hound.parse_detections(detections)
+    assert (len(parsed["faces"]), len(parsed["people"])) == (1, 3)
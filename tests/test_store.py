@@ -0,0 +1,127 @@
+import copy
+
+import pytest
+
+from simplehound.store import ResultStore, edit_distance, plate_key
+from tests.test_simplehound import (
+    DETECTIONS,
+    RECOGNITIONS_ALL,
+    RECOGNITIONS_LICENSEPLATE,
+    RECOGNITIONS_VEHICLES,
+)
+
+DAY = 24 * 3600
+
+
+def with_request_id(payload, request_id):
+    payload = copy.deepcopy(payload)
+    payload["requestId"] = request_id
+    return payload
+
+
+@pytest.fixture
+def store():
+    with ResultStore() as store:
+        store.add_many(
+            [
+                (with_request_id(DETECTIONS, "detections"), 1 * DAY, "door"),
+                (RECOGNITIONS_LICENSEPLATE, 2 * DAY, "drive"),
+                (RECOGNITIONS_VEHICLES, 3 * DAY, "drive"),
+                (RECOGNITIONS_ALL, 4 * DAY, "drive"),
+                (with_request_id(RECOGNITIONS_ALL, "later"), 5 * DAY, "gate"),
+            ]
+        )
+        yield store
+
+
+def test_plate_key():
+    assert plate_key("cv67 cbu") == "CV67C8U"
+    assert plate_key("0-O-Q-D") == "0000"
+    assert plate_key("I1L") == "111"
+
+
+def test_edit_distance():
+    assert edit_distance("CV67C8U", "CV67C8U") == 0
+    assert edit_distance("CV67C8U", "CV67X8U") == 1
+    assert edit_distance("CV67C8U", "V67C8U") == 1
+    assert edit_distance("CV67C8U", "XX67C8U") == 2
+    assert edit_distance("CV67C8U", "ABC", limit=2) == 3
+
+
+def test_add(store):
+    assert len(store) == 8
+    assert not store.add(RECOGNITIONS_ALL)
+    assert len(store) == 8
+    assert store.add(with_request_id(RECOGNITIONS_ALL, "new"), 6 * DAY)
+    assert len(store) == 9
+
+
+def test_add_default_timestamp():
+    with ResultStore() as store:
+        store.add(RECOGNITIONS_ALL)
+        assert store.last_seen("CV67CBU")["timestamp"] > 0
+
+
+def test_detections(store):
+    rows = store._query(["request_id = ?"], ["detections"])
+    assert sorted(row["kind"] for row in rows) == [
+        "face",
+        "face",
+        "person",
+        "person",
+    ]
+    assert {(row["gender"], row["age"]) for row in rows if row["kind"] == "face"} == {
+        ("male", 33),
+        ("male", 37),
+    }
+
+
+def test_last_seen(store):
+    sighting = store.last_seen("CV67CBU")
+    assert sighting["request_id"] == "later"
+    assert sighting["source"] == "gate"
+    assert sighting["plate"] == "CV67CBU"
+    assert sighting["make"] == "Ford"
+    assert (sighting["x"], sighting["y"], sighting["width"], sighting["height"]) == (
+        289,
+        150,
+        747,
+        452,
+    )
+    assert store.last_seen("AB12CDE") is None
+
+
+def test_find_plate(store):
+    assert [s["timestamp"] for s in store.find_plate("CV67CBU")] == [5 * DAY, 4 * DAY]
+    assert len(store.find_plate("CV67CBU", since=4 * DAY, until=5 * DAY)) == 1
+    assert len(store.find_plate("CV67CBU", limit=1)) == 1
+    assert store.find_plate("7XJT316")[0]["region"] == "California"
+
+
+def test_find_plate_ocr_confusions(store):
+    assert len(store.find_plate("cv67c8u")) == 2
+    assert len(store.find_plate("CV6708U")) == 0
+    assert len(store.find_plate("CV6708U", max_distance=1)) == 2
+    assert len(store.find_plate("CV67CU", max_distance=1)) == 2
+    assert len(store.find_plate("XCV67CBU", max_distance=1)) == 2
+    assert len(store.find_plate("XV6708U", max_distance=1)) == 0
+    assert len(store.find_plate("XV6708U", max_distance=2)) == 2
+
+
+def test_find_vehicles(store):
+    assert len(store.find_vehicles(make="ford")) == 3
+    assert len(store.find_vehicles(make="Ford", model="RANGER", color="black")) == 3
+    assert len(store.find_vehicles(region="uk")) == 2
+    assert len(store.find_vehicles(make="Ford", since=3 * DAY, until=4 * DAY)) == 1
+    assert store.find_vehicles(color="red") == []
+    assert len(store.find_vehicles()) == 3
+
+
+def test_on_disk(tmp_path):
+    path = str(tmp_path / "store.db")
+    with ResultStore(path) as store:
+        store.add(RECOGNITIONS_ALL, 1 * DAY)
+    with ResultStore(path) as store:
+        assert len(store) == 1
+        assert store.last_seen("CV67CBU")["timestamp"] == 1 * DAY
+        assert not store.add(RECOGNITIONS_ALL)
@@ -0,0 +1,117 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from simplehound.tracking import (
+    ENTER,
+    EXIT,
+    Tracker,
+    greedy_match,
+    iou_matrix,
+)
+from tests.test_simplehound import DETECTIONS, RECOGNITIONS_ALL
+
+
+def frame(*objects):
+    """Payload of `(type, x, y, width, height)` objects on a 100 x 100 image."""
+    return {
+        "image": {"width": 100, "height": 100, "orientation": 1},
+        "objects": [
+            {"type": obj_type, "boundingBox": {"x": x, "y": y, "width": w, "height": h}}
+            for obj_type, x, y, w, h in objects
+        ],
+        "requestId": "frame",
+    }
+
+
+def kinds(events):
+    return [(event.kind, event.track_id) for event in events]
+
+
+def test_iou_matrix():
+    a = np.array([[0, 0, 1, 1], [0, 0, 0.5, 0.5]])
+    b = np.array([[0, 0, 1, 1], [0.5, 0.5, 1, 1], [0, 0, 0, 0]])
+    np.testing.assert_allclose(
+        iou_matrix(a, b), [[1, 0.25, 0], [0.25, 0, 0]], atol=1e-7
+    )
+    assert iou_matrix(np.zeros((0, 4)), b).shape == (0, 3)
+
+
+def test_greedy_match():
+    iou = np.array([[0.9, 0.8], [0.85, 0.1]])
+    rows, cols = greedy_match(iou, 0.3)
+    assert sorted(zip(rows.tolist(), cols.tolist())) == [(0, 0)]
+    rows, cols = greedy_match(np.array([[0.5, 0.6], [0.4, 0.7]]), 0.3)
+    assert sorted(zip(rows.tolist(), cols.tolist())) == [(0, 0), (1, 1)]
+
+
+def test_enter_and_exit():
+    tracker = Tracker()
+    events = tracker.update(frame(("person", 10, 10, 20, 40), ("face", 60, 10, 10, 10)))
+    assert kinds(events) == [(ENTER, 1), (ENTER, 2)]
+    assert events[0].object_type == "person"
+    assert events[0].box == pytest.approx((0.1, 0.1, 0.5, 0.3))
+    # Moving slightly keeps the same tracks, with no events.
+    assert (
+        tracker.update(frame(("person", 12, 10, 20, 40), ("face", 61, 11, 10, 10)))
+        == []
+    )
+    assert set(tracker.active()) == {1, 2}
+    assert tracker.active()[1]["boundingBox"]["x"] == 12
+    # The face misses one frame (tolerated), then another (exits).
+    assert tracker.update(frame(("person", 13, 10, 20, 40))) == []
+    events = tracker.update(frame(("person", 14, 10, 20, 40)))
+    assert kinds(events) == [(EXIT, 2)]
+    assert events[0].obj["type"] == "face"
+    assert events[0].frame == 4
+    assert kinds(tracker.flush()) == [(EXIT, 1)]
+    assert tracker.active() == {}
+
+
+def test_object_types_do_not_match():
+    tracker = Tracker()
+    tracker.update(frame(("person", 10, 10, 20, 40)))
+    events = tracker.update(frame(("face", 10, 10, 20, 40)))
+    assert kinds(events) == [(ENTER, 2)]
+
+
+def test_min_hits():
+    tracker = Tracker(min_hits=2, max_misses=0)
+    assert tracker.update(frame(("person", 10, 10, 20, 40))) == []
+    assert tracker.active() == {}
+    assert kinds(tracker.update(frame(("person", 10, 10, 20, 40)))) == [(ENTER, 1)]
+    # A one-frame false positive never enters, so it never exits either.
+    tracker.update(frame(("person", 10, 10, 20, 40), ("face", 80, 80, 10, 10)))
+    assert tracker.update(frame(("person", 10, 10, 20, 40))) == []
+
+
+def test_streams():
+    tracker = Tracker()
+    tracker.update(frame(("person", 10, 10, 20, 40)), stream="door")
+    events = tracker.update(frame(("person", 10, 10, 20, 40)), stream="gate")
+    assert [(e.kind, e.stream) for e in events] == [(ENTER, "gate")]
+    assert [e.stream for e in tracker.flush("door")] == ["door"]
+    assert list(tracker.active("gate")) == [2]
+
+
+def test_api_payloads():
+    tracker = Tracker()
+    events = tracker.update(DETECTIONS)
+    assert sorted(e.object_type for e in events) == ["face", "face", "person", "person"]
+    assert tracker.update(DETECTIONS) == []
+    events = tracker.update(RECOGNITIONS_ALL, stream="plates")
+    assert [e.object_type for e in events] == ["vehicle"]
+
+
+def test_many_objects():
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0, 1900, (300, 2))
+    objects = [("person", x, y, 20, 20) for x, y in xy]
+    tracker = Tracker()
+    payload = frame(*objects)
+    payload["image"].update(width=1920, height=1920)
+    assert len(tracker.update(payload)) == 300
+    for obj in payload["objects"]:
+        obj["boundingBox"]["x"] += 2
+    assert tracker.update(payload) == []
+    assert len(tracker.active()) == 300
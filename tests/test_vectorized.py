@@ -0,0 +1,72 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import simplehound.core as hound
+from simplehound.vectorized import tf_boxes
+from tests.test_simplehound import (
+    DETECTIONS,
+    RECOGNITIONS_ALL,
+    RECOGNITIONS_LICENSEPLATE,
+)
+
+
+def scalar_boxes(payload):
+    width, height = payload["image"]["width"], payload["image"]["height"]
+    boxes = []
+    for obj in payload["objects"]:
+        if "boundingBox" in obj:
+            boxes.append(hound.bbox_to_tf_style(obj["boundingBox"], width, height))
+        elif "vehicleAnnotation" in obj:
+            bbox = obj["vehicleAnnotation"]["bounding"]
+            boxes.append(hound.bboxvert_to_tf_style(bbox, width, height))
+        elif "licenseplateAnnotation" in obj:
+            bbox = obj["licenseplateAnnotation"]["bounding"]
+            boxes.append(hound.bboxvert_to_tf_style(bbox, width, height))
+    return boxes
+
+
+def test_tf_boxes_single_payload():
+    boxes, index = tf_boxes(DETECTIONS)
+    assert boxes.dtype == np.float32
+    assert boxes.shape == (4, 4)
+    np.testing.assert_array_equal(
+        boxes, np.asarray(scalar_boxes(DETECTIONS), dtype=np.float32)
+    )
+    assert index.tolist() == [[0, 0], [0, 1], [0, 2], [0, 3]]
+
+
+def test_tf_boxes_batch():
+    payloads = [RECOGNITIONS_LICENSEPLATE, DETECTIONS, RECOGNITIONS_ALL]
+    boxes, index = tf_boxes(payloads)
+    expected = [box for payload in payloads for box in scalar_boxes(payload)]
+    np.testing.assert_array_equal(boxes, np.asarray(expected, dtype=np.float32))
+    assert index[:, 0].tolist() == [0, 1, 1, 1, 1, 2]
+    assert index[:, 1].tolist() == [0, 0, 1, 2, 3, 0]
+
+
+def test_tf_boxes_empty():
+    boxes, index = tf_boxes({"image": {"width": 1, "height": 1}, "objects": []})
+    assert boxes.shape == (0, 4)
+    assert index.shape == (0, 2)
+
+
+def test_tf_boxes_matches_scalar_on_random_boxes():
+    rng = np.random.default_rng(0)
+    objects = [
+        {
+            "type": "person",
+            "boundingBox": {
+                "x": int(x),
+                "y": int(y),
+                "width": int(w),
+                "height": int(h),
+            },
+        }
+        for x, y, w, h in rng.integers(0, 500, size=(2000, 4))
+    ]
+    payload = {"image": {"width": 960, "height": 480}, "objects": objects}
+    boxes, _ = tf_boxes(payload)
+    np.testing.assert_array_equal(
+        boxes, np.asarray(scalar_boxes(payload), dtype=np.float32)
+    )